@@ -9,16 +9,41 @@ This is the main application entry point that orchestrates all the modular compo
 - config.py: Configuration management
 - models.py: Data models and type definitions
 - parser.py: Business analysis parsing logic
+- json_parser.py: Validation of JSON model output
 - api_routes.py: API route handlers
 - business_analyzer.py: AI-powered analysis engine
+- model_calls.py: Rate limiting, retries and coalescing of Gemini calls
+- llm_backends.py: Gemini and mock model backends
+- metrics.py: Prometheus counters, gauges and per-stage timing histograms
+- profiling.py: Opt-in sampling profiler for single requests
+- executor.py: Worker pools that keep blocking analysis off the event loop
+- jobs.py: Persistent background job queue and its worker processes
+- uploads.py: Disk-spooled uploads and request size limits
+- pdf_extractor.py: Page-parallel PDF text extraction
+- docx_extractor.py: Streaming DOCX text extraction, including tables
+- compaction.py: Transcript compaction before prompt construction
+- extractors.py: Registry of text extractors, imported on first use
+- serialization.py: JSON encoding of responses without re-validation
+- compression.py: Negotiated gzip/brotli response compression
+- store.py: Indexed store of past analyses and their processes
+- dedup.py: MinHash/LSH clustering of recurring processes
+- revisions.py: Recognition of revised documents for incremental re-analysis
 """
 
 import sys
 import os
+import time
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import config
 from api_routes import router
+from compression import CompressionMiddleware
+from executor import analysis_executor
+from extractors import extractor_registry
+from jobs import job_workers
+from llm_backends import import_gemini_sdk
+from store import analysis_store
+from uploads import RequestSizeLimitMiddleware, sweep_spool_folder
 
 # Ensure UTF-8 encoding for stdout
 sys.stdout.reconfigure(encoding='utf-8', errors='replace')
@@ -30,6 +55,24 @@ app = FastAPI(
     version=config.API_VERSION
 )
 
+# Compress large JSON responses (innermost, so every other middleware sees
+# the final headers)
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MIN_BYTES,
+        gzip_level=config.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=config.COMPRESSION_BROTLI_QUALITY
+    )
+
+# Reject oversized uploads before their body is read (added first so CORS
+# headers are still applied to the 413 responses)
+app.add_middleware(
+    RequestSizeLimitMiddleware,
+    max_body_size=config.MAX_REQUEST_SIZE,
+    path_limits={"/api/analyze/batch": config.BATCH_MAX_REQUEST_SIZE}
+)
+
 # Add CORS middleware with configuration
 app.add_middleware(
     CORSMiddleware,
@@ -45,6 +88,33 @@ app.include_router(router)
 # Ensure upload folder exists
 os.makedirs(config.UPLOAD_FOLDER, exist_ok=True)
 
+@app.on_event("startup")
+def preload_dependencies():
+    """Import the extractors and model SDK up front when PRELOAD_ON_STARTUP is set."""
+    if not config.PRELOAD_ON_STARTUP:
+        return
+    started = time.perf_counter()
+    modules = extractor_registry.preload()
+    if config.LLM_BACKEND == "gemini":
+        import_gemini_sdk()
+        modules.append("google.generativeai")
+    print(f"Preloaded {', '.join(modules)} in {time.perf_counter() - started:.2f}s")
+
+@app.on_event("startup")
+def start_job_workers():
+    """Remove spool files left by a previous run and start the background job worker processes."""
+    removed = sweep_spool_folder(config.UPLOAD_SPOOL_MAX_AGE_SECONDS)
+    if removed:
+        print(f"Removed {removed} stale upload spool file(s)")
+    job_workers.start()
+
+@app.on_event("shutdown")
+def shutdown_executor():
+    """Stop the job workers, release the analysis worker pools and flush the analysis store."""
+    job_workers.stop()
+    analysis_executor.shutdown()
+    analysis_store.close()
+
 def main():
     """Main entry point for the application."""
     import uvicorn
@@ -3,17 +3,168 @@ API Route Handlers for Business Process Analysis Server.
 Contains all FastAPI route endpoints and their business logic.
 """
 
+import asyncio
+import json
+import math
 import os
-from fastapi import File, UploadFile, HTTPException, APIRouter
-from fastapi.responses import JSONResponse
-from business_analyzer import BusinessProcessAnalyzer
-from parser import BusinessAnalysisParser
-from models import AnalysisResponse, StatusResponse, RootResponse, FileUploadError, AnalysisError
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Union
+from fastapi import File, Header, Query, UploadFile, HTTPException, APIRouter
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from business_analyzer import extract_text_from_file, prompt_version, EXTRACTOR_VERSION
+from cache import analysis_cache, extraction_cache
+from chunking import ProcessMerger, split_content_defined, split_text, merge_processes
+from compaction import compact_text
+from client_registry import analyzer_registry
+from executor import analysis_executor
+from jobs import job_queue, job_workers
+from metrics import metrics_registry, stage_metrics
+from model_calls import model_calls
+from extractors import extractor_registry
+from profiling import bind, profiler
+from revisions import chunk_hash, revision_index
+from store import analysis_store
+from serialization import dumps, json_response, model_json, response_json, splice_json
+from uploads import SpooledUpload, spool_upload, spool_stream
+from parser import PARSER_VERSION, BusinessAnalysisParser
+from incremental_parser import IncrementalAnalysisParser
+from json_parser import JsonAnalysisParser
+from models import (
+    AnalysisResult,
+    AnalysisResponse,
+    AutomationPotential,
+    PainLevel,
+    PriorityLevel,
+    ClusterPage,
+    ProcessCluster,
+    ProcessClusterMatch,
+    ProcessPage,
+    RevisionStats,
+    StoredAnalysis,
+    StatusResponse,
+    RootResponse,
+    AnalyzerPoolStats,
+    CacheStats,
+    CompactionStats,
+    OutputFormat,
+    BatchFileResult,
+    BatchSummary,
+    JobResponse,
+    JobQueueStats,
+    ModelCallStats,
+    StageTimingStats,
+    FileUploadError,
+    AnalysisError,
+    ModelRateLimitError,
+    AnalysisCancelledError
+)
 from config import config
 
 # Create API router
 router = APIRouter()
 
+# Selectable engines for parsing the model output
+PARSER_ENGINES = {
+    "regex": BusinessAnalysisParser,
+    "incremental": IncrementalAnalysisParser
+}
+
+# How long documents are split for analysis (see AnalysisService.split_mode)
+SPLIT_INCREMENTAL = "incremental"
+SPLIT_CHUNKED = "chunked"
+
+# Receives (chunk index, outcome or None if the chunk failed) as chunks finish
+ChunkCallback = Callable[[int, Optional[Tuple[AnalysisResult, int, Optional[bool]]]], None]
+
+def format_sse_event(event: str, data: Union[BaseModel, Dict[str, Any]]) -> str:
+    """Format a single Server-Sent Events message with a JSON payload (a model or plain data)."""
+    with stage_metrics.time("serialization"):
+        payload = model_json(data) if isinstance(data, BaseModel) else dumps(data)
+        return f"event: {event}\ndata: {payload.decode('utf-8')}\n\n"
+
+def raise_if_cancelled(cancelled: Optional[threading.Event]) -> None:
+    """Stop a streamed analysis whose client has disconnected."""
+    if cancelled is not None and cancelled.is_set():
+        raise AnalysisCancelledError("Analysis cancelled: the client disconnected")
+
+def read_batch_archive(archive: SpooledUpload) -> List[Tuple[str, Optional[SpooledUpload], Optional[str]]]:
+    """
+    Unpack a spooled .zip batch upload, validating each member like an individual upload.
+
+    Members are streamed to their own spool files. Directories, hidden files and
+    macOS resource forks are skipped. Members that fail validation are returned
+    with an error instead of a spooled file.
+
+    Args:
+        archive: Spooled .zip upload
+
+    Returns:
+        List[Tuple[str, Optional[SpooledUpload], Optional[str]]]: (member name, spooled file, error) per file
+
+    Raises:
+        FileUploadError: If the archive is unreadable or holds too many files
+    """
+    try:
+        zip_archive = zipfile.ZipFile(archive.path)
+    except zipfile.BadZipFile:
+        raise FileUploadError("Invalid zip archive")
+
+    with zip_archive:
+        members = [
+            info for info in zip_archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith("__MACOSX/")
+            and not os.path.basename(info.filename).startswith(".")
+        ]
+        if len(members) > config.BATCH_MAX_FILES:
+            raise FileUploadError(f"Too many files. Maximum is {config.BATCH_MAX_FILES} per batch")
+
+        items = []
+        for info in members:
+            try:
+                FileValidator.validate_filename(info.filename)
+                FileValidator.validate_size(info.file_size)
+                # The copy stops at the size limit in case the declared size is wrong
+                with zip_archive.open(info) as member:
+                    upload = spool_stream(member, info.filename, config.MAX_FILE_SIZE)
+                items.append((info.filename, upload, None))
+            except FileUploadError as e:
+                items.append((info.filename, None, str(e)))
+            except (zipfile.BadZipFile, RuntimeError, OSError) as e:
+                items.append((info.filename, None, f"Could not read file from archive: {str(e)}"))
+    return items
+
+def build_job_response(job: Dict[str, Any]) -> JobResponse:
+    """Convert a job queue row into its API response."""
+    return JobResponse(
+        job_id=job["id"],
+        status=job["status"],
+        filename=job["filename"],
+        attempts=job["attempts"],
+        created_at=job["created_at"],
+        updated_at=job["updated_at"],
+        result=AnalysisResponse(**json.loads(job["result"])) if job["result"] else None,
+        error=job["error"]
+    )
+
+def job_response_json(job: Dict[str, Any]) -> bytes:
+    """Encode a job queue row as a JobResponse, reusing its stored result JSON as is."""
+    envelope = {
+        "job_id": job["id"],
+        "status": job["status"],
+        "filename": job["filename"],
+        "attempts": job["attempts"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+        "error": job["error"],
+    }
+    result = job["result"].encode("utf-8") if job["result"] else None
+    return splice_json(envelope, "result", result)
+
 class FileValidator:
     """Utility class for validating uploaded files."""
 
@@ -40,41 +191,102 @@ class FileValidator:
         if not file.filename:
             raise FileUploadError("No file selected")
 
-        if not FileValidator.allowed_file(file.filename):
+        FileValidator.validate_filename(file.filename)
+
+    @staticmethod
+    def validate_filename(filename: str) -> None:
+        """
+        Validate that a filename has an allowed extension.
+
+        Args:
+            filename: Name of an uploaded file or archive member
+
+        Raises:
+            FileUploadError: If the file type is not allowed
+        """
+        if not FileValidator.allowed_file(filename):
             allowed = ", ".join(config.ALLOWED_EXTENSIONS)
             raise FileUploadError(f"Invalid file type. Please upload {allowed.upper()} files only.")
 
     @staticmethod
-    async def validate_file_size(file: UploadFile) -> bytes:
+    async def spool_file(file: UploadFile) -> SpooledUpload:
         """
-        Read and validate file size.
+        Stream an upload to a spool file under the upload folder, validating its size.
+
+        Nothing beyond one fixed-size chunk is held in memory, and the copy stops as
+        soon as the upload crosses the size limit. Callers must clean up the returned
+        spool file.
 
         Args:
-            file: The uploaded file to validate
+            file: The uploaded file to spool
 
         Returns:
-            bytes: File content
+            SpooledUpload: The spooled file
 
         Raises:
             FileUploadError: If file is too large
         """
-        file_content = await file.read()
-        if len(file_content) > config.MAX_FILE_SIZE:
+        with stage_metrics.time("upload"):
+            return await spool_upload(file, config.MAX_FILE_SIZE)
+
+    @staticmethod
+    def validate_size(size: int) -> None:
+        """
+        Validate a file size against the upload limit.
+
+        Raises:
+            FileUploadError: If the file is too large
+        """
+        if size > config.MAX_FILE_SIZE:
             raise FileUploadError(
                 f"File too large. Maximum size is {config.MAX_FILE_SIZE_MB}MB"
             )
-        return file_content
 
 class AnalysisService:
     """Service class for handling business analysis operations."""
 
-    def __init__(self):
-        """Initialize the analysis service."""
-        self.parser = BusinessAnalysisParser()
+    def __init__(self, parser_engine: Optional[str] = None):
+        """
+        Initialize the analysis service.
+
+        Args:
+            parser_engine: Name of the parser engine to use (defaults to config.PARSER_ENGINE)
+
+        Raises:
+            ValueError: If the parser engine is unknown
+        """
+        engine = parser_engine or config.PARSER_ENGINE
+        if engine not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine}")
+        self.parser_engine = engine
+        self.parser = PARSER_ENGINES[engine]()
+        self.json_parser = JsonAnalysisParser(self.parser)
+        # Running stream pipelines; the event loop only keeps weak references to tasks
+        self._stream_tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def resolve_output_format(output_format: Optional[str] = None) -> str:
+        """
+        Pick the model output format for a request.
+
+        Args:
+            output_format: Requested format, or None for config.ANALYSIS_OUTPUT_FORMAT
+
+        Returns:
+            str: "text" or "json"
+
+        Raises:
+            ValueError: If the format is unknown
+        """
+        return OutputFormat(output_format or config.ANALYSIS_OUTPUT_FORMAT).value
+
+    def parser_for(self, output_format: str):
+        """Return the parser for model output in the given format."""
+        return self.json_parser if output_format == OutputFormat.JSON.value else self.parser
 
     def validate_api_key(self) -> str:
         """
-        Validate that API key is configured.
+        Validate that API key is configured. The mock backend needs none.
 
         Returns:
             str: The API key
@@ -83,71 +295,769 @@ class AnalysisService:
             AnalysisError: If API key is not configured
         """
         api_key = config.GEMINI_API_KEY
-        if not api_key:
+        if not api_key and config.LLM_BACKEND != "mock":
             raise AnalysisError("GEMINI_API_KEY environment variable not set")
-        return api_key
+        return api_key or ""
+
+    def parser_version(self, output_format: str) -> str:
+        """Identity of the parser used for an output format, for cache keys."""
+        # The JSON parser falls back to the text engine for non-JSON responses
+        prefix = "json+" if output_format == OutputFormat.JSON.value else ""
+        return f"{prefix}{self.parser_engine}-{PARSER_VERSION}"
+
+    def result_cache_key(self, text_content: str, output_format: str) -> str:
+        """Result cache key of an analysis of text_content by the configured backend, model and parser."""
+        return analysis_cache.make_key(
+            text_content, config.LLM_BACKEND, analyzer_registry.model_name, prompt_version(output_format),
+            self.parser_version(output_format)
+        )
 
-    def analyze_file_content(self, file_content: bytes, filename: str, api_key: str) -> dict:
+    def _analyze_text(self, text_content: str, api_key: str, output_format: str = "text") -> dict:
+        """Run the Gemini analysis on extracted text using the shared analyzer."""
+        with analyzer_registry.lease(api_key) as analyzer:
+            return analyzer.analyze_text(text_content, output_format)
+
+    def _analyze_cached(self, text_content: str, api_key: str,
+                        output_format: str = "text") -> Tuple[AnalysisResult, int, Optional[bool]]:
         """
-        Analyze file content using the business analyzer.
+        Analyze one piece of text, consulting the result cache first.
 
         Args:
-            file_content: Raw file bytes
-            filename: Original filename
+            text_content: Text sent to the model
             api_key: Gemini API key
+            output_format: Model output format, "text" or "json"
 
         Returns:
-            dict: Analysis result from the business analyzer
+            Tuple[AnalysisResult, int, Optional[bool]]: Analysis, response length and cache hit flag
+                (None when caching is disabled)
 
         Raises:
             AnalysisError: If analysis fails
         """
+        cache_key = None
+        if config.RESULT_CACHE_ENABLED:
+            cache_key = self.result_cache_key(text_content, output_format)
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                return cached[0], cached[1], True
+
         try:
-            analyzer = BusinessProcessAnalyzer(api_key)
-            result = analyzer.analyze_from_bytes(file_content, filename)
+            with stage_metrics.time("llm"):
+                result = self._analyze_text(text_content, api_key, output_format)
+        except ModelRateLimitError:
+            raise
+        except Exception as e:
+            raise AnalysisError(f"Analysis failed: {str(e)}")
 
-            if not result.get('success'):
-                error_msg = result.get('error', 'Unknown analysis error')
-                raise AnalysisError(f"Analysis failed: {error_msg}")
+        if not result.get('success'):
+            error_msg = result.get('error', 'Unknown analysis error')
+            raise AnalysisError(f"Analysis failed: {error_msg}")
 
-            return result
+        with stage_metrics.time("parsing"):
+            analysis = self.parser_for(output_format).parse_analysis(result['analysis'])
+        response_length = result.get('response_length', 0)
+        if cache_key is not None:
+            analysis_cache.set(cache_key, analysis, response_length)
+        return analysis, response_length, (False if cache_key is not None else None)
 
-        except Exception as e:
-            raise AnalysisError(f"Analysis failed: {str(e)}")
+    def _analyze_chunks(self, chunks: List[str], api_key: str, output_format: str = "text",
+                        on_chunk: Optional[ChunkCallback] = None
+                        ) -> Tuple[List[Optional[Tuple[AnalysisResult, int, Optional[bool]]]], List[str]]:
+        """
+        Analyze the chunks of a document, each through the result cache.
+
+        Chunks run concurrently on the chunk pool, at most CHUNK_PARALLELISM at a
+        time per document, so latency is bounded by the slowest chunk rather than
+        by total length. Chunks that fail are left out of the result and reported in
+        the returned errors, as long as one succeeds.
+
+        Args:
+            chunks: Chunks in document order
+            api_key: Gemini API key
+            output_format: Model output format, "text" or "json"
+            on_chunk: Called with (chunk index, outcome or None if it failed) as each chunk
+                finishes, in completion order; an exception it raises stops the analysis
+
+        Returns:
+            Tuple[List[Optional[Tuple[AnalysisResult, int, Optional[bool]]]], List[str]]: Per chunk,
+                the _analyze_cached outcome (None if it failed), and the errors of failed chunks
+
+        Raises:
+            AnalysisError: If every chunk fails
+            ModelRateLimitError: If every chunk fails and some were rate limited
+        """
+        outcomes: List[Optional[Tuple[AnalysisResult, int, Optional[bool]]]] = [None] * len(chunks)
+        errors: List[str] = []
+        rate_limit: Optional[ModelRateLimitError] = None
+
+        pending = {}
+        remaining = list(enumerate(chunks))
+        try:
+            while remaining or pending:
+                while remaining and len(pending) < max(1, config.CHUNK_PARALLELISM):
+                    index, chunk = remaining.pop(0)
+                    future = analysis_executor.chunk_pool.submit(bind(self._analyze_cached), chunk, api_key, output_format)
+                    pending[future] = index
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        outcomes[index] = future.result()
+                    except AnalysisError as e:
+                        errors.append(f"chunk {index + 1}: {str(e)}")
+                        if isinstance(e, ModelRateLimitError):
+                            rate_limit = e
+                    if on_chunk is not None:
+                        on_chunk(index, outcomes[index])
+        finally:
+            # If on_chunk stopped the analysis, don't leave chunk calls running behind it
+            for future in pending:
+                future.cancel()
+            wait(pending)
 
-    def process_analysis_result(self, result: dict) -> AnalysisResponse:
+        if all(outcome is None for outcome in outcomes):
+            if rate_limit is not None:
+                raise rate_limit
+            raise AnalysisError(f"Analysis failed for all {len(chunks)} chunks: {'; '.join(errors)}")
+        return outcomes, errors
+
+    def _analyze_chunked(self, text_content: str, api_key: str, output_format: str = "text",
+                         on_chunk: Optional[ChunkCallback] = None
+                         ) -> Tuple[AnalysisResult, int, Optional[bool], List[str]]:
         """
-        Process the raw analysis result into structured format.
+        Analyze a long document as overlapping chunks and merge the results.
 
         Args:
-            result: Raw analysis result from business analyzer
+            text_content: Full document text
+            api_key: Gemini API key
+            output_format: Model output format, "text" or "json"
+            on_chunk: Called as each chunk finishes, see _analyze_chunks
 
         Returns:
-            AnalysisResponse: Structured analysis response
+            Tuple[AnalysisResult, int, Optional[bool], List[str]]: Merged analysis, total response
+                length, whether every chunk was served from cache, and the errors of failed chunks
+
+        Raises:
+            AnalysisError: If every chunk fails
+            ModelRateLimitError: If every chunk fails and some were rate limited
+        """
+        chunks = split_text(text_content, config.CHUNK_SIZE_CHARS, config.CHUNK_OVERLAP_CHARS)
+        outcomes, errors = self._analyze_chunks(chunks, api_key, output_format, on_chunk)
+        return (*self._merge_chunks(outcomes, errors), errors)
+
+    def _merge_chunks(self, outcomes: List[Optional[Tuple[AnalysisResult, int, Optional[bool]]]],
+                      errors: List[str]) -> Tuple[AnalysisResult, int, Optional[bool]]:
+        """Merge the analyses of a document's chunks into one result, logging any failed chunks."""
+        succeeded = [outcome for outcome in outcomes if outcome is not None]
+        if errors:
+            print(f"Partial analysis: {len(errors)} of {len(outcomes)} chunks failed: {'; '.join(errors)}")
+        processes = merge_processes([outcome[0] for outcome in succeeded])
+        with stage_metrics.time("parsing"):
+            analysis = self.parser.build_analysis_result(processes)
+        response_length = sum(outcome[1] for outcome in succeeded)
+        cache_hit = None
+        if config.RESULT_CACHE_ENABLED:
+            cache_hit = not errors and all(outcome[2] for outcome in succeeded)
+        return analysis, response_length, cache_hit
+
+    def _analyze_revision(self, text_content: str, api_key: str, output_format: str = "text",
+                          on_chunk: Optional[ChunkCallback] = None
+                          ) -> Tuple[AnalysisResult, int, Optional[bool], RevisionStats, List[str]]:
+        """
+        Analyze a document in incremental mode, re-analyzing only what changed since an earlier version.
+
+        The document is split into content-defined chunks, so the unchanged parts of a
+        revised document produce the same chunks as before and their analyses come
+        from the result cache; only new or edited chunks are sent to the model. The
+        earlier version is recognized by the chunks it shares with this one.
+
+        Args:
+            text_content: Full document text
+            api_key: Gemini API key
+            output_format: Model output format, "text" or "json"
+            on_chunk: Called as each chunk finishes, see _analyze_chunks
+
+        Returns:
+            Tuple[AnalysisResult, int, Optional[bool], RevisionStats, List[str]]: Merged analysis,
+                total response length, whether every chunk was served from cache, the reuse
+                statistics and the errors of failed chunks
+
+        Raises:
+            AnalysisError: If every chunk fails
+            ModelRateLimitError: If every chunk fails and some were rate limited
+        """
+        chunks = split_content_defined(text_content, config.INCREMENTAL_CHUNK_CHARS)
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        previous = revision_index.find_previous(hashes)
+
+        outcomes, errors = self._analyze_chunks(chunks, api_key, output_format, on_chunk)
+        analysis, response_length, cache_hit = self._merge_chunks(outcomes, errors)
+
+        analyzed = [chunk for chunk, outcome in zip(chunks, outcomes) if outcome is not None and not outcome[2]]
+        revision = RevisionStats(
+            document_id=revision_index.record(hashes),
+            revision_of=previous[0] if previous is not None else None,
+            chunks=len(chunks),
+            reused_chunks=sum(1 for outcome in outcomes if outcome is not None and outcome[2]),
+            analyzed_chunks=len(analyzed),
+            analyzed_chars=sum(len(chunk) for chunk in analyzed)
+        )
+        return analysis, response_length, cache_hit, revision, errors
+
+    @staticmethod
+    def split_mode(text_content: str) -> Optional[str]:
+        """
+        Choose how compacted text is analyzed.
+
+        Returns:
+            Optional[str]: SPLIT_INCREMENTAL for content-defined chunks in incremental mode,
+                SPLIT_CHUNKED for overlapping chunks, or None to analyze the text in one call
+        """
+        if (config.INCREMENTAL_ANALYSIS_ENABLED and config.RESULT_CACHE_ENABLED
+                and len(text_content) >= config.INCREMENTAL_MIN_CHARS):
+            return SPLIT_INCREMENTAL
+        if config.CHUNKED_ANALYSIS_ENABLED and len(text_content) > config.CHUNKING_THRESHOLD_CHARS:
+            return SPLIT_CHUNKED
+        return None
+
+    def _analyze_split(self, text_content: str, api_key: str, output_format: str, mode: str,
+                       on_chunk: Optional[ChunkCallback] = None) -> AnalysisResponse:
+        """
+        Analyze text in chunks, as chosen by split_mode.
+
+        If some chunks fail, the response holds the analysis of the others and
+        reports the failures in failed_chunks and chunk_errors.
+
+        Raises:
+            AnalysisError: If every chunk fails
+            ModelRateLimitError: If every chunk fails and some were rate limited
         """
-        if result.get('success') and result.get('analysis'):
-            structured_data = self.parser.parse_analysis(result['analysis'])
-            return AnalysisResponse(
-                success=True,
-                analysis=structured_data,
-                response_length=result.get('response_length', 0)
+        revision = None
+        if mode == SPLIT_INCREMENTAL:
+            analysis, response_length, cache_hit, revision, errors = self._analyze_revision(
+                text_content, api_key, output_format, on_chunk
             )
         else:
-            return AnalysisResponse(
-                success=False,
-                error=result.get('error', 'Analysis processing failed')
+            analysis, response_length, cache_hit, errors = self._analyze_chunked(
+                text_content, api_key, output_format, on_chunk
             )
+        return AnalysisResponse(
+            success=True,
+            analysis=analysis,
+            response_length=response_length,
+            cache_hit=cache_hit,
+            revision=revision,
+            failed_chunks=len(errors) if errors else None,
+            chunk_errors=errors or None
+        )
+
+    def compact(self, text_content: str) -> Tuple[str, Optional[CompactionStats]]:
+        """
+        Run the configured compaction stages over extracted text.
+
+        Falls back to the original text if compaction would leave nothing to analyze.
+
+        Args:
+            text_content: Extracted document text
+
+        Returns:
+            Tuple[str, Optional[CompactionStats]]: Text to analyze, and the token
+                reduction, or None when compaction is disabled
+        """
+        if not config.COMPACTION_ENABLED:
+            return text_content, None
+        compacted, stats = compact_text(text_content, config.COMPACTION_STAGES)
+        if not compacted.strip():
+            return text_content, None
+        return compacted, CompactionStats(**stats)
+
+    def analyze_text_content(self, text_content: str, api_key: str,
+                             output_format: Optional[str] = None) -> AnalysisResponse:
+        """
+        Analyze extracted text, serving repeated documents from the result cache.
+
+        The text is compacted first. In incremental mode, documents of at least
+        INCREMENTAL_MIN_CHARS are analyzed as content-defined chunks so a revised
+        document only re-analyzes its changes; otherwise documents still longer than
+        CHUNKING_THRESHOLD_CHARS are analyzed in chunks. If some chunks fail, the
+        response holds the analysis of the others and reports the failures in
+        failed_chunks and chunk_errors.
+
+        Args:
+            text_content: Extracted document text
+            api_key: Gemini API key
+            output_format: Model output format (defaults to config.ANALYSIS_OUTPUT_FORMAT)
+
+        Returns:
+            AnalysisResponse: Structured analysis response
+
+        Raises:
+            AnalysisError: If analysis fails
+        """
+        if not text_content.strip():
+            raise AnalysisError("Analysis failed: No readable text content found in the file")
+
+        output_format = self.resolve_output_format(output_format)
+        text_content, compaction = self.compact(text_content)
+
+        mode = self.split_mode(text_content)
+        if mode is not None:
+            response = self._analyze_split(text_content, api_key, output_format, mode)
+            response.compaction = compaction
+            return response
+
+        analysis, response_length, cache_hit = self._analyze_cached(text_content, api_key, output_format)
+        return AnalysisResponse(
+            success=True,
+            analysis=analysis,
+            response_length=response_length,
+            cache_hit=cache_hit,
+            compaction=compaction
+        )
+
+    @staticmethod
+    def persist(filename: str, response: AnalysisResponse) -> None:
+        """
+        Queue a successful analysis for the analysis store and record the id it gets.
+
+        Args:
+            filename: Original filename of the analyzed upload
+            response: Analysis response; its analysis_id is set when the analysis is stored
+        """
+        if config.STORE_ENABLED and response.success and response.analysis is not None:
+            response.analysis_id = analysis_store.save(filename, response.analysis, response.response_length or 0)
+
+    def extract_file_text(self, file_path: str, filename: str) -> str:
+        """
+        Extract the text of a file in the current thread, consulting the extraction cache.
+
+        Used by background job workers, which run outside the server's pools.
+
+        Args:
+            file_path: Location of the file
+            filename: Original filename, used to pick the extractor
+
+        Returns:
+            str: Extracted text
+        """
+        if not config.EXTRACTION_CACHE_ENABLED:
+            return extract_text_from_file(file_path, filename)
+        cache_key, cached = extraction_cache.lookup(file_path, filename, EXTRACTOR_VERSION, config.PDF_MAX_PAGES)
+        if cached is not None:
+            return cached
+        text_content = extract_text_from_file(file_path, filename)
+        extraction_cache.set(cache_key, text_content)
+        return text_content
+
+    async def extract_upload_text(self, upload: SpooledUpload, max_pages: Optional[int] = None) -> str:
+        """
+        Extract the text of a spooled upload on the CPU pool.
+
+        Documents seen before, under any model or prompt, are served from the
+        extraction cache. Long PDFs are split into page ranges that run on the
+        pool in parallel.
+
+        Args:
+            upload: Spooled upload
+            max_pages: Extract at most this many PDF pages, e.g. for previews
+
+        Returns:
+            str: Extracted text
+        """
+        with stage_metrics.time("extraction"):
+            caps = [cap for cap in (max_pages, config.PDF_MAX_PAGES) if cap]
+            page_cap = min(caps) if caps else None
+
+            cache_key = None
+            if config.EXTRACTION_CACHE_ENABLED:
+                cache_key, cached = await analysis_executor.run_io(
+                    extraction_cache.lookup, upload.path, upload.filename, EXTRACTOR_VERSION, page_cap
+                )
+                if cached is not None:
+                    return cached
+
+            if os.path.splitext(upload.filename)[1].lower() == ".pdf":
+                pdf_extractor = await analysis_executor.run_io(extractor_registry.load, "pdf")
+                text_content = (await pdf_extractor.extract_pdf_parallel(analysis_executor, upload.path, page_cap)).text
+            else:
+                text_content = await analysis_executor.run_cpu(extract_text_from_file, upload.path, upload.filename)
+
+            if cache_key is not None:
+                await analysis_executor.run_io(extraction_cache.set, cache_key, text_content)
+            return text_content
+
+    async def analyze_upload(self, upload: SpooledUpload, api_key: str,
+                             max_pages: Optional[int] = None,
+                             output_format: Optional[str] = None) -> AnalysisResponse:
+        """
+        Run the full analysis pipeline off the event loop.
+
+        Text extraction runs on the CPU pool; the cache lookup, Gemini call and
+        parsing run on the I/O pool. The whole pipeline holds one of the
+        in-flight analysis slots.
+
+        Args:
+            upload: Spooled upload to analyze
+            api_key: Gemini API key
+            max_pages: Extract at most this many PDF pages
+            output_format: Model output format (defaults to config.ANALYSIS_OUTPUT_FORMAT)
+
+        Returns:
+            AnalysisResponse: Structured analysis response
+
+        Raises:
+            AnalysisError: If extraction or analysis fails
+        """
+        async with analysis_executor.slot():
+            try:
+                text_content = await self.extract_upload_text(upload, max_pages)
+            except Exception as e:
+                raise AnalysisError(f"Analysis failed: {str(e)}")
+
+            response = await analysis_executor.run_io(self.analyze_text_content, text_content, api_key, output_format)
+            self.persist(upload.filename, response)
+            return response
+
+    def _stream_text_content(self, text_content: str, api_key: str,
+                             emit: Callable[[str, Union[BaseModel, Dict[str, Any]]], None],
+                             output_format: str = "text", filename: Optional[str] = None,
+                             cancelled: Optional[threading.Event] = None) -> None:
+        """
+        Stream the analysis of extracted text, emitting each process as soon as it is complete.
+
+        Emits "process" events as PROCESS #N sections (or JSON process objects) finish,
+        then "overview" and "done".
+        Cached analyses are replayed through the same events. The text is compacted
+        first and "done" reports the token reduction and the analysis store id.
+        Documents that split_mode analyzes in chunks go through _stream_split.
+
+        Args:
+            text_content: Extracted document text
+            api_key: Gemini API key
+            emit: Callback receiving (event name, model or JSON-serializable payload)
+            output_format: Model output format, "text" or "json"
+            filename: Original filename, recorded in the analysis store
+            cancelled: Set when the client has gone away; the analysis stops at the next fragment
+
+        Raises:
+            AnalysisError: If the model produces no output
+            AnalysisCancelledError: If cancelled is set before the analysis finishes
+        """
+        text_content, compaction = self.compact(text_content)
+
+        mode = self.split_mode(text_content)
+        if mode is not None:
+            self._stream_split(text_content, api_key, emit, output_format, mode, compaction, filename, cancelled)
+            return
+
+        cache_key = None
+        if config.RESULT_CACHE_ENABLED:
+            cache_key = self.result_cache_key(text_content, output_format)
+            cached = analysis_cache.get(cache_key)
+            if cached is not None:
+                analysis, response_length = cached
+                for process in analysis.processes:
+                    emit("process", process)
+                emit("overview", analysis.meetingOverview)
+                response = AnalysisResponse(success=True, analysis=analysis, response_length=response_length,
+                                            cache_hit=True, compaction=compaction)
+                self.persist(filename, response)
+                emit("done", self.done_event(response))
+                return
+
+        stream = self.parser_for(output_format).stream()
+        parse_seconds = 0.0
+        started = time.perf_counter()
+        with analyzer_registry.lease(api_key) as analyzer:
+            for fragment in analyzer.stream_text(text_content, output_format):
+                raise_if_cancelled(cancelled)
+                parse_started = time.perf_counter()
+                processes = stream.feed(fragment)
+                parse_seconds += time.perf_counter() - parse_started
+                for process in processes:
+                    emit("process", process)
+        # Parsing is interleaved with generation; the rest of the time is the model's
+        stage_metrics.observe("llm", time.perf_counter() - started - parse_seconds)
+
+        streamed = len(stream.processes)
+        parse_started = time.perf_counter()
+        analysis = stream.close()
+        stage_metrics.observe("parsing", parse_seconds + time.perf_counter() - parse_started)
+        if stream.response_length == 0:
+            raise AnalysisError("Analysis failed: No response generated from AI model")
+
+        # The trailing process, or the default summary process if nothing was parseable
+        for process in analysis.processes[streamed:]:
+            emit("process", process)
+
+        if cache_key is not None:
+            analysis_cache.set(cache_key, analysis, stream.response_length)
+        emit("overview", analysis.meetingOverview)
+        response = AnalysisResponse(success=True, analysis=analysis, response_length=stream.response_length,
+                                    cache_hit=False if cache_key is not None else None, compaction=compaction)
+        self.persist(filename, response)
+        emit("done", self.done_event(response))
+
+    def _stream_split(self, text_content: str, api_key: str,
+                      emit: Callable[[str, Union[BaseModel, Dict[str, Any]]], None],
+                      output_format: str, mode: str, compaction: Optional[CompactionStats],
+                      filename: Optional[str] = None, cancelled: Optional[threading.Event] = None) -> None:
+        """
+        Stream the analysis of a document that is analyzed in chunks.
+
+        Chunks are released in document order as soon as they and every chunk before
+        them have finished, and the processes they add to the merged result are
+        emitted right away, numbered as in the final analysis. A process merged with
+        a duplicate from a later chunk is not emitted again; the final version is in
+        the stored analysis. "done" also reports failed chunks and, in incremental
+        mode, the reuse statistics.
+
+        Args:
+            text_content: Compacted document text
+            api_key: Gemini API key
+            emit: Callback receiving (event name, model or JSON-serializable payload)
+            output_format: Model output format, "text" or "json"
+            mode: Split mode chosen by split_mode
+            compaction: Token reduction of the compaction
+            filename: Original filename, recorded in the analysis store
+            cancelled: Set when the client has gone away; no further chunks are started
+
+        Raises:
+            AnalysisError: If every chunk fails
+            AnalysisCancelledError: If cancelled is set before the analysis finishes
+            ModelRateLimitError: If every chunk fails and some were rate limited
+        """
+        finished: Dict[int, Optional[Tuple[AnalysisResult, int, Optional[bool]]]] = {}
+        merger = ProcessMerger()
+        next_index = 0
+        emitted = 0
+
+        def on_chunk(index: int, outcome: Optional[Tuple[AnalysisResult, int, Optional[bool]]]) -> None:
+            nonlocal next_index, emitted
+            raise_if_cancelled(cancelled)
+            finished[index] = outcome
+            while next_index in finished:
+                outcome = finished.pop(next_index)
+                next_index += 1
+                if outcome is None:
+                    continue
+                for process in merger.add(outcome[0]):
+                    emit("process", process)
+                    emitted += 1
+
+        response = self._analyze_split(text_content, api_key, output_format, mode, on_chunk)
+        response.compaction = compaction
+
+        # The default summary process if no chunk produced a parseable process
+        for process in response.analysis.processes[emitted:]:
+            emit("process", process)
+        emit("overview", response.analysis.meetingOverview)
+        self.persist(filename, response)
+        emit("done", self.done_event(response))
+
+    @staticmethod
+    def done_event(response: AnalysisResponse) -> Dict[str, Any]:
+        """Payload of a stream's "done" event."""
+        return {
+            "response_length": response.response_length,
+            "cache_hit": response.cache_hit,
+            "compaction": response.compaction.dict() if response.compaction is not None else None,
+            "analysis_id": response.analysis_id,
+            "revision": response.revision.dict() if response.revision is not None else None,
+            "failed_chunks": response.failed_chunks,
+            "chunk_errors": response.chunk_errors
+        }
+
+    async def stream_upload(self, upload: SpooledUpload, api_key: str,
+                            max_pages: Optional[int] = None,
+                            output_format: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Run the streaming analysis pipeline, yielding Server-Sent Events.
+
+        Failures after the stream has started are reported as an "error" event.
+        The pipeline runs as its own task, so when the client disconnects it is told
+        to stop and keeps its analysis slot until the model call has actually ended.
+        The spool file is removed once the pipeline ends.
+
+        Args:
+            upload: Spooled upload to analyze
+            api_key: Gemini API key
+            max_pages: Extract at most this many PDF pages
+            output_format: Model output format (defaults to config.ANALYSIS_OUTPUT_FORMAT)
+
+        Yields:
+            str: Formatted SSE messages
+        """
+        output_format = self.resolve_output_format(output_format)
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(event: str, data: Union[BaseModel, Dict[str, Any]]) -> None:
+            raise_if_cancelled(cancelled)
+            loop.call_soon_threadsafe(queue.put_nowait, format_sse_event(event, data))
+
+        task = asyncio.ensure_future(
+            self._run_stream(upload, api_key, max_pages, output_format, emit, cancelled, queue)
+        )
+        self._stream_tasks.add(task)
+        task.add_done_callback(self._stream_tasks.discard)
+        try:
+            while True:
+                message = await queue.get()
+                if message is None:
+                    break
+                yield message
+        finally:
+            # Stops the worker at its next fragment or chunk if the client went away
+            cancelled.set()
+
+    async def _run_stream(self, upload: SpooledUpload, api_key: str, max_pages: Optional[int],
+                          output_format: str, emit: Callable[[str, Union[BaseModel, Dict[str, Any]]], None],
+                          cancelled: threading.Event, queue: asyncio.Queue) -> None:
+        """
+        Extract and stream-analyze an upload, putting SSE messages on queue and None when done.
+
+        Holds one of the in-flight analysis slots until the analysis has finished or
+        stopped after cancelled was set.
+        """
+        try:
+            async with analysis_executor.slot():
+                try:
+                    text_content = await self.extract_upload_text(upload, max_pages)
+                except Exception as e:
+                    queue.put_nowait(format_sse_event("error", {"error": f"Analysis failed: {str(e)}"}))
+                    return
+
+                if not text_content.strip():
+                    queue.put_nowait(format_sse_event(
+                        "error", {"error": "Analysis failed: No readable text content found in the file"}
+                    ))
+                    return
+                if cancelled.is_set():
+                    return
+
+                try:
+                    await analysis_executor.run_io(
+                        self._stream_text_content, text_content, api_key, emit, output_format, upload.filename,
+                        cancelled
+                    )
+                except AnalysisCancelledError:
+                    pass
+                except ModelRateLimitError as e:
+                    queue.put_nowait(format_sse_event("error", {"error": str(e), "retry_after": math.ceil(e.retry_after)}))
+                except Exception as e:
+                    message = str(e) if isinstance(e, AnalysisError) else f"Analysis failed: {str(e)}"
+                    queue.put_nowait(format_sse_event("error", {"error": message}))
+        finally:
+            upload.cleanup()
+            queue.put_nowait(None)
+
+    async def _analyze_batch_item(self, index: int, filename: str, upload: SpooledUpload,
+                                  api_key: str) -> BatchFileResult:
+        """Analyze one file of a batch, reporting failures in its response instead of raising."""
+        try:
+            response = await self.analyze_upload(upload, api_key)
+        except AnalysisError as e:
+            response = AnalysisResponse(success=False, error=str(e))
+        except Exception as e:
+            response = AnalysisResponse(success=False, error=f"Server error: {str(e)}")
+        return BatchFileResult(index=index, filename=filename, response=response)
+
+    def summarize_batch(self, results: List[BatchFileResult]) -> BatchSummary:
+        """
+        Combine per-file results into a batch summary.
+
+        Args:
+            results: Result of every file in the batch
+
+        Returns:
+            BatchSummary: File counts and an overview across all extracted processes
+        """
+        succeeded = [result for result in results if result.response.success]
+        processes = [
+            process
+            for result in succeeded if result.response.analysis
+            for process in result.response.analysis.processes
+        ]
+        return BatchSummary(
+            total_files=len(results),
+            succeeded=len(succeeded),
+            failed=len(results) - len(succeeded),
+            overview=self.parser.build_analysis_result(processes).meetingOverview if processes else None
+        )
+
+    async def stream_batch(self, items: List[Tuple[str, Optional[SpooledUpload], Optional[str]]],
+                           api_key: str) -> AsyncIterator[str]:
+        """
+        Analyze a batch of files concurrently, yielding Server-Sent Events.
+
+        Emits a "file" event per file as soon as it finishes, in completion order,
+        then an "overview" event with the BatchSummary and a final "done" event.
+        Files share the server-wide in-flight analysis limit with all other requests,
+        and a file that fails is reported in its own event without affecting the rest.
+
+        Args:
+            items: (filename, spooled file, validation error) per file; spool files are
+                removed once the batch ends
+            api_key: Gemini API key
+
+        Yields:
+            str: Formatted SSE messages
+        """
+        results: List[BatchFileResult] = []
+        tasks = []
+        try:
+            for index, (filename, upload, error) in enumerate(items):
+                if error is not None:
+                    result = BatchFileResult(
+                        index=index, filename=filename, response=AnalysisResponse(success=False, error=error)
+                    )
+                    results.append(result)
+                    yield format_sse_event("file", result)
+                else:
+                    tasks.append(asyncio.ensure_future(
+                        self._analyze_batch_item(index, filename, upload, api_key)
+                    ))
+
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                results.append(result)
+                yield format_sse_event("file", result)
+        finally:
+            # Drop files still waiting for a slot if the client goes away
+            for task in tasks:
+                task.cancel()
+            for _, upload, _ in items:
+                if upload is not None:
+                    upload.cleanup()
+
+        yield format_sse_event("overview", self.summarize_batch(results))
+        yield format_sse_event("done", {"total_files": len(results)})
 
 # Initialize services
 analysis_service = AnalysisService()
 
 @router.post("/api/analyze", response_model=AnalysisResponse)
-async def analyze_transcript(file: UploadFile = File(...)):
+async def analyze_transcript(file: UploadFile = File(...),
+                             max_pages: Optional[int] = Query(None, ge=1),
+                             output_format: Optional[OutputFormat] = Query(None),
+                             profile: Optional[str] = Query(None, include_in_schema=False),
+                             x_profile_token: Optional[str] = Header(None, include_in_schema=False),
+                             x_request_id: Optional[str] = Header(None)):
     """
     Analyze uploaded transcript file using structured business process analyzer.
 
+    Requests presenting the profiling token (X-Profile-Token header or ?profile=)
+    are profiled; the response's X-Profile-Id header names the stored profile.
+
     Args:
         file: Uploaded file (TXT, PDF, or DOCX)
+        max_pages: Analyze only the first pages of a PDF, e.g. for a quick preview
+        output_format: Ask the model for "text" or "json" output (defaults to config)
+        profile: Profiling token, as an alternative to the header
+        x_profile_token: Profiling token
+        x_request_id: Request id a profile is stored under
 
     Returns:
         AnalysisResponse: Structured analysis results
@@ -155,6 +1065,27 @@ async def analyze_transcript(file: UploadFile = File(...)):
     Raises:
         HTTPException: For various error conditions
     """
+    session = None
+    if profiler.is_authorized(x_profile_token or profile):
+        session = profiler.start(x_request_id)
+    if session is None:
+        return await _analyze_transcript(file, max_pages, output_format)
+
+    profile_header = {"X-Profile-Id": session.profile_id}
+    try:
+        with profiler.activate(session):
+            response = await _analyze_transcript(file, max_pages, output_format)
+    except HTTPException as e:
+        e.headers = {**(e.headers or {}), **profile_header}
+        raise
+    finally:
+        await analysis_executor.run_io(profiler.finish, session)
+    response.headers.update(profile_header)
+    return response
+
+async def _analyze_transcript(file: UploadFile, max_pages: Optional[int],
+                              output_format: Optional[OutputFormat]) -> Response:
+    """Run /api/analyze: validate, spool and analyze the upload and serialize the result."""
     try:
         # Validate API configuration
         api_key = analysis_service.validate_api_key()
@@ -162,25 +1093,27 @@ async def analyze_transcript(file: UploadFile = File(...)):
         # Validate file upload
         FileValidator.validate_file_upload(file)
 
-        # Read and validate file size
-        file_content = await FileValidator.validate_file_size(file)
-
-        # Perform analysis
-        result = analysis_service.analyze_file_content(file_content, file.filename, api_key)
+        # Stream the upload to disk, validating its size
+        upload = await FileValidator.spool_file(file)
 
-        # Process and return structured results
-        response = analysis_service.process_analysis_result(result)
+        # Perform analysis and process structured results off the event loop
+        try:
+            response = await analysis_service.analyze_upload(upload, api_key, max_pages, output_format)
+        finally:
+            upload.cleanup()
 
         if response.success:
-            return response
+            with stage_metrics.time("serialization"):
+                body = response_json(response)
+            return json_response(body)
         else:
-            return JSONResponse(
-                content=response.dict(),
-                status_code=500
-            )
+            return json_response(response, status_code=500)
 
     except FileUploadError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except ModelRateLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e),
+                            headers={"Retry-After": str(math.ceil(e.retry_after))})
     except AnalysisError as e:
         raise HTTPException(status_code=500, detail=str(e))
     except HTTPException:
@@ -191,6 +1124,159 @@ async def analyze_transcript(file: UploadFile = File(...)):
             detail=f"Server error: {str(e)}"
         )
 
+@router.post("/api/analyze/stream")
+async def analyze_transcript_stream(file: UploadFile = File(...),
+                                    max_pages: Optional[int] = Query(None, ge=1),
+                                    output_format: Optional[OutputFormat] = Query(None)):
+    """
+    Analyze an uploaded transcript, streaming results as Server-Sent Events.
+
+    Emits a "process" event for each BusinessProcess as soon as the model has
+    finished generating it, then an "overview" event with the MeetingOverview and
+    a final "done" event. Errors during analysis are sent as an "error" event.
+
+    Args:
+        file: Uploaded file (TXT, PDF, or DOCX)
+        max_pages: Analyze only the first pages of a PDF, e.g. for a quick preview
+        output_format: Ask the model for "text" or "json" output (defaults to config)
+
+    Returns:
+        StreamingResponse: text/event-stream response
+
+    Raises:
+        HTTPException: If the upload is invalid or the API key is missing
+    """
+    try:
+        api_key = analysis_service.validate_api_key()
+        FileValidator.validate_file_upload(file)
+        upload = await FileValidator.spool_file(file)
+    except FileUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AnalysisError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        analysis_service.stream_upload(upload, api_key, max_pages, output_format),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/api/analyze/batch")
+async def analyze_batch(files: List[UploadFile] = File(...)):
+    """
+    Analyze many transcripts at once, streaming per-file results as Server-Sent Events.
+
+    Accepts several files, or a single .zip archive whose members are analyzed as
+    individual files. Each file is validated separately; rejected and failed files
+    are reported in their own "file" event without failing the batch. Emits a
+    "file" event with a BatchFileResult as each file completes, then an "overview"
+    event with the BatchSummary and a final "done" event.
+
+    Args:
+        files: Uploaded files (TXT, PDF, or DOCX), or one .zip archive of them
+
+    Returns:
+        StreamingResponse: text/event-stream response
+
+    Raises:
+        HTTPException: If the batch itself is invalid or the API key is missing
+    """
+    items = []
+    try:
+        api_key = analysis_service.validate_api_key()
+
+        if len(files) == 1 and (files[0].filename or "").lower().endswith(".zip"):
+            archive = await spool_upload(files[0], config.BATCH_MAX_ARCHIVE_SIZE)
+            try:
+                # Decompresses and spools every member; keep it off the event loop
+                items = await analysis_executor.run_io(read_batch_archive, archive)
+            finally:
+                archive.cleanup()
+        else:
+            if len(files) > config.BATCH_MAX_FILES:
+                raise FileUploadError(f"Too many files. Maximum is {config.BATCH_MAX_FILES} per batch")
+            for file in files:
+                try:
+                    FileValidator.validate_file_upload(file)
+                    items.append((file.filename, await FileValidator.spool_file(file), None))
+                except FileUploadError as e:
+                    items.append((file.filename or "", None, str(e)))
+
+        if not items:
+            raise FileUploadError("No files to analyze")
+
+    except (FileUploadError, AnalysisError) as e:
+        for _, upload, _ in items:
+            if upload is not None:
+                upload.cleanup()
+        status_code = 400 if isinstance(e, FileUploadError) else 500
+        raise HTTPException(status_code=status_code, detail=str(e))
+
+    return StreamingResponse(
+        analysis_service.stream_batch(items, api_key),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/api/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(file: UploadFile = File(...)):
+    """
+    Queue an uploaded transcript for background analysis.
+
+    The upload is stored and a job id is returned right away; poll
+    GET /api/jobs/{job_id} for the status and, once finished, the AnalysisResponse.
+
+    Args:
+        file: Uploaded file (TXT, PDF, or DOCX)
+
+    Returns:
+        JobResponse: The queued job
+
+    Raises:
+        HTTPException: If the upload is invalid or the API key is missing
+    """
+    try:
+        analysis_service.validate_api_key()
+        FileValidator.validate_file_upload(file)
+        upload = await FileValidator.spool_file(file)
+        try:
+            job = await analysis_executor.run_io(job_queue.enqueue, upload)
+        finally:
+            # A no-op once the queue has taken ownership of the file
+            upload.cleanup()
+        return json_response(build_job_response(job), status_code=202)
+
+    except FileUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except AnalysisError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Server error: {str(e)}"
+        )
+
+@router.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Get the status of a background analysis job.
+
+    Args:
+        job_id: Job identifier returned by POST /api/jobs
+
+    Returns:
+        JobResponse: Job status, with the AnalysisResponse once the job has finished
+
+    Raises:
+        HTTPException: If the job does not exist
+    """
+    job = await analysis_executor.run_io(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return json_response(await analysis_executor.run_io(job_response_json, job))
+
 @router.get("/api/status", response_model=StatusResponse)
 async def get_status():
     """
@@ -204,9 +1290,239 @@ async def get_status():
         api_key_configured=config.get_api_key_status(),
         allowed_file_types=list(config.ALLOWED_EXTENSIONS),
         max_file_size_mb=config.MAX_FILE_SIZE_MB,
-        upload_folder=config.UPLOAD_FOLDER
+        upload_folder=config.UPLOAD_FOLDER,
+        analyzer_pool=AnalyzerPoolStats(**analyzer_registry.get_stats()),
+        jobs=JobQueueStats(**job_workers.get_stats()),
+        extraction_cache=CacheStats(**extraction_cache.get_stats()) if config.EXTRACTION_CACHE_ENABLED else None,
+        model_calls=ModelCallStats(**model_calls.get_stats()),
+        stages={stage: StageTimingStats(**stats) for stage, stats in stage_metrics.get_stats().items()}
     )
 
+def collect_runtime_metrics() -> List[Tuple[str, str, str, float]]:
+    """Export analysis and model call state kept by the executor and call layer."""
+    calls = model_calls.get_stats()
+    return [
+        ("requests_in_flight", "gauge", "Analyses currently holding an analysis slot", analysis_executor.in_flight),
+        ("model_calls_in_flight", "gauge", "Model calls currently running", calls["in_flight"]),
+        ("model_calls_waiting", "gauge", "Model calls waiting for the rate or concurrency limit", calls["waiting"]),
+        ("model_concurrency_limit", "gauge", "Current adaptive limit on concurrent model calls",
+         calls["concurrency_limit"]),
+        ("model_calls_total", "counter", "Model calls started", calls["calls"]),
+        ("model_retries_total", "counter", "Model calls retried after a transient error", calls["retries"]),
+        ("model_rate_limited_total", "counter", "Model calls rejected with 429", calls["rate_limited"]),
+        ("model_calls_coalesced_total", "counter", "Model calls answered by an identical call in flight",
+         calls["coalesced"]),
+    ]
+
+
+def collect_store_metrics() -> List[Tuple[str, str, str, float]]:
+    """Export the analysis store's write queue and counters."""
+    stats = analysis_store.get_stats()
+    return [
+        ("store_pending", "gauge", "Analyses waiting to be written to the analysis store", stats["pending"]),
+        ("store_written_total", "counter", "Analyses written to the analysis store", stats["written"]),
+        ("store_dropped_total", "counter", "Analyses not stored because the write queue was full",
+         stats["dropped"]),
+        ("store_write_errors_total", "counter", "Analysis store batches that failed to write", stats["errors"]),
+    ]
+
+
+metrics_registry.add_collector(collect_runtime_metrics)
+metrics_registry.add_collector(collect_store_metrics)
+
+
+@router.get("/api/metrics")
+async def get_metrics():
+    """
+    Export counters, gauges and stage histograms in the Prometheus text format.
+
+    Values cover this server process only; job worker processes are not included.
+
+    Returns:
+        Response: Prometheus text exposition
+    """
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@router.get("/api/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None, include_in_schema=False)):
+    """
+    Download the collapsed stacks recorded for a profiled request.
+
+    Args:
+        profile_id: Request id from the X-Profile-Id response header
+        x_profile_token: Profiling token
+
+    Returns:
+        Response: One "frame;frame;frame count" line per sampled stack
+
+    Raises:
+        HTTPException: 404 if profiling is disabled, the token is wrong or there is no such profile
+    """
+    if not profiler.is_authorized(x_profile_token):
+        raise HTTPException(status_code=404, detail="Not Found")
+    content = await analysis_executor.run_io(profiler.load, profile_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return Response(content=content, media_type="text/plain; charset=utf-8")
+
+@router.get("/api/processes", response_model=ProcessPage)
+async def list_processes(function: Optional[str] = Query(None),
+                         priority: Optional[PriorityLevel] = Query(None),
+                         automation_potential: Optional[AutomationPotential] = Query(None),
+                         pain_level: Optional[PainLevel] = Query(None),
+                         analysis_id: Optional[str] = Query(None),
+                         cluster_id: Optional[int] = Query(None),
+                         since: Optional[float] = Query(None, description="Unix time; uploaded at or after"),
+                         until: Optional[float] = Query(None, description="Unix time; uploaded before"),
+                         limit: int = Query(50, ge=1, le=config.PROCESS_PAGE_MAX_SIZE),
+                         cursor: Optional[str] = Query(None)):
+    """
+    Page through the processes of stored analyses, newest first.
+
+    Pass the next_cursor of a page as cursor to get the following page; filters
+    must stay the same between pages. Analyses are written in the background, so
+    a new analysis can take up to STORE_FLUSH_INTERVAL_SECONDS to appear.
+
+    Args:
+        function: Only processes of this business function
+        priority: Only processes of this priority
+        automation_potential: Only processes with this automation potential
+        pain_level: Only processes with this pain level
+        analysis_id: Only processes of this analysis
+        cluster_id: Only processes of this process cluster
+        since: Only processes uploaded at or after this Unix time
+        until: Only processes uploaded before this Unix time
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Returns:
+        ProcessPage: Stored processes and the cursor of the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid, 404 if the store is disabled
+    """
+    if not config.STORE_ENABLED:
+        raise HTTPException(status_code=404, detail="Analysis store is disabled")
+    before = None
+    if cursor is not None:
+        if not cursor.isdigit():
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+        before = int(cursor)
+
+    filters = {
+        "function": function, "priority": priority, "automation_potential": automation_potential,
+        "pain_level": pain_level, "analysis_id": analysis_id, "cluster_id": cluster_id
+    }
+    items, next_cursor = await analysis_executor.run_io(
+        analysis_store.query_processes, filters, limit, before, since, until
+    )
+    next_cursor = str(next_cursor) if next_cursor is not None else None
+    return json_response(splice_json({"next_cursor": next_cursor}, "items", items))
+
+@router.get("/api/analyses/{analysis_id}", response_model=StoredAnalysis)
+async def get_stored_analysis(analysis_id: str):
+    """
+    Get a stored analysis by the analysis_id returned with it.
+
+    Args:
+        analysis_id: Id of the stored analysis
+
+    Returns:
+        StoredAnalysis: The analysis and the upload it came from
+
+    Raises:
+        HTTPException: 404 if the store is disabled or there is no such analysis
+    """
+    if not config.STORE_ENABLED:
+        raise HTTPException(status_code=404, detail="Analysis store is disabled")
+    content = await analysis_executor.run_io(analysis_store.get_analysis, analysis_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Analysis not found: {analysis_id}")
+    return json_response(content)
+
+def _require_clusters() -> None:
+    """Raise 404 unless stored processes are being clustered."""
+    if not (config.STORE_ENABLED and config.DEDUP_ENABLED):
+        raise HTTPException(status_code=404, detail="Process clustering is disabled")
+
+@router.get("/api/clusters", response_model=ClusterPage)
+async def list_clusters(function: Optional[str] = Query(None),
+                        min_size: int = Query(1, ge=1),
+                        limit: int = Query(50, ge=1, le=config.PROCESS_PAGE_MAX_SIZE),
+                        cursor: Optional[str] = Query(None)):
+    """
+    Page through clusters of recurring processes, largest first.
+
+    Each cluster groups the stored processes judged to be the same process across
+    analyses and carries its canonical (first) process. List a cluster's processes
+    with GET /api/processes?cluster_id=...
+
+    Args:
+        function: Only clusters of this business function
+        min_size: Only clusters with at least this many processes (2 lists only recurring ones)
+        limit: Page size
+        cursor: next_cursor of the previous page
+
+    Returns:
+        ClusterPage: Clusters and the cursor of the next page
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid, 404 if clustering is disabled
+    """
+    _require_clusters()
+    before = None
+    if cursor is not None:
+        size, _, cluster_id = cursor.partition(".")
+        if not (size.isdigit() and cluster_id.isdigit()):
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+        before = (int(size), int(cluster_id))
+
+    items, next_cursor = await analysis_executor.run_io(
+        analysis_store.list_clusters, limit, function, min_size, before
+    )
+    next_cursor = f"{next_cursor[0]}.{next_cursor[1]}" if next_cursor is not None else None
+    return json_response(splice_json({"next_cursor": next_cursor}, "items", items))
+
+@router.get("/api/clusters/{cluster_id}", response_model=ProcessCluster)
+async def get_cluster(cluster_id: int):
+    """
+    Get a process cluster.
+
+    Args:
+        cluster_id: Id of the cluster
+
+    Returns:
+        ProcessCluster: The cluster and its canonical process
+
+    Raises:
+        HTTPException: 404 if clustering is disabled or there is no such cluster
+    """
+    _require_clusters()
+    content = await analysis_executor.run_io(analysis_store.get_cluster, cluster_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Cluster not found: {cluster_id}")
+    return json_response(content)
+
+@router.post("/api/clusters/match", response_model=List[ProcessClusterMatch])
+async def match_clusters(analysis: AnalysisResult):
+    """
+    Link each process of an analysis to the existing cluster of the same process.
+
+    The analysis is not stored. Only processes sharing an LSH band with the
+    candidate are compared, so matching does not slow down as the store grows.
+
+    Args:
+        analysis: Analysis result, e.g. from /api/analyze
+
+    Returns:
+        List[ProcessClusterMatch]: Per process, the matching cluster (or null)
+
+    Raises:
+        HTTPException: 404 if clustering is disabled
+    """
+    _require_clusters()
+    return json_response(await analysis_executor.run_io(analysis_store.match_processes, analysis))
+
 @router.get("/", response_model=RootResponse)
 async def root():
     """
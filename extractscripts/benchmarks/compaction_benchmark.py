@@ -0,0 +1,100 @@
+"""
+Transcript Compaction Benchmark.
+Measures the token reduction and the cost of the compaction pipeline on sample
+transcripts in each upload format. With --live, also times the full Gemini
+analysis of the raw and the compacted transcript to measure end-to-end latency.
+Exits non-zero if compaction changes a plain notes document, which has no
+transcript noise to remove.
+
+Usage (from the extractscripts directory):
+    python benchmarks/compaction_benchmark.py [--utterances 400] [--live]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.transcripts import NOTES_DOCUMENTS, TRANSCRIPTS  # noqa: E402
+from compaction import STAGES, compact_text  # noqa: E402
+from config import config  # noqa: E402
+
+
+def time_live_analysis(text: str) -> float:
+    """Run one full Gemini analysis and return its wall time in seconds."""
+    from business_analyzer import BusinessProcessAnalyzer
+
+    analyzer = BusinessProcessAnalyzer(config.GEMINI_API_KEY, config.GEMINI_MODEL)
+    started = time.perf_counter()
+    result = analyzer.analyze_text(text)
+    elapsed = time.perf_counter() - started
+    if not result.get("success"):
+        raise RuntimeError(result.get("error", "analysis failed"))
+    return elapsed
+
+
+def check_notes_unchanged(stages) -> int:
+    """Compact the notes documents and report any that changed; returns the number changed."""
+    changed = 0
+    for name, text in NOTES_DOCUMENTS.items():
+        compacted, _ = compact_text(text, stages)
+        if compacted != text:
+            changed += 1
+            print(f"Compaction changed the notes document {name!r}:")
+            print(f"  before: {text!r}")
+            print(f"  after:  {compacted!r}")
+    return changed
+
+
+def main() -> int:
+    """Run the benchmark and print one row per transcript format."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--utterances", type=int, default=400, help="utterances per sample transcript")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="timed compaction runs per sample (best is kept)")
+    arg_parser.add_argument("--stages", default=",".join(config.COMPACTION_STAGES),
+                            help=f"comma-separated stages to run (available: {', '.join(STAGES)})")
+    arg_parser.add_argument("--live", action="store_true",
+                            help="also time full Gemini analyses of raw and compacted text (needs GEMINI_API_KEY)")
+    args = arg_parser.parse_args()
+
+    stages = [name.strip() for name in args.stages.split(",") if name.strip()]
+    if args.live and not config.GEMINI_API_KEY:
+        print("--live needs GEMINI_API_KEY")
+        return 2
+
+    header = f"{'format':>8}  {'tokens':>8}  {'compact':>8}  {'saved':>6}  {'time':>8}  {'MB/s':>6}"
+    if args.live:
+        header += f"  {'raw e2e':>8}  {'cmp e2e':>8}"
+    print(header)
+
+    total_before = total_after = 0
+    for name, generate in TRANSCRIPTS.items():
+        text = generate(args.utterances)
+        best = float("inf")
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            compacted, stats = compact_text(text, stages)
+            best = min(best, time.perf_counter() - started)
+
+        total_before += stats["tokens_before"]
+        total_after += stats["tokens_after"]
+        saved = 1 - stats["tokens_after"] / max(1, stats["tokens_before"])
+        row = (f"{name:>8}  {stats['tokens_before']:>8}  {stats['tokens_after']:>8}  {saved:>6.1%}  "
+               f"{best * 1000:>6.1f}ms  {len(text) / best / 1e6:>6.1f}")
+        if args.live:
+            row += f"  {time_live_analysis(text):>7.1f}s  {time_live_analysis(compacted):>7.1f}s"
+        print(row)
+
+    print(f"\nTotal: {total_before} -> {total_after} estimated tokens "
+          f"({1 - total_after / max(1, total_before):.1%} saved)")
+
+    if check_notes_unchanged(stages):
+        return 1
+    print(f"{len(NOTES_DOCUMENTS)} notes documents unchanged by compaction")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
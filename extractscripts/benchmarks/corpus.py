@@ -0,0 +1,149 @@
+"""
+Benchmark Corpus Generator.
+Builds synthetic model responses, well-formed and pathological, for parser benchmarks.
+Every generator is deterministic and takes a size parameter so parse time can be
+measured against input size.
+"""
+
+import random
+from typing import Callable, Dict
+
+FUNCTIONS = ["Development", "QA", "Operations", "Management", "Finance", "Sales"]
+LEVELS = ["High", "Medium", "Low"]
+TYPES = ["Core", "Support", "Management"]
+ACTORS = ["Product Manager", "Developer", "QA Engineer", "Team Lead", "Finance Analyst"]
+ACTIONS = ["reviews the backlog", "writes the release notes", "approves the invoice",
+           "runs the regression suite", "updates the tracking sheet"]
+
+
+def process_block(number: int, rng: random.Random, steps: int = 4) -> str:
+    """Render one well-formed PROCESS #N block in the format the prompt asks for."""
+    lines = [
+        "====================",
+        f"PROCESS #{number}: Process {number}",
+        "====================",
+        "",
+        f"Name: Process {number} {rng.choice(ACTIONS)}",
+        f"Function: {rng.choice(FUNCTIONS)}",
+        f"Type: {rng.choice(TYPES)}",
+        f"Priority: {rng.choice(LEVELS)}",
+        f"Automation Potential: {rng.choice(LEVELS)}",
+        f"Pain Level: {rng.choice(LEVELS)}",
+        "",
+        "AS-IS WORKFLOW MAPPING:",
+    ]
+    for step in range(1, steps + 1):
+        lines += [
+            f"Step {step}: {rng.choice(ACTORS)} does {rng.choice(ACTIONS)}",
+            f"Duration: {rng.randint(1, 8)} hours",
+            "Tools/Systems: Jira, Slack",
+            "Dependencies: Previous step",
+            "Bottlenecks: Manual hand-off",
+            "",
+        ]
+    lines += [
+        "STAKEHOLDERS:",
+        "Primary Process Owner: Team Lead",
+        f"Internal Stakeholders: {', '.join(rng.sample(ACTORS, 3))}",
+        "External Stakeholders: Clients",
+        "",
+        "PAIN POINTS:",
+        f"Explicit Issues: Issue {number} slows delivery",
+        "Implied Issues: Unclear ownership",
+        f"Manual Effort: Manual tracking for process {number}",
+        "Impact: Delayed releases",
+        "",
+        "TRANSFORMATION OPPORTUNITIES:",
+        f"AI Opportunities: Summarize process {number} automatically",
+        "Automation Opportunities: Auto-assign tickets",
+        "Digital Transformation: Shared dashboard",
+        "Quick Wins: Template for hand-offs",
+        "",
+        "====================",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def many_processes(size: int) -> str:
+    """A well-formed response with `size` process blocks."""
+    rng = random.Random(size)
+    return "Here is the analysis:\n\n" + "".join(process_block(n, rng) for n in range(1, size + 1))
+
+
+def single_line(size: int) -> str:
+    """A well-formed response of `size` processes collapsed onto one line."""
+    return many_processes(size).replace("\n", " ")
+
+
+def repeated_labels(size: int) -> str:
+    """One section of `size` repeated labels with no newline to end their values."""
+    labels = ["Name: ", "Internal Stakeholders: ", "Process Owner: ", "Function: ", "Step 1: "]
+    return "====================\nPROCESS #1: Repeated\n" + "".join(
+        labels[i % len(labels)] + "value " for i in range(size)
+    )
+
+
+def long_step_line(size: int) -> str:
+    """A workflow step whose first line has `size` words and never says "does"."""
+    return (
+        "====================\nPROCESS #1: Long step\n====================\n\n"
+        "AS-IS WORKFLOW MAPPING:\nStep 1: " + "word " * size + "\nSTAKEHOLDERS:\n"
+    )
+
+
+def step_headers(size: int) -> str:
+    """A workflow region of `size` empty steps and near-miss "Step N" headers on one line."""
+    return (
+        "====================\nPROCESS #1: Step headers\n====================\n\n"
+        "AS-IS WORKFLOW MAPPING:\n" + "Step 1: Step 2 Step: " * size + "\n" + "Step 3:\n" * size + "STAKEHOLDERS:\n"
+    )
+
+
+def whitespace_runs(size: int) -> str:
+    """Labels followed by long whitespace runs and an unterminated value."""
+    return (
+        "====================\nPROCESS #1: Whitespace\n"
+        "Name:" + " " * size + "\n" * size + "x" * size
+    )
+
+
+def truncated(size: int) -> str:
+    """A response of `size` processes cut off in the middle of the last block."""
+    text = many_processes(size)
+    return text[:len(text) - len(text) // (2 * size)]
+
+
+def duplicated_sections(size: int) -> str:
+    """Processes whose headings and sections are repeated several times each."""
+    rng = random.Random(size)
+    blocks = []
+    for number in range(1, size + 1):
+        block = process_block(number, rng)
+        body = block.split("AS-IS WORKFLOW MAPPING:", 1)[1]
+        blocks.append(block + ("PAIN POINTS:\nAS-IS WORKFLOW MAPPING:" + body) * 3)
+    return "".join(blocks)
+
+
+# Corpus families and the size parameter used for the smallest input of each
+CORPUS: Dict[str, Callable[[int], str]] = {
+    "many_processes": many_processes,
+    "single_line": single_line,
+    "repeated_labels": repeated_labels,
+    "long_step_line": long_step_line,
+    "step_headers": step_headers,
+    "whitespace_runs": whitespace_runs,
+    "truncated": truncated,
+    "duplicated_sections": duplicated_sections,
+}
+
+BASE_SIZES: Dict[str, int] = {
+    "many_processes": 125,
+    "single_line": 125,
+    "repeated_labels": 5000,
+    "long_step_line": 20000,
+    "step_headers": 5000,
+    "whitespace_runs": 20000,
+    "truncated": 125,
+    "duplicated_sections": 40,
+}
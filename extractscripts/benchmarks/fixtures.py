@@ -0,0 +1,131 @@
+"""
+Upload Fixture Generator.
+Builds deterministic TXT, PDF and DOCX meeting transcripts at a requested size
+without any third-party writer, so the load test can upload realistic documents
+of each supported type.
+"""
+
+import io
+import zipfile
+from typing import Callable, Dict, List
+from xml.sax.saxutils import escape
+
+from benchmarks.transcripts import plain
+
+# Named fixture sizes, in transcript utterances (about 90 characters each)
+SIZES: Dict[str, int] = {
+    "small": 50,
+    "medium": 500,
+    "large": 3000,
+}
+
+LINES_PER_PDF_PAGE = 40
+
+
+def transcript_lines(utterances: int) -> List[str]:
+    """The lines of a plain speaker-labelled transcript."""
+    return plain(utterances).splitlines()
+
+
+def make_txt(utterances: int) -> bytes:
+    """A UTF-8 text transcript."""
+    return "\n".join(transcript_lines(utterances)).encode("utf-8") + b"\n"
+
+
+def _pdf_string(text: str) -> bytes:
+    """Escape text for a PDF literal string; non-Latin-1 characters are replaced."""
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return escaped.encode("latin-1", errors="replace")
+
+
+def make_pdf(utterances: int) -> bytes:
+    """A PDF with the transcript laid out LINES_PER_PDF_PAGE lines per page in Helvetica."""
+    lines = transcript_lines(utterances)
+    pages = [lines[start:start + LINES_PER_PDF_PAGE] for start in range(0, len(lines), LINES_PER_PDF_PAGE)] or [[]]
+
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(b"")  # Filled in once the page objects exist
+    kids = []
+    for page_lines in pages:
+        content = b"BT /F1 9 Tf 40 800 Td 11 TL " + b" ".join(
+            b"(" + _pdf_string(line) + b") '" for line in page_lines
+        ) + b" ET"
+        stream = add(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font, stream)
+        ))
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), len(kids)
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def make_docx(utterances: int) -> bytes:
+    """A DOCX with one paragraph per transcript line and an action-item table at the end."""
+    body = [
+        f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+        for line in transcript_lines(utterances)
+    ]
+    rows = [("Owner", "Action"), ("Alice", "Automate the invoice export"), ("Bob", "Set up approval reminders")]
+    body.append("<w:tbl>" + "".join(
+        "<w:tr>" + "".join(f"<w:tc><w:p><w:r><w:t>{escape(cell)}</w:t></w:r></w:p></w:tc>" for cell in row) + "</w:tr>"
+        for row in rows
+    ) + "</w:tbl>")
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        f'<w:document xmlns:w="{WORD_NAMESPACE}"><w:body>{"".join(body)}</w:body></w:document>'
+    )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+# Fixture builders by file extension, sized in utterances
+FIXTURES: Dict[str, Callable[[int], bytes]] = {
+    "txt": make_txt,
+    "pdf": make_pdf,
+    "docx": make_docx,
+}
@@ -0,0 +1,316 @@
+"""
+End-to-end Load Test.
+Starts the analysis server with the mock LLM backend, sends concurrent multipart
+uploads of generated TXT, PDF and DOCX transcripts at several sizes, and reports
+throughput, p50/p95/p99 latency, peak RSS of the server and its workers, and how
+request time splits across extraction, the model call, parsing and serialization.
+Stage times are summed over the chunks of long documents, which run in parallel,
+so they can exceed the request latency. Results are saved as JSON; pass --baseline
+to flag regressions against an earlier run.
+
+Usage (from the extractscripts directory):
+    python benchmarks/load_test.py [--requests 40] [--concurrency 8] [--types txt,pdf,docx]
+        [--sizes small,medium,large] [--endpoint analyze|stream] [--mock-latency-ms 500]
+        [--output FILE] [--baseline FILE] [--tolerance 0.2]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import FIXTURES, SIZES  # noqa: E402
+from benchmarks.reporting import (  # noqa: E402
+    compare_results, report_regressions, save_results, summarize_latencies
+)
+
+SERVER_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = {"analyze": "/api/analyze", "stream": "/api/analyze/stream"}
+CONTENT_TYPES = {
+    "txt": "text/plain",
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def encode_multipart(filename: str, data: bytes, content_type: str) -> Tuple[bytes, str]:
+    """Build a multipart/form-data body holding one `file` field."""
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode("utf-8")
+    return head + data + f"\r\n--{boundary}--\r\n".encode("utf-8"), f"multipart/form-data; boundary={boundary}"
+
+
+def post_upload(host: str, port: int, path: str, body: bytes, content_type: str,
+                timeout: float) -> Tuple[int, float, Optional[float]]:
+    """
+    Send one upload and read the whole response.
+
+    Returns:
+        Tuple[int, float, Optional[float]]: Status, seconds to the complete response and,
+            for event streams, seconds to the first "process" event
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    started = time.perf_counter()
+    first_event = None
+    try:
+        connection.request("POST", path, body=body, headers={"Content-Type": content_type})
+        response = connection.getresponse()
+        if response.getheader("Content-Type", "").startswith("text/event-stream"):
+            for line in response:
+                if first_event is None and line.startswith(b"event: process"):
+                    first_event = time.perf_counter() - started
+        else:
+            response.read()
+        return response.status, time.perf_counter() - started, first_event
+    finally:
+        connection.close()
+
+
+def get_json(host: str, port: int, path: str) -> Dict[str, Any]:
+    """GET a JSON endpoint."""
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    try:
+        connection.request("GET", path)
+        return json.loads(connection.getresponse().read())
+    finally:
+        connection.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _process_tree(pid: int) -> List[int]:
+    """The pid and all its descendants, read from /proc."""
+    pids = [pid]
+    for current in pids:
+        try:
+            with open(f"/proc/{current}/task/{current}/children", "r") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+class RssSampler:
+    """Samples the combined RSS of a process tree in the background and keeps the peak."""
+
+    def __init__(self, pid: int, interval: float = 0.05):
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, sum(_rss_bytes(pid) for pid in _process_tree(self.pid)))
+
+    def start(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def reset(self) -> None:
+        self.peak = 0
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def start_server(port: int, args: argparse.Namespace, data_folder: str) -> subprocess.Popen:
+    """
+    Start uvicorn serving analysis_server:app with the mock backend and wait until it answers.
+
+    The server keeps its spool files, caches and queue in data_folder and does not store
+    analyses, so mock results never reach the real caches, analysis store or process clusters.
+    """
+    env = dict(os.environ)
+    env.update({
+        "UPLOAD_FOLDER": data_folder,
+        "STORE_ENABLED": "false",
+        "DEDUP_ENABLED": "false",
+        "LLM_BACKEND": "mock",
+        "MOCK_LATENCY_MEAN_MS": str(args.mock_latency_ms),
+        "MOCK_LATENCY_STDDEV_MS": str(args.mock_latency_ms / 3),
+        "MOCK_RESPONSE_CHARS": str(args.mock_response_chars),
+        "MODEL_RATE_LIMIT_PER_MINUTE": "0",
+        "JOB_WORKERS": "0",
+    })
+    if not args.with_caches:
+        # Every upload repeats one of a few fixtures; measure the full pipeline each time
+        env.update({
+            "RESULT_CACHE_ENABLED": "false",
+            "EXTRACTION_CACHE_ENABLED": "false",
+            "MODEL_COALESCING_ENABLED": "false",
+        })
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "analysis_server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=SERVER_DIRECTORY, env=env
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("Server exited during startup")
+        try:
+            get_json("127.0.0.1", port, "/api/status")
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start within 60 seconds")
+
+
+def stage_totals(host: str, port: int) -> Dict[str, float]:
+    """Seconds spent per pipeline stage so far, from /api/status."""
+    stages = get_json(host, port, "/api/status").get("stages") or {}
+    return {stage: stats["total_seconds"] for stage, stats in stages.items()}
+
+
+def run_scenario(host: str, port: int, path: str, extension: str, size: str,
+                 args: argparse.Namespace, sampler: Optional[RssSampler]) -> Dict[str, Any]:
+    """Upload one fixture `args.requests` times at the configured concurrency."""
+    data = FIXTURES[extension](SIZES[size])
+    body, content_type = encode_multipart(f"meeting-{size}.{extension}", data, CONTENT_TYPES[extension])
+
+    before = stage_totals(host, port)
+    if sampler is not None:
+        sampler.reset()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        outcomes = list(pool.map(
+            lambda _: post_upload(host, port, path, body, content_type, args.timeout),
+            range(args.requests)
+        ))
+    elapsed = time.perf_counter() - started
+    after = stage_totals(host, port)
+
+    succeeded = [outcome for outcome in outcomes if outcome[0] == 200]
+    row: Dict[str, Any] = {
+        "name": f"{extension}-{size}",
+        "file_bytes": len(data),
+        "requests": len(outcomes),
+        "errors": len(outcomes) - len(succeeded),
+        "throughput_rps": round(len(succeeded) / elapsed, 2),
+    }
+    row.update(summarize_latencies([outcome[1] for outcome in succeeded]))
+    first_events = [outcome[2] for outcome in succeeded if outcome[2] is not None]
+    if first_events:
+        row["first_process_p50_ms"] = summarize_latencies(first_events)["p50_ms"]
+    row["stage_ms"] = {
+        stage: round((after.get(stage, 0.0) - before.get(stage, 0.0)) / max(1, len(outcomes)) * 1000, 2)
+        for stage in after
+    }
+    if sampler is not None:
+        row["peak_rss_mb"] = round(sampler.peak / 1e6, 1)
+    return row
+
+
+def print_row(row: Dict[str, Any]) -> None:
+    stages = "  ".join(f"{stage[:5]} {ms:>7.1f}" for stage, ms in row["stage_ms"].items())
+    rss = f"{row['peak_rss_mb']:>7.1f}" if "peak_rss_mb" in row else f"{'-':>7}"
+    print(f"{row['name']:>12}  {row['requests'] - row['errors']:>4}/{row['requests']:<4}  "
+          f"{row['throughput_rps']:>7.2f}  {row['p50_ms']:>8.1f}  {row['p95_ms']:>8.1f}  {row['p99_ms']:>8.1f}  "
+          f"{rss}  {stages}")
+
+
+def main() -> int:
+    """Run every scenario, print a table and save the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--requests", type=int, default=40, help="uploads per scenario")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="uploads in flight at once")
+    arg_parser.add_argument("--types", default="txt,pdf,docx", help="comma-separated file types")
+    arg_parser.add_argument("--sizes", default=",".join(SIZES), help=f"comma-separated sizes ({', '.join(SIZES)})")
+    arg_parser.add_argument("--endpoint", choices=ENDPOINTS, default="analyze")
+    arg_parser.add_argument("--mock-latency-ms", type=float, default=500, help="mean mock model latency")
+    arg_parser.add_argument("--mock-response-chars", type=int, default=6000, help="mock model response size")
+    arg_parser.add_argument("--with-caches", action="store_true",
+                            help="keep the result/extraction caches and call coalescing enabled")
+    arg_parser.add_argument("--url", help="load an already running server (host:port) instead of starting one")
+    arg_parser.add_argument("--timeout", type=float, default=120, help="per-request timeout in seconds")
+    arg_parser.add_argument("--output", help="result file (default: temp/benchmarks/load_test-<time>.json)")
+    arg_parser.add_argument("--baseline", help="earlier result file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = arg_parser.parse_args()
+
+    types = [name.strip() for name in args.types.split(",") if name.strip()]
+    sizes = [name.strip() for name in args.sizes.split(",") if name.strip()]
+    unknown = [name for name in types if name not in FIXTURES] + [name for name in sizes if name not in SIZES]
+    if unknown:
+        print(f"Unknown file types or sizes: {', '.join(unknown)}")
+        return 2
+
+    server = sampler = data_folder = None
+    if args.url:
+        host, _, port_text = args.url.rpartition(":")
+        port = int(port_text)
+    else:
+        host, port = "127.0.0.1", _free_port()
+        data_folder = tempfile.mkdtemp(prefix="load-test-")
+        server = start_server(port, args, data_folder)
+        sampler = RssSampler(server.pid).start()
+
+    path = ENDPOINTS[args.endpoint]
+    rows = []
+    try:
+        # Warm up pools and lazily built clients outside the measurements
+        body, content_type = encode_multipart("warmup.txt", FIXTURES["txt"](SIZES["small"]), CONTENT_TYPES["txt"])
+        post_upload(host, port, path, body, content_type, args.timeout)
+
+        print(f"{'scenario':>12}  {'ok':>9}  {'req/s':>7}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  "
+              f"{'RSS MB':>7}  stage ms per request")
+        for extension in types:
+            for size in sizes:
+                row = run_scenario(host, port, path, extension, size, args, sampler)
+                print_row(row)
+                rows.append(row)
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if data_folder is not None:
+            shutil.rmtree(data_folder, ignore_errors=True)
+
+    settings = {key: value for key, value in vars(args).items() if key not in ("output", "baseline")}
+    output = save_results("load_test", settings, rows, args.output)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        return report_regressions(compare_results(args.baseline, rows, args.tolerance), args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Extraction and Parsing Micro-benchmarks.
+Times extract_text_from_bytes on generated TXT, PDF and DOCX fixtures and
+BusinessAnalysisParser.parse_analysis on mock model responses of increasing size,
+in-process and without a server. Results are saved as JSON; pass --baseline to
+flag regressions against an earlier run.
+
+Usage (from the extractscripts directory):
+    python benchmarks/micro_benchmark.py [--repeats 5] [--output FILE] [--baseline FILE] [--tolerance 0.2]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import FIXTURES, SIZES  # noqa: E402
+from benchmarks.reporting import compare_results, report_regressions, save_results  # noqa: E402
+from business_analyzer import extract_text_from_bytes  # noqa: E402
+from json_parser import JsonAnalysisParser  # noqa: E402
+from llm_backends import MockBackend  # noqa: E402
+from parser import BusinessAnalysisParser  # noqa: E402
+
+# Mock model responses to parse: name -> (process count, approximate characters)
+RESPONSES = {
+    "3x6k": ("3", 6000),
+    "8x40k": ("8", 40000),
+    "20x200k": ("20", 200000),
+}
+
+
+def best_time(function: Callable[[], Any], repeats: int) -> float:
+    """Return the best of several wall times in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def make_row(name: str, size: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "bytes": size,
+        "best_ms": round(seconds * 1000, 3),
+        "mb_per_s": round(size / seconds / 1e6, 2) if seconds else 0.0,
+    }
+
+
+def benchmark_extraction(repeats: int) -> List[Dict[str, Any]]:
+    """Time text extraction of every fixture type and size."""
+    rows = []
+    for extension, make in FIXTURES.items():
+        for size_name, utterances in SIZES.items():
+            data = make(utterances)
+            filename = f"meeting.{extension}"
+            seconds = best_time(lambda: extract_text_from_bytes(data, filename), repeats)
+            rows.append(make_row(f"extract-{extension}-{size_name}", len(data), seconds))
+    return rows
+
+
+def benchmark_parsing(repeats: int) -> List[Dict[str, Any]]:
+    """Time the text parser, and the JSON parser for comparison, on mock responses."""
+    rows = []
+    for name, (process_count, chars) in RESPONSES.items():
+        backend = MockBackend("benchmark", process_count=process_count, response_chars=chars, latency_mean_ms=0)
+        text = backend.build_response(name)
+        document = backend.build_response(name, {"response_mime_type": "application/json"})
+        parser = BusinessAnalysisParser()
+        json_parser = JsonAnalysisParser(parser)
+        rows.append(make_row(f"parse-text-{name}", len(text), best_time(lambda: parser.parse_analysis(text), repeats)))
+        rows.append(make_row(f"parse-json-{name}", len(document),
+                             best_time(lambda: json_parser.parse_analysis(document), repeats)))
+    return rows
+
+
+def main() -> int:
+    """Run the micro-benchmarks, print a table and save the results."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeats", type=int, default=5, help="timed runs per case (best is kept)")
+    arg_parser.add_argument("--output", help="result file (default: temp/benchmarks/micro-<time>.json)")
+    arg_parser.add_argument("--baseline", help="earlier result file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = arg_parser.parse_args()
+
+    rows = benchmark_extraction(args.repeats) + benchmark_parsing(args.repeats)
+    print(f"{'case':>24}  {'bytes':>9}  {'best ms':>9}  {'MB/s':>7}")
+    for row in rows:
+        print(f"{row['name']:>24}  {row['bytes']:>9}  {row['best_ms']:>9.2f}  {row['mb_per_s']:>7.2f}")
+
+    output = save_results("micro", {"repeats": args.repeats}, rows, args.output)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        return report_regressions(compare_results(args.baseline, rows, args.tolerance), args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Parser Linearity Benchmark.
+Times both parser engines on the pathological corpus at doubling input sizes and
+fails if parse time per character grows faster than the allowed factor, i.e. if a
+parser is no longer linear in the size of the model response.
+
+Usage (from the extractscripts directory):
+    python benchmarks/parser_benchmark.py [--steps 4] [--max-growth 3.0] [--family NAME]
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import BASE_SIZES, CORPUS  # noqa: E402
+from parser import BusinessAnalysisParser  # noqa: E402
+from incremental_parser import IncrementalAnalysisParser  # noqa: E402
+
+ENGINES = {
+    "regex": BusinessAnalysisParser,
+    "incremental": IncrementalAnalysisParser,
+}
+
+
+def time_parse(engine: BusinessAnalysisParser, text: str, repeats: int) -> float:
+    """Return the best of several parse times in seconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        engine.parse_analysis(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_family(family: str, steps: int, repeats: int) -> List[Dict[str, float]]:
+    """Time every engine on one corpus family at `steps` doubling sizes."""
+    rows = []
+    for step in range(steps):
+        text = CORPUS[family](BASE_SIZES[family] * 2 ** step)
+        row = {"chars": len(text)}
+        for name, engine_class in ENGINES.items():
+            row[name] = time_parse(engine_class(), text, repeats)
+        rows.append(row)
+    return rows
+
+
+def main() -> int:
+    """Run the benchmark and return a non-zero exit code if any parser grows superlinearly."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--steps", type=int, default=4, help="number of doubling sizes per family")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="timed runs per size (best is kept)")
+    arg_parser.add_argument("--max-growth", type=float, default=3.0,
+                            help="allowed growth of time per character from the smallest to the largest size")
+    arg_parser.add_argument("--family", choices=sorted(CORPUS), action="append",
+                            help="corpus family to run (repeatable, default: all)")
+    args = arg_parser.parse_args()
+
+    # Parse failures are reported by the parser itself; keep the table readable
+    devnull = open(os.devnull, "w")
+    failures = []
+
+    for family in args.family or list(CORPUS):
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            rows = run_family(family, args.steps, args.repeats)
+        finally:
+            sys.stdout = stdout
+
+        print(f"\n{family}")
+        print(f"  {'chars':>10}  " + "  ".join(f"{name:>12}" for name in ENGINES))
+        for row in rows:
+            print(f"  {int(row['chars']):>10}  " + "  ".join(f"{row[name] * 1000:>10.1f}ms" for name in ENGINES))
+
+        for name in ENGINES:
+            first, last = rows[0], rows[-1]
+            # Small inputs are dominated by fixed costs; floor them at 1ms
+            growth = (max(last[name], 1e-3) / last["chars"]) / (max(first[name], 1e-3) / first["chars"])
+            status = "ok" if growth <= args.max_growth else "SUPERLINEAR"
+            print(f"  {name}: time/char grew {growth:.2f}x over {last['chars'] / first['chars']:.0f}x input ({status})")
+            if growth > args.max_growth:
+                failures.append(f"{family}/{name}")
+
+    devnull.close()
+    if failures:
+        print(f"\nSuperlinear parse time: {', '.join(failures)}")
+        return 1
+    print("\nAll parsers scale linearly")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
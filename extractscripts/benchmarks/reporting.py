@@ -0,0 +1,149 @@
+"""
+Benchmark Result Reporting.
+Latency percentiles, JSON result files and comparison against a baseline run, so
+benchmark runs can be kept and regressions flagged.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+# Default location of result files; temp/ is not committed
+RESULTS_FOLDER = os.path.join("temp", "benchmarks")
+
+# Metrics compared against a baseline, by which direction is better
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "mean_ms", "best_ms", "peak_rss_mb")
+HIGHER_IS_BETTER = ("throughput_rps", "mb_per_s")
+
+# Timings this small are dominated by noise: such scenarios, and smaller absolute
+# changes of millisecond metrics, are never reported as regressions
+NOISE_FLOOR_MS = 1.0
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Return the pct-th percentile of values, interpolating between closest ranks.
+
+    Args:
+        values: Observations, in any order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, or 0.0 if there are no values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize_latencies(seconds: Sequence[float]) -> Dict[str, float]:
+    """Summarize latencies in seconds as p50/p95/p99/mean/max milliseconds."""
+    if not seconds:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "mean_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": round(percentile(seconds, 50) * 1000, 2),
+        "p95_ms": round(percentile(seconds, 95) * 1000, 2),
+        "p99_ms": round(percentile(seconds, 99) * 1000, 2),
+        "mean_ms": round(sum(seconds) / len(seconds) * 1000, 2),
+        "max_ms": round(max(seconds) * 1000, 2),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and revision a benchmark ran on."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        revision = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "revision": revision,
+    }
+
+
+def save_results(benchmark: str, settings: Dict[str, Any], rows: List[Dict[str, Any]],
+                 output: Optional[str] = None) -> str:
+    """
+    Write a benchmark run to a JSON file.
+
+    Args:
+        benchmark: Benchmark name, e.g. "load_test"
+        settings: Options the run used
+        rows: One result per scenario, each with a unique "name"
+        output: File to write (defaults to temp/benchmarks/<benchmark>-<timestamp>.json)
+
+    Returns:
+        str: Path of the written file
+    """
+    if output is None:
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        output = os.path.join(RESULTS_FOLDER, f"{benchmark}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    elif os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "benchmark": benchmark,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "environment": environment(),
+            "settings": settings,
+            "results": rows,
+        }, f, indent=2)
+    return output
+
+
+def compare_results(baseline_path: str, rows: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """
+    Compare a run against a saved baseline run.
+
+    Scenarios are matched by name; scenarios or metrics missing from either run,
+    and scenarios faster than NOISE_FLOOR_MS, are skipped.
+
+    Args:
+        baseline_path: Result file written by save_results
+        rows: Results of the current run
+        tolerance: Allowed relative slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One description per regressed metric
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {row["name"]: row for row in json.load(f)["results"]}
+
+    regressions = []
+    for row in rows:
+        before = baseline.get(row["name"])
+        if before is None or before.get("best_ms", before.get("p50_ms", NOISE_FLOOR_MS)) < NOISE_FLOOR_MS:
+            continue
+        for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+            old, new = before.get(metric), row.get(metric)
+            if not old or new is None:
+                continue
+            if metric.endswith("_ms") and abs(new - old) < NOISE_FLOOR_MS:
+                continue
+            change = (new - old) / old
+            worse = change > tolerance if metric in LOWER_IS_BETTER else -change > tolerance
+            if worse:
+                regressions.append(f"{row['name']}: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+def report_regressions(regressions: List[str], baseline_path: str) -> int:
+    """Print the comparison with a baseline and return the process exit code."""
+    if regressions:
+        print(f"\nRegressions against {baseline_path}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against {baseline_path}")
+    return 0
@@ -0,0 +1,199 @@
+"""
+Cold Start Benchmark.
+Measures what a fresh server process pays before it can answer: the time to import
+analysis_server, the time from launching uvicorn to the first /api/status response,
+and the first TXT analysis with the mock LLM backend. It also checks that modules
+meant to load on first use (the Gemini SDK, PyPDF2, the extractors) are not
+imported at startup. Exits non-zero when a median exceeds its budget, so CI can
+fail the build on cold start regressions.
+
+Usage (from the extractscripts directory):
+    python benchmarks/startup_benchmark.py [--repeats 5] [--max-import-ms 1000]
+        [--max-first-response-ms 3000] [--output FILE] [--baseline FILE] [--tolerance 0.2]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.load_test import encode_multipart  # noqa: E402
+from benchmarks.reporting import (  # noqa: E402
+    compare_results, report_regressions, save_results, summarize_latencies
+)
+
+SERVER_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported on first use
+LAZY_MODULES = ("google.generativeai", "PyPDF2", "pdf_extractor", "docx_extractor", "dotenv")
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import analysis_server
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def server_environment(data_folder: str) -> Dict[str, str]:
+    """Environment of a server process: mock backend, no job workers, no caches, no analysis store."""
+    env = dict(os.environ)
+    env.update({
+        "UPLOAD_FOLDER": data_folder,
+        "STORE_ENABLED": "false",
+        "DEDUP_ENABLED": "false",
+        "LLM_BACKEND": "mock",
+        "MOCK_LATENCY_MEAN_MS": "0",
+        "JOB_WORKERS": "0",
+        "RESULT_CACHE_ENABLED": "false",
+        "EXTRACTION_CACHE_ENABLED": "false",
+        "PRELOAD_ON_STARTUP": "false",
+    })
+    return env
+
+
+def measure_import() -> Tuple[float, List[str]]:
+    """Import analysis_server in a fresh interpreter; returns seconds and lazy modules it loaded."""
+    with tempfile.TemporaryDirectory(prefix="startup-benchmark-") as data_folder:
+        completed = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT], cwd=SERVER_DIRECTORY, env=server_environment(data_folder),
+            capture_output=True, text=True, check=True
+        )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result["seconds"], result["loaded"]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(port: int, method: str, path: str, body: Optional[bytes] = None,
+             headers: Optional[Dict[str, str]] = None) -> int:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+    finally:
+        connection.close()
+
+
+def measure_first_response(timeout: float = 60) -> Tuple[float, float]:
+    """
+    Launch uvicorn and time the first responses.
+
+    Returns:
+        Tuple[float, float]: Seconds from launch to the first /api/status response, and
+            seconds the first TXT /api/analyze call took after that
+    """
+    port = _free_port()
+    data_folder = tempfile.mkdtemp(prefix="startup-benchmark-")
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "analysis_server:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=SERVER_DIRECTORY, env=server_environment(data_folder)
+    )
+    try:
+        while True:
+            if server.poll() is not None:
+                raise RuntimeError("Server exited during startup")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"Server did not answer within {timeout} seconds")
+            try:
+                if _request(port, "GET", "/api/status") == 200:
+                    break
+            except OSError:
+                time.sleep(0.01)
+        first_response = time.perf_counter() - started
+
+        body, content_type = encode_multipart(
+            "standup.txt", b"Alice: I export the invoices by hand every Friday.\n", "text/plain"
+        )
+        analyze_started = time.perf_counter()
+        status = _request(port, "POST", "/api/analyze", body, {"Content-Type": content_type})
+        if status != 200:
+            raise RuntimeError(f"First analysis failed with HTTP {status}")
+        return first_response, time.perf_counter() - analyze_started
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        shutil.rmtree(data_folder, ignore_errors=True)
+
+
+def make_row(name: str, seconds: List[float], budget_ms: Optional[float]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {"name": name, "runs": len(seconds)}
+    row.update(summarize_latencies(seconds))
+    if budget_ms is not None:
+        row["budget_ms"] = budget_ms
+    return row
+
+
+def main() -> int:
+    """Measure cold starts, print a table, save the results and enforce the budgets."""
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeats", type=int, default=5, help="fresh processes per measurement")
+    arg_parser.add_argument("--max-import-ms", type=float, default=1000, help="budget for the median import time")
+    arg_parser.add_argument("--max-first-response-ms", type=float, default=3000,
+                            help="budget for the median time from launch to the first response")
+    arg_parser.add_argument("--output", help="result file (default: temp/benchmarks/startup-<time>.json)")
+    arg_parser.add_argument("--baseline", help="earlier result file to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    args = arg_parser.parse_args()
+
+    imports, loaded = [], set()
+    for _ in range(args.repeats):
+        seconds, modules = measure_import()
+        imports.append(seconds)
+        loaded.update(modules)
+    first_responses, first_analyses = [], []
+    for _ in range(args.repeats):
+        first_response, first_analysis = measure_first_response()
+        first_responses.append(first_response)
+        first_analyses.append(first_analysis)
+
+    rows = [
+        make_row("import", imports, args.max_import_ms),
+        make_row("first-response", first_responses, args.max_first_response_ms),
+        make_row("first-analyze-txt", first_analyses, None),
+    ]
+    print(f"{'measurement':>18}  {'p50 ms':>8}  {'max ms':>8}  {'budget ms':>9}")
+    for row in rows:
+        budget = f"{row['budget_ms']:>9.0f}" if "budget_ms" in row else f"{'-':>9}"
+        print(f"{row['name']:>18}  {row['p50_ms']:>8.1f}  {row['max_ms']:>8.1f}  {budget}")
+
+    output = save_results("startup", {"repeats": args.repeats}, rows, args.output)
+    print(f"\nResults saved to {output}")
+
+    failures = [
+        f"{row['name']}: median {row['p50_ms']} ms exceeds the {row['budget_ms']:.0f} ms budget"
+        for row in rows if "budget_ms" in row and row["p50_ms"] > row["budget_ms"]
+    ]
+    if loaded:
+        failures.append(f"imported at startup instead of on first use: {', '.join(sorted(loaded))}")
+    if failures:
+        print("\nStartup budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+
+    if args.baseline:
+        return report_regressions(compare_results(args.baseline, rows, args.tolerance), args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+Sample Transcript Generator.
+Builds deterministic meeting transcripts in the formats users upload (plain speaker
+turns, Zoom/Teams exports, WebVTT auto-captions and SRT subtitles), with the usual
+noise: timestamps, filler words, transcription markers and captioning duplicates.
+Also holds plain notes documents, which compaction must leave unchanged.
+"""
+
+import random
+from typing import Callable, Dict, List, Tuple
+
+SPEAKERS = ["Alice Johnson", "Bob Smith", "Carol White", "David Lee"]
+SENTENCES = [
+    "we still export the invoices from the ERP by hand every Friday",
+    "then someone in finance copies them into the tracking spreadsheet",
+    "the approvals wait in my inbox until I get to them",
+    "QA only hears about the release when the build is already tagged",
+    "I think we could automate the reminder emails for overdue approvals",
+    "the customer onboarding checklist lives in three different documents",
+    "it usually takes two days before the ticket reaches the right team",
+    "we should have one dashboard that shows where every request is",
+]
+FILLERS = ["um,", "uh,", "you know", "erm", "like", "mm-hmm"]
+MARKERS = ["[inaudible]", "[crosstalk]", "(laughter)", "[inaudible 00:12:03]"]
+
+
+def _utterances(size: int, seed: int) -> List[Tuple[str, str]]:
+    """`size` (speaker, sentence) pairs with fillers and markers sprinkled in."""
+    rng = random.Random(seed)
+    utterances = []
+    for _ in range(size):
+        words = rng.choice(SENTENCES).split()
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(FILLERS))
+        if rng.random() < 0.15:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(MARKERS))
+        sentence = " ".join(words)
+        utterances.append((rng.choice(SPEAKERS), sentence[0].upper() + sentence[1:] + "."))
+    return utterances
+
+
+def _clock(seconds: int) -> str:
+    """Format seconds as HH:MM:SS."""
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def plain(size: int) -> str:
+    """Speaker-labelled turns with bracketed timestamps and repeated labels."""
+    lines = []
+    for index, (speaker, sentence) in enumerate(_utterances(size, 1)):
+        lines.append(f"[{_clock(index * 7)}] {speaker}: {sentence}")
+    return "\n".join(lines) + "\n"
+
+
+def zoom(size: int) -> str:
+    """Zoom/Teams export: a speaker and time header line above each utterance."""
+    blocks = []
+    for index, (speaker, sentence) in enumerate(_utterances(size, 2)):
+        seconds = index * 7
+        elapsed = _clock(seconds) if seconds >= 3600 else f"{seconds // 60}:{seconds % 60:02d}"
+        blocks.append(f"{speaker}   {elapsed}\n{sentence}\n")
+    return "\n".join(blocks)
+
+
+def webvtt(size: int) -> str:
+    """WebVTT auto-captions with voice tags and rolling, overlapping cues."""
+    cues = ["WEBVTT", "Kind: captions", "", "NOTE", "Generated by automatic captioning", ""]
+    second = 0
+    for speaker, sentence in _utterances(size, 3):
+        words = sentence.split()
+        shown: List[str] = []
+        # Auto-captions reveal a sentence a few words at a time, repeating the earlier words
+        for start in range(0, len(words), 4):
+            shown = words[:start + 4]
+            cues.append(f"{_clock(second)}.000 --> {_clock(second + 2)}.000")
+            cues.append(f"<v {speaker}>{' '.join(shown)}</v>")
+            cues.append("")
+            second += 2
+    return "\n".join(cues)
+
+
+def srt(size: int) -> str:
+    """SRT subtitles: numbered cues, each sentence split across two cues."""
+    cues = []
+    number = 1
+    second = 0
+    for speaker, sentence in _utterances(size, 4):
+        words = sentence.split()
+        half = len(words) // 2
+        for part in (words[:half + 2], words[half:]):
+            cues.append(f"{number}\n{_clock(second)},000 --> {_clock(second + 3)},000\n{speaker}: {' '.join(part)}\n")
+            number += 1
+            second += 3
+    return "\n".join(cues)
+
+
+# Notes documents without noise; compaction must return them unchanged
+NOTES_DOCUMENTS: Dict[str, str] = {
+    "approval-notes": (
+        "Invoice Approval Notes\n"
+        "\n"
+        "NOTE: Finance must approve every invoice above $5,000\n"
+        "NOTE that the ERP export runs on Fridays.\n"
+        "\n"
+        "Steps:\n"
+        "1. Review the invoice\n"
+        "the invoice is then sent to the approver\n"
+        "2. The approver checks the purchase order\n"
+        "The approver checks the purchase order against the contract.\n"
+        "3. Payment is scheduled in the ERP.\n"
+        "\n"
+        "Open questions: who covers approvals during holidays?\n"
+    ),
+    "release-checklist": (
+        "Release checklist\n"
+        "Owner: QA lead\n"
+        "Tag the build\n"
+        "Tag the build and notify QA\n"
+        "QA signs off in Jira.\n"
+        "QA signs off in Jira.\n"
+    ),
+    "action-items": (
+        "Quarterly Review 10:30\n"
+        "Budget figures for Q3 are final.\n"
+        "\n"
+        "Action Item: Alice to update the invoice form\n"
+        "Action Item: Bob to review approvals\n"
+    ),
+}
+
+# Sample transcript formats and their generators, sized in utterances
+TRANSCRIPTS: Dict[str, Callable[[int], str]] = {
+    "plain": plain,
+    "zoom": zoom,
+    "webvtt": webvtt,
+    "srt": srt,
+}
@@ -5,72 +5,100 @@ Business Process Analyzer
 Uses Google Gemini AI to analyze business process documents and transcripts
 """
 
-import os
-import io
-import docx
-import PyPDF2
-import google.generativeai as genai
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Optional
+from config import config
+from extractors import extractor_registry
+from llm_backends import LLMBackend, create_backend
+from model_calls import model_calls
+from models import ModelRateLimitError
+
+# Bump whenever _create_analysis_prompt changes so cached analyses are invalidated
+PROMPT_TEMPLATE_VERSION = "1"
+
+# Bump whenever _create_json_analysis_prompt changes
+JSON_PROMPT_TEMPLATE_VERSION = "1"
+
+# Ask Gemini for a JSON document instead of free text
+JSON_GENERATION_CONFIG = {"response_mime_type": "application/json"}
+
+# Bump whenever a text extractor's output changes so cached extractions are invalidated
+EXTRACTOR_VERSION = "1"
+
+def prompt_version(output_format: str) -> str:
+    """Version of the prompt used for an output format, for cache keys."""
+    if output_format == "json":
+        return f"json-{JSON_PROMPT_TEMPLATE_VERSION}"
+    return PROMPT_TEMPLATE_VERSION
+
+def _file_extension(filename: str) -> str:
+    """Return the lowercase extension of a filename without the dot."""
+    return filename.lower().split('.')[-1] if '.' in filename else ''
+
+def extract_text_from_bytes(file_content: bytes, filename: str) -> str:
+    """
+    Extract text content from file bytes based on file extension.
+
+    Defined at module level so it can be shipped to a process pool. The extractor
+    for the file type is imported on first use.
+    """
+    return extractor_registry.extract_bytes(file_content, _file_extension(filename))
+
+def extract_text_from_file(file_path: str, filename: str) -> str:
+    """
+    Extract text content from a file on disk based on the original filename's extension.
+
+    PDFs are read through a read-only memory map, so pages are paged in by the OS on
+    demand instead of being copied into the process; DOCX archives are streamed from
+    the path. Only a path crosses the process pool boundary, not the file contents.
+    Long PDFs can instead be split across the pool with pdf_extractor.extract_pdf_parallel.
+
+    Args:
+        file_path: Location of the file, e.g. an upload spool file
+        filename: Original filename, used to pick the extractor
+    """
+    return extractor_registry.extract_file(file_path, _file_extension(filename))
 
 
 class BusinessProcessAnalyzer:
     """Business process analyzer using Google Gemini AI."""
 
-    def __init__(self, api_key: str):
-        """Initialize the analyzer with Google Gemini API key."""
+    def __init__(self, api_key: str, model_name: str = 'gemini-2.0-flash',
+                 backend: Optional[LLMBackend] = None):
+        """
+        Initialize the analyzer with Google Gemini API key.
+
+        Building an analyzer configures the Gemini SDK, so request handlers should
+        borrow the shared instance from client_registry instead of creating one.
+
+        Args:
+            api_key: Gemini API key
+            model_name: Gemini model name
+            backend: Model backend to use instead of the one selected by config.LLM_BACKEND
+        """
         self.api_key = api_key
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        self.model_name = model_name
+        self.model = backend or create_backend(config.LLM_BACKEND, api_key, model_name)
 
-    def extract_text_from_bytes(self, file_content: bytes, filename: str) -> str:
-        """Extract text content from file bytes based on file extension."""
-        file_extension = filename.lower().split('.')[-1] if '.' in filename else ''
+    def analyze_text(self, text_content: str, output_format: str = "text") -> Dict[str, Any]:
+        """
+        Analyze business processes from already extracted text.
 
-        if file_extension == 'txt':
-            return file_content.decode('utf-8', errors='replace')
+        Args:
+            text_content: Extracted document text
+            output_format: "text" for the delimited text format, "json" for a JSON document
 
-        elif file_extension == 'pdf':
-            try:
-                pdf_file = io.BytesIO(file_content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
-            except Exception as e:
-                raise Exception(f"Error reading PDF file: {str(e)}")
-
-        elif file_extension == 'docx':
-            try:
-                doc_file = io.BytesIO(file_content)
-                doc = docx.Document(doc_file)
-                text = ""
-                for paragraph in doc.paragraphs:
-                    text += paragraph.text + "\n"
-                return text
-            except Exception as e:
-                raise Exception(f"Error reading DOCX file: {str(e)}")
-
-        else:
-            raise Exception(f"Unsupported file type: {file_extension}")
-
-    def analyze_from_bytes(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Analyze business processes from file bytes."""
+        Raises:
+            ModelRateLimitError: If Gemini stays rate limited past the call deadline
+        """
         try:
-            # Extract text from the file
-            text_content = self.extract_text_from_bytes(file_content, filename)
-
             if not text_content.strip():
                 return {
                     "success": False,
                     "error": "No readable text content found in the file"
                 }
 
-            # Create analysis prompt
-            prompt = self._create_analysis_prompt(text_content)
-
             # Generate analysis using Gemini
-            response = self.model.generate_content(prompt)
+            response = self._generate(text_content, output_format)
 
             if not response or not response.text:
                 return {
@@ -84,12 +112,105 @@ class BusinessProcessAnalyzer:
                 "response_length": len(response.text)
             }
 
+        except ModelRateLimitError:
+            # Transient; reported to the client as 429 rather than a failed analysis
+            raise
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Analysis failed: {str(e)}"
             }
 
+    def stream_text(self, text_content: str, output_format: str = "text") -> Iterator[str]:
+        """
+        Stream the analysis of already extracted text as the model generates it.
+
+        Args:
+            text_content: Extracted document text
+            output_format: "text" for the delimited text format, "json" for a JSON document
+
+        Yields:
+            str: Successive fragments of the model response
+        """
+        for chunk in self._generate(text_content, output_format, stream=True):
+            try:
+                fragment = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. safety metadata only)
+                continue
+            if fragment:
+                yield fragment
+
+    def _generate(self, text_content: str, output_format: str, stream: bool = False):
+        """
+        Send the analysis prompt for an output format to Gemini.
+
+        Calls go through model_calls, which rate limits, retries transient errors
+        and shares one call between identical concurrent prompts.
+
+        Raises:
+            ModelRateLimitError: If Gemini stays rate limited past the call deadline
+        """
+        call = model_calls.stream if stream else model_calls.generate
+        if output_format == "json":
+            return call(
+                self.model,
+                self._create_json_analysis_prompt(text_content),
+                generation_config=JSON_GENERATION_CONFIG
+            )
+        return call(self.model, self._create_analysis_prompt(text_content))
+
+    def _create_json_analysis_prompt(self, text_content: str) -> str:
+        """Create the business process analysis prompt that asks for a JSON document."""
+        return f"""
+You are an expert business process analyst. Carefully read through the entire document and identify ALL business processes mentioned, no matter how briefly described: workflows and procedures, tasks and activities, decision-making, communication flows, reviews and approvals, development/deployment, quality assurance, administrative tasks and any other business activities.
+
+Respond with a single JSON object, and nothing else, in exactly this shape:
+
+{{
+  "processes": [
+    {{
+      "name": "Clear, descriptive process name",
+      "function": "Business function/department, e.g. Development, QA, Operations, Management",
+      "type": "Core | Support | Management",
+      "priority": "High | Medium | Low (business impact)",
+      "automationPotential": "High | Medium | Low (how easily it could be automated)",
+      "painLevel": "High | Medium | Low (current problems/inefficiencies)",
+      "confidence": 0-100 integer, how confident you are in this analysis,
+      "workflow": [
+        {{
+          "actor": "Actor/Role",
+          "action": "Specific action or task",
+          "duration": "Time estimate if mentioned, or Not specified",
+          "tools": "Systems, tools, or platforms used",
+          "dependencies": "What this step depends on",
+          "bottlenecks": "Identified delays or problems"
+        }}
+      ],
+      "stakeholders": ["Process owner, internal and external stakeholders"],
+      "painPoints": ["Explicit and implied issues, manual effort, delays, quality issues, communication gaps"],
+      "opportunities": ["AI, automation and digital transformation opportunities, process improvements, quick wins"]
+    }}
+  ],
+  "meetingOverview": {{
+    "participants": ["People or roles taking part"],
+    "keyThemes": ["Main themes of the document"],
+    "overallAutomationReadiness": "High | Medium | Low",
+    "participantSentiment": "Positive | Neutral | Negative | Mixed"
+  }}
+}}
+
+IMPORTANT INSTRUCTIONS:
+1. Read the ENTIRE document carefully before starting your analysis
+2. Include an entry in "processes" for EVERY distinct business process mentioned, even briefly
+3. Map ALL workflow steps mentioned or implied, in order
+4. If you're unsure about details, make reasonable inferences based on common business practices
+
+Document to analyze:
+
+{text_content}
+"""
+
     def _create_analysis_prompt(self, text_content: str) -> str:
         """Create a detailed prompt for business process analysis."""
         return f"""
@@ -0,0 +1,349 @@
+"""
+Analysis Cache Module.
+Content-addressed caching of analysis results and extracted document text, each
+with an in-memory LRU tier in front of a persistent SQLite tier stored under the
+upload folder.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from models import AnalysisResult
+from serialization import load_model, model_json, splice_json
+from config import config
+
+# Disk tier writes between recounts of its entries; other worker processes write to
+# the same database, so the running count kept by each process drifts
+RECOUNT_INTERVAL_WRITES = 1000
+
+
+class TieredCache:
+    """Size-bounded in-memory LRU backed by a SQLite store, with TTL expiry."""
+
+    def __init__(self, db_path: str, memory_items: int, max_disk_entries: int, ttl_seconds: int):
+        """
+        Initialize the cache. The SQLite database is opened lazily on first use.
+
+        Args:
+            db_path: Path of the SQLite database file
+            memory_items: Maximum number of entries kept in the memory tier
+            max_disk_entries: Maximum number of entries kept on disk before eviction
+            ttl_seconds: Entry lifetime in seconds (0 disables expiry)
+        """
+        self.db_path = db_path
+        self.memory_items = max(0, memory_items)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.ttl_seconds = max(0, ttl_seconds)
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Running count of disk entries, so writes don't count the table each time
+        self._disk_entries: Optional[int] = None
+        self._writes_since_count = 0
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        """Check whether an entry created at the given time has outlived the TTL."""
+        return self.ttl_seconds > 0 and now - created_at > self.ttl_seconds
+
+    def _remember(self, key: str, created_at: float, value: bytes) -> None:
+        """Insert an entry into the memory tier, evicting the least recently used."""
+        if self.memory_items == 0:
+            return
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Optional[bytes]: The cached value, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, created_at FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and self._expired(row[1], now):
+                    deleted = conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,)).rowcount
+                    conn.commit()
+                    if self._disk_entries is not None:
+                        self._disk_entries -= deleted
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+                    conn.commit()
+            except sqlite3.Error as e:
+                print(f"Error reading cache {self.db_path}: {e}")
+                row = None
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value = bytes(row[0])
+            self._remember(key, row[1], value)
+            self._stats["disk_hits"] += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """
+        Store a value in both tiers, evicting the least recently used disk entries.
+
+        Args:
+            key: Cache key
+            value: Serialized value to store
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, value)
+            try:
+                conn = self._connect()
+                if self._disk_entries is None or self._writes_since_count >= RECOUNT_INTERVAL_WRITES:
+                    self._disk_entries = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+                    self._writes_since_count = 0
+                replaced = conn.execute(
+                    "UPDATE cache_entries SET value = ?, created_at = ?, accessed_at = ? WHERE key = ?",
+                    (value, now, now, key)
+                ).rowcount
+                if not replaced:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO cache_entries (key, value, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, value, now, now)
+                    )
+                    self._disk_entries += 1
+                self._writes_since_count += 1
+                overflow = self._disk_entries - self.max_disk_entries
+                if overflow > 0:
+                    evicted = conn.execute(
+                        "DELETE FROM cache_entries WHERE key IN ("
+                        "SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                        (overflow,)
+                    ).rowcount
+                    self._disk_entries -= evicted
+                    self._stats["evictions"] += evicted
+                conn.commit()
+                self._stats["writes"] += 1
+            except sqlite3.Error as e:
+                # Recount on the next write rather than trust a count the failure may have skewed
+                self._disk_entries = None
+                print(f"Error writing cache {self.db_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        return stats
+
+
+class AnalysisResultCache:
+    """
+    Cache of parsed analysis results keyed by document text, model backend, model,
+    prompt version and parser version.
+
+    Entries are stored as {"response_length": n, "analysis": {...}} with the analysis
+    last, so its JSON can be sliced out and served again without re-encoding.
+    """
+
+    # Everything before the analysis JSON in a stored entry
+    ENTRY_PREFIX = b'{"response_length":'
+    ANALYSIS_FIELD = b',"analysis":'
+
+    def __init__(self, store: TieredCache):
+        """Initialize the result cache on top of a tiered byte store."""
+        self.store = store
+
+    @staticmethod
+    def make_key(text_content: str, backend: str, model_name: str, prompt_version: str,
+                 parser_version: str) -> str:
+        """
+        Build a content-addressed cache key.
+
+        Args:
+            text_content: Extracted document text sent to the model
+            backend: Model backend that produced the analysis, so mock results never
+                answer for the real model
+            model_name: Name of the model that produced the analysis
+            prompt_version: Version of the prompt template
+            parser_version: Parser engine and version that turned the response into the analysis
+
+        Returns:
+            str: Hex SHA-256 digest identifying the analysis
+        """
+        digest = hashlib.sha256()
+        digest.update(backend.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(model_name.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(parser_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(text_content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[AnalysisResult, int]]:
+        """
+        Look up a cached analysis.
+
+        Returns:
+            Optional[Tuple[AnalysisResult, int]]: The analysis and its response length, or None
+        """
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            head, separator, rest = value.partition(self.ANALYSIS_FIELD)
+            if separator and head.startswith(self.ENTRY_PREFIX) and rest.endswith(b"}"):
+                analysis_json = rest[:-1]
+                analysis = load_model(AnalysisResult, analysis_json)
+                analysis._json = analysis_json
+                return analysis, int(head[len(self.ENTRY_PREFIX):])
+            # Entries written before the analysis was stored last
+            payload = json.loads(value)
+            return AnalysisResult(**payload["analysis"]), payload.get("response_length", 0)
+        except Exception as e:
+            print(f"Error decoding cached analysis: {e}")
+            return None
+
+    def set(self, key: str, analysis: AnalysisResult, response_length: int) -> None:
+        """Store an analysis and the length of the model response that produced it."""
+        self.store.set(key, splice_json({"response_length": response_length}, "analysis", model_json(analysis)))
+
+
+class ExtractionCache:
+    """
+    Cache of extracted document text keyed by the raw file bytes and extractor version.
+
+    Independent of the model and prompt, so re-analyzing a document after either
+    changes skips text extraction entirely. Text is stored zlib-compressed in both
+    tiers.
+    """
+
+    def __init__(self, store: TieredCache):
+        """Initialize the extraction cache on top of a tiered byte store."""
+        self.store = store
+
+    @staticmethod
+    def make_key(file_path: str, filename: str, extractor_version: str, max_pages: Optional[int] = None) -> str:
+        """
+        Build a content-addressed cache key by hashing the file in chunks.
+
+        Args:
+            file_path: Location of the raw file
+            filename: Original filename, whose extension picks the extractor
+            extractor_version: Version of the text extractors
+            max_pages: PDF page cap the text was extracted under (None or 0 for all pages)
+
+        Returns:
+            str: Hex SHA-256 digest identifying the extracted text
+        """
+        extension = os.path.splitext(filename)[1].lower()
+        # Only PDF extraction honours the page cap
+        page_cap = (max_pages or 0) if extension == '.pdf' else 0
+        digest = hashlib.sha256()
+        digest.update(extractor_version.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(extension.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(str(page_cap).encode('utf-8'))
+        digest.update(b'\0')
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(config.UPLOAD_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up cached text.
+
+        Returns:
+            Optional[str]: The extracted text, or None on a miss
+        """
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            return zlib.decompress(value).decode('utf-8')
+        except Exception as e:
+            print(f"Error decoding cached text: {e}")
+            return None
+
+    def set(self, key: str, text_content: str) -> None:
+        """Store extracted text, compressed."""
+        self.store.set(key, zlib.compress(text_content.encode('utf-8')))
+
+    def lookup(self, file_path: str, filename: str, extractor_version: str,
+               max_pages: Optional[int] = None) -> Tuple[str, Optional[str]]:
+        """
+        Hash a file and look up its extracted text in one call.
+
+        Returns:
+            Tuple[str, Optional[str]]: Cache key, and the cached text or None on a miss
+        """
+        key = self.make_key(file_path, filename, extractor_version, max_pages)
+        return key, self.get(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes."""
+        return self.store.get_stats()
+
+
+# Create a global result cache instance
+analysis_cache = AnalysisResultCache(TieredCache(
+    db_path=config.RESULT_CACHE_PATH,
+    memory_items=config.RESULT_CACHE_MEMORY_ITEMS,
+    max_disk_entries=config.RESULT_CACHE_MAX_DISK_ENTRIES,
+    ttl_seconds=config.RESULT_CACHE_TTL_SECONDS
+))
+
+# Create a global extraction cache instance
+extraction_cache = ExtractionCache(TieredCache(
+    db_path=config.EXTRACTION_CACHE_PATH,
+    memory_items=config.EXTRACTION_CACHE_MEMORY_ITEMS,
+    max_disk_entries=config.EXTRACTION_CACHE_MAX_DISK_ENTRIES,
+    ttl_seconds=config.EXTRACTION_CACHE_TTL_SECONDS
+))
@@ -0,0 +1,279 @@
+"""
+Chunked Analysis Module.
+Splits long transcripts into overlapping chunks at speaker and paragraph boundaries,
+and merges the per-chunk analyses back into a single result. Revisions of a document
+are split into content-defined chunks instead, so an edit changes only the chunks
+around it.
+"""
+
+import re
+from hashlib import blake2b
+from typing import List, Optional, Set, Tuple
+from models import AnalysisResult, BusinessProcess
+
+# A line that opens a new speaker turn, e.g. "Alice:" or "[00:12:31] Bob Smith:"
+SPEAKER_TURN_PATTERN = re.compile(r"^\s*(?:\[?\d{1,2}:\d{2}(?::\d{2})?\]?\s*)?[A-Z][\w .'-]{0,40}:\s")
+
+# Processes whose name token sets overlap at least this much are treated as duplicates
+DUPLICATE_NAME_SIMILARITY = 0.6
+
+NAME_STOPWORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "process", "workflow"}
+
+
+def split_into_segments(text: str) -> List[str]:
+    """
+    Split text into paragraph and speaker-turn segments.
+
+    Args:
+        text: Full document text
+
+    Returns:
+        List[str]: Segments in document order, each ending with a newline
+    """
+    segments = []
+    current: List[str] = []
+
+    for line in text.splitlines():
+        starts_turn = SPEAKER_TURN_PATTERN.match(line) is not None
+        if (not line.strip() or starts_turn) and current:
+            segments.append("\n".join(current) + "\n")
+            current = []
+        if line.strip():
+            current.append(line)
+
+    if current:
+        segments.append("\n".join(current) + "\n")
+
+    return segments
+
+
+def _hard_split(segment: str, chunk_size: int) -> List[str]:
+    """Split a single oversized segment at line or word boundaries."""
+    pieces = []
+    while len(segment) > chunk_size:
+        cut = segment.rfind("\n", 0, chunk_size)
+        if cut <= 0:
+            cut = segment.rfind(" ", 0, chunk_size)
+        if cut <= 0:
+            cut = chunk_size
+        pieces.append(segment[:cut + 1])
+        segment = segment[cut + 1:]
+    if segment:
+        pieces.append(segment)
+    return pieces
+
+
+def split_text(text: str, chunk_size: int, overlap: int) -> List[str]:
+    """
+    Pack segments into chunks of at most chunk_size characters.
+
+    Each chunk after the first repeats the trailing segments of the previous chunk,
+    up to overlap characters, so processes described across a boundary are seen whole
+    by at least one chunk.
+
+    Args:
+        text: Full document text
+        chunk_size: Maximum chunk size in characters
+        overlap: Maximum number of characters carried over between chunks
+
+    Returns:
+        List[str]: Chunks in document order
+    """
+    segments = []
+    for segment in split_into_segments(text):
+        segments.extend(_hard_split(segment, chunk_size) if len(segment) > chunk_size else [segment])
+
+    chunks = []
+    current: List[str] = []
+    current_size = 0
+    carried = 0
+
+    for segment in segments:
+        if current and current_size + len(segment) > chunk_size and len(current) > carried:
+            chunks.append("".join(current))
+
+            # Carry trailing segments over as overlap
+            tail: List[str] = []
+            tail_size = 0
+            for previous in reversed(current):
+                if tail_size + len(previous) > overlap or tail_size + len(previous) + len(segment) > chunk_size:
+                    break
+                tail.insert(0, previous)
+                tail_size += len(previous)
+            current = tail
+            current_size = tail_size
+            carried = len(tail)
+
+        current.append(segment)
+        current_size += len(segment)
+
+    if len(current) > carried or not chunks:
+        chunks.append("".join(current))
+
+    return chunks
+
+
+def _is_cut_point(segment: str, target_size: int) -> bool:
+    """
+    Decide from a segment's own content whether a chunk may end after it.
+
+    Each segment is a cut point with probability len(segment) / target_size, so
+    chunks average about target_size characters while every decision depends only
+    on that segment.
+    """
+    digest = int.from_bytes(blake2b(segment.encode("utf-8"), digest_size=8).digest(), "big")
+    return digest < (1 << 64) * min(1.0, len(segment) / max(1, target_size))
+
+
+def split_content_defined(text: str, target_size: int) -> List[str]:
+    """
+    Split text into chunks whose boundaries are chosen by segment content.
+
+    Unlike split_text, where a paragraph inserted near the start shifts every later
+    chunk boundary, an edit here changes only the chunk containing it (and the next
+    one if it touches a boundary segment), so the unchanged chunks of a revised
+    document are identical to before and their cached analyses can be reused.
+    Chunks are between a quarter and twice target_size characters and do not overlap.
+
+    Args:
+        text: Full document text
+        target_size: Average chunk size in characters
+
+    Returns:
+        List[str]: Chunks in document order
+    """
+    min_size, max_size = target_size // 4, target_size * 2
+    chunks = []
+    current: List[str] = []
+    current_size = 0
+
+    for segment in split_into_segments(text):
+        for piece in _hard_split(segment, max_size) if len(segment) > max_size else [segment]:
+            if current and current_size + len(piece) > max_size:
+                chunks.append("".join(current))
+                current, current_size = [], 0
+            current.append(piece)
+            current_size += len(piece)
+            if current_size >= min_size and _is_cut_point(piece, target_size):
+                chunks.append("".join(current))
+                current, current_size = [], 0
+
+    if current:
+        chunks.append("".join(current))
+    return chunks
+
+
+def _name_tokens(name: str) -> Set[str]:
+    """Normalize a process name into a set of significant lowercase tokens."""
+    return {token for token in re.findall(r"[a-z0-9]+", name.lower()) if token not in NAME_STOPWORDS}
+
+
+def _is_duplicate(first: BusinessProcess, second: BusinessProcess) -> bool:
+    """Check whether two processes from different chunks describe the same process."""
+    first_tokens = _name_tokens(first.name)
+    second_tokens = _name_tokens(second.name)
+    if not first_tokens or not second_tokens:
+        return first.name.strip().lower() == second.name.strip().lower()
+    overlap = len(first_tokens & second_tokens) / len(first_tokens | second_tokens)
+    return overlap >= DUPLICATE_NAME_SIMILARITY
+
+
+def _union(first: List[str], second: List[str]) -> List[str]:
+    """Combine two lists, keeping first-seen order and dropping duplicates."""
+    seen = set()
+    combined = []
+    for item in first + second:
+        if item not in seen:
+            seen.add(item)
+            combined.append(item)
+    return combined
+
+
+def _merge_pair(existing: BusinessProcess, duplicate: BusinessProcess) -> BusinessProcess:
+    """Merge two descriptions of one process, keeping the more detailed workflow."""
+    base = existing if len(existing.workflow) >= len(duplicate.workflow) else duplicate
+    other = duplicate if base is existing else existing
+    data = base.dict()
+    data.update(
+        stakeholders=_union(base.stakeholders, other.stakeholders),
+        painPoints=_union(base.painPoints, other.painPoints),
+        opportunities=_union(base.opportunities, other.opportunities)
+    )
+    return BusinessProcess(**data)
+
+
+def _numbered(process: BusinessProcess, number: int) -> BusinessProcess:
+    data = process.dict()
+    data["id"] = f"process-{number}"
+    return BusinessProcess(**data)
+
+
+class ProcessMerger:
+    """
+    Merges the processes of a document's chunks, one chunk at a time in chunk order.
+
+    A process is only merged with a duplicate from another chunk: two similar
+    processes the model reported in the same chunk are kept apart. Merged processes
+    keep their position, so the ids handed out as chunks are added stay valid.
+    """
+
+    def __init__(self):
+        # Each merged process with the chunks it was reported in
+        self._merged: List[Tuple[BusinessProcess, Set[int]]] = []
+        self._placeholder: Optional[BusinessProcess] = None
+        self._chunks = 0
+
+    def add(self, result: AnalysisResult) -> List[BusinessProcess]:
+        """
+        Merge the processes of the next chunk.
+
+        Args:
+            result: Analysis of the chunk
+
+        Returns:
+            List[BusinessProcess]: Processes the chunk added, numbered as in the final list
+        """
+        chunk = self._chunks
+        self._chunks += 1
+        added = []
+        for process in result.processes:
+            if not process.id.startswith("process-"):
+                # Placeholder for a chunk that yielded nothing parseable
+                if self._placeholder is None:
+                    self._placeholder = process
+                continue
+            for index, (existing, chunks) in enumerate(self._merged):
+                if chunk not in chunks and _is_duplicate(existing, process):
+                    self._merged[index] = (_merge_pair(existing, process), chunks | {chunk})
+                    break
+            else:
+                self._merged.append((process, {chunk}))
+                added.append(_numbered(process, len(self._merged)))
+        return added
+
+    @property
+    def processes(self) -> List[BusinessProcess]:
+        """Merged processes with ids process-1..process-N, or the first placeholder if none was extracted."""
+        if not self._merged:
+            return [self._placeholder] if self._placeholder is not None else []
+        return [_numbered(process, number) for number, (process, _) in enumerate(self._merged, 1)]
+
+
+def merge_processes(chunk_results: List[AnalysisResult]) -> List[BusinessProcess]:
+    """
+    Merge per-chunk process lists into one deduplicated, renumbered list.
+
+    Duplicates are only looked for across chunks (see ProcessMerger). Placeholder
+    processes produced when a chunk yields nothing parseable are dropped as long as
+    at least one chunk produced real processes.
+
+    Args:
+        chunk_results: Analysis results in chunk order
+
+    Returns:
+        List[BusinessProcess]: Merged processes with ids process-1..process-N
+    """
+    merger = ProcessMerger()
+    for result in chunk_results:
+        merger.add(result)
+    return merger.processes
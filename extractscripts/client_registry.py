@@ -0,0 +1,97 @@
+"""
+Analyzer Client Registry Module.
+Keeps one long-lived BusinessProcessAnalyzer per process so the Gemini client and its
+connection are reused across requests instead of being rebuilt for every upload.
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from business_analyzer import BusinessProcessAnalyzer
+from config import config
+
+
+def _fingerprint(api_key: str) -> str:
+    """Return a short, non-reversible fingerprint of an API key for reporting."""
+    return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:8]
+
+
+class AnalyzerRegistry:
+    """Process-wide registry that hands out a shared, long-lived analyzer."""
+
+    def __init__(self, model_name: str):
+        """
+        Initialize the registry. The analyzer is built lazily on first use.
+
+        Args:
+            model_name: Gemini model name used for every analyzer built by the registry
+        """
+        self.model_name = model_name
+        self._lock = threading.Lock()
+        self._analyzer: Optional[BusinessProcessAnalyzer] = None
+        self._api_key: Optional[str] = None
+        self._created_at: Optional[float] = None
+        self._clients_created = 0
+        self._key_rotations = 0
+        self._requests_served = 0
+        self._in_flight = 0
+
+    def get_analyzer(self, api_key: str) -> BusinessProcessAnalyzer:
+        """
+        Return the shared analyzer, building it on first use or when the key changes.
+
+        A key change builds a fresh analyzer. The Gemini SDK holds its API key
+        globally, so calls still running on the previous analyzer use the new key
+        from then on.
+
+        Args:
+            api_key: Gemini API key the analyzer must use
+
+        Returns:
+            BusinessProcessAnalyzer: The shared analyzer for this key
+        """
+        analyzer = self._analyzer
+        if analyzer is not None and self._api_key == api_key:
+            return analyzer
+
+        with self._lock:
+            if self._analyzer is None or self._api_key != api_key:
+                if self._analyzer is not None:
+                    self._key_rotations += 1
+                self._analyzer = BusinessProcessAnalyzer(api_key, self.model_name)
+                self._api_key = api_key
+                self._created_at = time.time()
+                self._clients_created += 1
+            return self._analyzer
+
+    @contextmanager
+    def lease(self, api_key: str) -> Iterator[BusinessProcessAnalyzer]:
+        """Borrow the shared analyzer for one request while tracking usage stats."""
+        analyzer = self.get_analyzer(api_key)
+        with self._lock:
+            self._in_flight += 1
+            self._requests_served += 1
+        try:
+            yield analyzer
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return registry-level usage statistics."""
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "active_key": _fingerprint(self._api_key) if self._api_key else None,
+                "client_age_seconds": round(time.time() - self._created_at, 1) if self._created_at else 0.0,
+                "clients_created": self._clients_created,
+                "key_rotations": self._key_rotations,
+                "requests_served": self._requests_served,
+                "in_flight": self._in_flight
+            }
+
+
+# Create a global registry instance
+analyzer_registry = AnalyzerRegistry(config.GEMINI_MODEL)
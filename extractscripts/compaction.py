@@ -0,0 +1,468 @@
+"""
+Transcript Compaction Module.
+Strips transcript noise that costs prompt tokens without carrying meaning, such as
+caption metadata, timestamps, filler words, "[inaudible]" markers, captioning
+duplicates and repeated speaker labels, before the text reaches the prompt. Every
+stage is a generator over lines, so any selection of stages runs as one streaming
+pass over the document.
+"""
+
+import re
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Stage = Callable[[Iterable[str]], Iterator[str]]
+
+TIMESTAMP = r"(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?"
+
+# WebVTT/SRT structure: the file header, comment blocks, cue numbers, cue timings and inline cue tags
+CAPTION_HEADER_PATTERN = re.compile(r"^WEBVTT(?:[ \t]|$)")
+NOTE_BLOCK_PATTERN = re.compile(r"^NOTE(?:[ \t]|$)")
+CUE_INDEX_PATTERN = re.compile(r"^\d+$")
+CUE_TIMING_PATTERN = re.compile(r"^" + TIMESTAMP + r"\s*-->")
+INLINE_CUE_TAG_PATTERN = re.compile(r"</?c(?:\.[\w.]+)?>|<" + TIMESTAMP + r">")
+VOICE_TAG_PATTERN = re.compile(r"^<v(?:\.[\w.]+)?\s+([^>]+)>(.*?)(?:</v>)?$")
+
+BRACKETED_TIMESTAMP_PATTERN = re.compile(r"[\[(]" + TIMESTAMP + r"[\])]")
+LEADING_TIMESTAMP_PATTERN = re.compile(r"^" + TIMESTAMP + r"\s*(?:[-|]\s*)?")
+
+# "Alice: ...", ">> BOB SMITH: ...", "Speaker 2: ..."; the label is at most four words
+SPEAKER_LABEL_PATTERN = re.compile(r"^(?:>>\s*)?([A-Z0-9][\w.'-]*(?: [A-Z0-9][\w.'-]*){0,3})\s*:(?:\s+(.*))?$")
+# Zoom and Teams exports put the speaker and time on a line of their own
+SPEAKER_HEADER_PATTERN = re.compile(r"^([A-Z][\w.'-]*(?: [A-Z][\w.'-]*){0,3})\s+" + TIMESTAMP + r"$")
+# "- item", "* item", "1. item", "2) item"
+LIST_ITEM_PATTERN = re.compile(r"^(?:[-*\u2022]|\d+[.)])\s")
+
+MARKER_PATTERN = re.compile(
+    r"[\[(](?:inaudible|crosstalk|cross-talk|laughter|laughs|laughing|music|applause|unintelligible|"
+    r"indiscernible|silence|pause|noise|background noise|coughs?|overlapping|no audio|blank_audio)"
+    r"\b[^\])\n]{0,40}[\])]",
+    re.IGNORECASE
+)
+# Case-sensitive so acronyms such as "HM" or "AH" survive
+FILLER_PATTERN = re.compile(r"(?<![\w'-])(?:[Uu]+[hm]+|[Ee]r+m+|[Hh]m+|[Mm]+-?h+m+|[Aa]h+)(?![\w'-]),?")
+
+MULTIPLE_SPACES_PATTERN = re.compile(r" {2,}")
+SPACE_BEFORE_PUNCTUATION_PATTERN = re.compile(r" +([,.!?;:])")
+
+# Lines looked at for cue timings when deciding whether a document is a caption file
+CAPTION_DETECTION_LINES = 20
+
+# A document is a speaker-turn transcript if, within its first lines, enough lines
+# are speaker turns and more than one speaker takes several turns
+TRANSCRIPT_DETECTION_LINES = 200
+MIN_TRANSCRIPT_TURN_SHARE = 0.3
+MIN_TRANSCRIPT_SPEAKERS = 2
+MIN_TURNS_PER_SPEAKER = 2
+
+# Stages that rewrite speaker labels; on other documents they would also rewrite
+# "Label: value" lines and "Heading 10:30" lines
+TRANSCRIPT_STAGES = frozenset(("speakers", "turns"))
+
+# Captioning overlaps shorter than this many words are treated as natural speech
+MIN_CAPTION_OVERLAP_WORDS = 2
+MAX_CAPTION_OVERLAP_WORDS = 20
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text.
+
+    Gemini averages about four characters per token on English text; estimating
+    avoids a count_tokens round trip per document.
+    """
+    return (len(text) + 3) // 4
+
+
+def _tidy(line: str) -> str:
+    """Collapse the gaps left behind by removed text."""
+    line = MULTIPLE_SPACES_PATTERN.sub(" ", line)
+    return SPACE_BEFORE_PUNCTUATION_PATTERN.sub(r"\1", line).strip()
+
+
+def split_speaker(line: str) -> Tuple[Optional[str], str]:
+    """
+    Split a line into its speaker label and content.
+
+    Returns:
+        Tuple[Optional[str], str]: Speaker (None for unlabelled lines) and content
+    """
+    match = SPEAKER_LABEL_PATTERN.match(line)
+    if match is None:
+        return None, line
+    return match.group(1), match.group(2) or ""
+
+
+def is_caption_transcript(text: str) -> bool:
+    """
+    Whether a document is a WebVTT or SRT caption file.
+
+    True when the first non-blank line is the WEBVTT header, or when one of the
+    first lines is a cue timing ("00:00:01,000 --> 00:00:03,000").
+    """
+    lines = (line.strip() for line in text.splitlines())
+    first_lines = [line for line in lines if line][:CAPTION_DETECTION_LINES]
+    if not first_lines:
+        return False
+    if CAPTION_HEADER_PATTERN.match(first_lines[0]):
+        return True
+    return any(CUE_TIMING_PATTERN.match(line) for line in first_lines)
+
+
+def is_transcript(text: str) -> bool:
+    """
+    Whether a document is a meeting transcript rather than an ordinary document.
+
+    Caption files are transcripts. Otherwise at least MIN_TRANSCRIPT_TURN_SHARE of
+    the first non-blank lines must be speaker turns ("Alice: ...") or speaker-and-time
+    headers ("Alice Johnson 0:07"), and at least MIN_TRANSCRIPT_SPEAKERS speakers must
+    take MIN_TURNS_PER_SPEAKER turns each, so a heading and a list of "Action Item: ..."
+    lines are not mistaken for a conversation.
+    """
+    if is_caption_transcript(text):
+        return True
+    speakers: Dict[str, int] = {}
+    turns = 0
+    seen = 0
+    for line in text.splitlines():
+        line = LEADING_TIMESTAMP_PATTERN.sub("", BRACKETED_TIMESTAMP_PATTERN.sub("", line).strip())
+        if not line:
+            continue
+        header = SPEAKER_HEADER_PATTERN.match(line)
+        speaker = header.group(1) if header else split_speaker(line)[0]
+        if speaker is not None:
+            turns += 1
+            speakers[speaker] = speakers.get(speaker, 0) + 1
+        seen += 1
+        if seen == TRANSCRIPT_DETECTION_LINES:
+            break
+    recurring = sum(1 for count in speakers.values() if count >= MIN_TURNS_PER_SPEAKER)
+    return recurring >= MIN_TRANSCRIPT_SPEAKERS and turns >= seen * MIN_TRANSCRIPT_TURN_SHARE
+
+
+def normalize_whitespace(lines: Iterable[str]) -> Iterator[str]:
+    """Strip lines, collapse runs of spaces and runs of blank lines."""
+    blank = True    # Also drops leading blank lines
+    for line in lines:
+        line = MULTIPLE_SPACES_PATTERN.sub(" ", line.replace("\u00a0", " ")).strip()
+        if not line:
+            if not blank:
+                yield ""
+            blank = True
+            continue
+        blank = False
+        yield line
+
+
+def strip_caption_metadata(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Drop WebVTT/SRT cue numbers and timings; turn voice tags into speaker labels.
+
+    The WEBVTT header block and NOTE comment blocks are only removed when the first
+    non-blank line is the WEBVTT header, so notes documents keep their "NOTE" lines.
+    """
+    held_index = None    # A number line is only a cue number if a cue timing follows it
+    webvtt = None        # Decided by the first non-blank line
+    skipping_block = False
+    for line in lines:
+        stripped = line.strip()
+        if webvtt is None and stripped:
+            webvtt = CAPTION_HEADER_PATTERN.match(stripped) is not None
+            skipping_block = webvtt
+        if skipping_block:
+            # Header and NOTE blocks run up to the next blank line
+            if stripped:
+                continue
+            skipping_block = False
+        if webvtt and NOTE_BLOCK_PATTERN.match(stripped):
+            skipping_block = True
+            continue
+
+        if held_index is not None:
+            index, held_index = held_index, None
+            if CUE_TIMING_PATTERN.match(line):
+                continue
+            yield index
+        if CUE_INDEX_PATTERN.match(line):
+            held_index = line
+            continue
+        if CUE_TIMING_PATTERN.match(line):
+            continue
+
+        line = INLINE_CUE_TAG_PATTERN.sub("", line)
+        voice = VOICE_TAG_PATTERN.match(line)
+        if voice:
+            line = f"{voice.group(1).strip()}: {voice.group(2).strip()}"
+        yield line
+    if held_index is not None:
+        yield held_index
+
+
+def _remove_matches(lines: Iterable[str], *patterns: re.Pattern) -> Iterator[str]:
+    """Remove every match of the patterns, dropping lines left with no content."""
+    for line in lines:
+        if not line:
+            yield line
+            continue
+        stripped = line
+        for pattern in patterns:
+            stripped = pattern.sub("", stripped)
+        if stripped == line:
+            yield line
+            continue
+        stripped = _tidy(stripped)
+        content = split_speaker(stripped)[1]
+        if any(character.isalnum() for character in content):
+            yield stripped
+
+
+def strip_timestamps(lines: Iterable[str]) -> Iterator[str]:
+    """Remove bracketed timestamps anywhere and bare timestamps at the start of a line."""
+    return _remove_matches(lines, BRACKETED_TIMESTAMP_PATTERN, LEADING_TIMESTAMP_PATTERN)
+
+
+def normalize_speakers(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Rewrite every speaker turn as "Speaker: text".
+
+    Speaker-and-time header lines, as in Zoom and Teams exports, are dropped and
+    their speaker is carried onto the unlabelled lines that follow.
+    """
+    header_speaker = None
+    for line in lines:
+        if not line:
+            yield line
+            continue
+        header = SPEAKER_HEADER_PATTERN.match(line)
+        if header:
+            header_speaker = header.group(1)
+            continue
+        speaker, content = split_speaker(line)
+        if speaker is not None:
+            header_speaker = None
+            yield f"{speaker}: {content}" if content else f"{speaker}:"
+        elif header_speaker is not None:
+            yield f"{header_speaker}: {line}"
+        else:
+            yield line
+
+
+def strip_markers(lines: Iterable[str]) -> Iterator[str]:
+    """Remove "[inaudible]", "(crosstalk)" and similar transcription markers."""
+    return _remove_matches(lines, MARKER_PATTERN)
+
+
+def strip_fillers(lines: Iterable[str]) -> Iterator[str]:
+    """Remove filler words such as "um", "uh", "erm" and "mm-hmm"."""
+    return _remove_matches(lines, FILLER_PATTERN)
+
+
+def _comparable(content: str) -> str:
+    """Normalize content for duplicate detection."""
+    return " ".join(content.casefold().split())
+
+
+def _extends(longer: str, shorter: str) -> bool:
+    """Whether longer is shorter followed by nothing, more words or punctuation."""
+    return longer.startswith(shorter) and (len(longer) == len(shorter) or longer[len(shorter)] in " .,!?;:")
+
+
+def _caption_overlap(previous: List[str], current: List[str]) -> int:
+    """Number of words at the end of previous that repeat at the start of current."""
+    for size in range(min(len(previous), len(current), MAX_CAPTION_OVERLAP_WORDS), MIN_CAPTION_OVERLAP_WORDS - 1, -1):
+        if previous[-size:] == current[:size]:
+            return size
+    return 0
+
+
+def collapse_repeats(lines: Iterable[str], captions: bool = False) -> Iterator[str]:
+    """
+    Collapse the duplicated lines produced by auto-captioning.
+
+    For consecutive lines of the same explicit speaker (or, in a caption file, of
+    no speaker), blank lines aside:
+    - exact repeats are dropped
+    - a line that the next line starts with, as with rolling captions, is dropped
+      in favour of the longer line
+    - in a caption file, words that the next line repeats from the end of the
+      previous one are trimmed from the next line, if both lines have the same
+      explicit speaker label
+
+    Args:
+        lines: Lines to collapse
+        captions: Whether the document is a caption file (see is_caption_transcript)
+    """
+    previous = None
+    previous_speaker = None
+    previous_key = ""
+    held_blank = False
+
+    for line in lines:
+        if not line:
+            if previous is None:
+                yield line
+            else:
+                held_blank = True
+            continue
+
+        speaker, content = split_speaker(line)
+        key = _comparable(content)
+        same_speaker = speaker == previous_speaker and (speaker is not None or captions)
+        if previous is not None and same_speaker and key and previous_key:
+            if _extends(previous_key, key):
+                continue
+            if _extends(key, previous_key):
+                previous, previous_key = line, key
+                continue
+            overlap = 0
+            if captions and speaker is not None:
+                overlap = _caption_overlap(previous_key.split(), key.split())
+            if overlap:
+                content = " ".join(content.split()[overlap:])
+                line = f"{speaker}: {content}"
+                key = _comparable(content)
+
+        if previous is not None:
+            yield previous
+            if held_blank:
+                yield ""
+        held_blank = False
+        previous, previous_speaker, previous_key = line, speaker, key
+
+    if previous is not None:
+        yield previous
+
+
+def merge_turns(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Merge consecutive lines of the same speaker into one turn, so each label appears once.
+
+    Lines whose content is a list item ("- ...", "1. ...") are kept as separate lines.
+    """
+    speaker = None
+    parts: List[str] = []
+    held_blank = False
+
+    for line in lines:
+        if not line:
+            if parts:
+                held_blank = True
+            else:
+                yield line
+            continue
+
+        line_speaker, content = split_speaker(line)
+        list_item = LIST_ITEM_PATTERN.match(content) is not None
+        if parts and line_speaker is not None and line_speaker == speaker and content and not list_item:
+            parts.append(content)
+            held_blank = False
+            continue
+
+        if parts:
+            yield f"{speaker}: {' '.join(parts)}"
+            parts = []
+        if held_blank:
+            yield ""
+            held_blank = False
+
+        if line_speaker is not None and content and not list_item:
+            speaker, parts = line_speaker, [content]
+        else:
+            speaker = None
+            yield line
+
+    if parts:
+        yield f"{speaker}: {' '.join(parts)}"
+
+
+# Stages in the order they run; later stages rely on the output of earlier ones
+STAGES: Dict[str, Stage] = {
+    "whitespace": normalize_whitespace,
+    "captions": strip_caption_metadata,
+    "timestamps": strip_timestamps,
+    "speakers": normalize_speakers,
+    "markers": strip_markers,
+    "fillers": strip_fillers,
+    "repeats": collapse_repeats,
+    "turns": merge_turns,
+}
+
+
+def build_pipeline(stage_names: Sequence[str], captions: bool = False,
+                   transcript: bool = False) -> List[Stage]:
+    """
+    Look up compaction stages by name, keeping them in pipeline order.
+
+    Args:
+        stage_names: Names of the stages to run
+        captions: Whether the document is a caption file, which enables caption overlap trimming
+        transcript: Whether the document is a transcript (see is_transcript); the
+            TRANSCRIPT_STAGES are skipped otherwise
+
+    Returns:
+        List[Stage]: Stage generators in the order they run
+
+    Raises:
+        ValueError: If a stage name is unknown
+    """
+    unknown = [name for name in stage_names if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown compaction stage(s): {', '.join(unknown)}. Choose from {', '.join(STAGES)}")
+    return [
+        partial(stage, captions=captions) if stage is collapse_repeats else stage
+        for name, stage in STAGES.items()
+        if name in stage_names and (transcript or captions or name not in TRANSCRIPT_STAGES)
+    ]
+
+
+def _squeeze_blank_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Drop leading, trailing and repeated blank lines left behind by removed lines."""
+    pending_blank = False
+    started = False
+    for line in lines:
+        if not line.strip():
+            pending_blank = started
+            continue
+        if pending_blank:
+            yield ""
+            pending_blank = False
+        started = True
+        yield line
+
+
+def compact_lines(lines: Iterable[str], stages: Sequence[Stage]) -> Iterator[str]:
+    """Chain stage generators over a stream of lines."""
+    stream: Iterable[str] = lines
+    for stage in stages:
+        stream = stage(stream)
+    return _squeeze_blank_lines(stream)
+
+
+def compact_text(text: str, stage_names: Sequence[str]) -> Tuple[str, Dict[str, int]]:
+    """
+    Compact a document and measure the reduction.
+
+    Speaker labels are only normalized and merged in documents detected as transcripts.
+
+    Args:
+        text: Extracted document text
+        stage_names: Names of the stages to run
+
+    Returns:
+        Tuple[str, Dict[str, int]]: Compacted text, and chars_before, chars_after,
+            tokens_before and tokens_after
+
+    Raises:
+        ValueError: If a stage name is unknown
+    """
+    captions = is_caption_transcript(text)
+    stages = build_pipeline(stage_names, captions=captions, transcript=captions or is_transcript(text))
+    compacted = "\n".join(compact_lines(text.splitlines(), stages))
+    if compacted:
+        compacted += "\n"
+    return compacted, {
+        "chars_before": len(text),
+        "chars_after": len(compacted),
+        "tokens_before": estimate_tokens(text),
+        "tokens_after": estimate_tokens(compacted),
+    }
@@ -0,0 +1,138 @@
+"""
+Response Compression Module.
+ASGI middleware that compresses JSON and text responses with brotli or gzip,
+negotiated from the request's Accept-Encoding, once they are large enough for
+compression to pay off. Brotli is used when the optional brotli package is installed.
+"""
+
+import gzip
+from typing import List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# Content types worth compressing; event streams are excluded so events are not held back
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+
+def parse_accept_encoding(value: str) -> List[Tuple[str, float]]:
+    """
+    Parse an Accept-Encoding header into (coding, quality) pairs.
+
+    Args:
+        value: Header value, e.g. "br;q=1.0, gzip;q=0.8, *;q=0.1"
+
+    Returns:
+        List[Tuple[str, float]]: Lowercase codings and their q-values
+    """
+    codings = []
+    for item in value.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, number = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        codings.append((coding.strip().lower(), quality))
+    return codings
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that compresses complete JSON and text response bodies.
+
+    Only responses sent as a single body are compressed; streamed responses such
+    as Server-Sent Events pass through unchanged so each event is delivered as soon
+    as it is produced.
+    """
+
+    def __init__(self, app, minimum_size: int, gzip_level: int = 5, brotli_quality: int = 4):
+        """
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Bodies smaller than this many bytes are sent uncompressed
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: Brotli quality (0-11)
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def choose_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Pick "br" or "gzip" from an Accept-Encoding header, or None to send the body as is."""
+        qualities = dict(parse_accept_encoding(accept_encoding))
+        wildcard = qualities.get("*", 0.0)
+        candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+        best, best_quality = None, 0.0
+        for coding in candidates:
+            quality = qualities.get(coding, wildcard)
+            if quality > best_quality:
+                best, best_quality = coding, quality
+        return best
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        """Compress a body with the chosen encoding."""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level)
+
+    def _compressible(self, start_message, body: bytes) -> bool:
+        """Check whether a complete response should be compressed."""
+        if len(body) < self.minimum_size or start_message["status"] in (204, 304):
+            return False
+        headers = Headers(raw=start_message["headers"])
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        if content_type.startswith(UNCOMPRESSED_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def compressing_send(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Held back until the body shows whether it will be compressed
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or not self._compressible(start, body):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = self.compress(encoding, body)
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, compressing_send)
@@ -4,10 +4,31 @@ Contains all configurable constants and settings used across the application.
 """
 
 import os
-from dotenv import load_dotenv
+
+
+def _load_dotenv() -> None:
+    """
+    Load environment variables from the nearest .env file, searching up from this directory.
+
+    python-dotenv is only imported when there is a file to load, so deployments that
+    set their environment directly (e.g. serverless) skip it on cold start.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        path = os.path.join(directory, ".env")
+        if os.path.isfile(path):
+            from dotenv import load_dotenv
+            load_dotenv(path)
+            return
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return
+        directory = parent
+
 
 # Load environment variables from .env file
-load_dotenv()
+if os.getenv("DOTENV_DISABLED", "false").lower() != "true":
+    _load_dotenv()
 
 class Config:
     """Application configuration settings."""
@@ -24,10 +45,82 @@ class Config:
     API_VERSION = "1.0.0"
 
     # File upload settings
-    UPLOAD_FOLDER = 'temp'
+    UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "temp")  # Spool files, caches, job queue and analysis store
     ALLOWED_EXTENSIONS = {'txt', 'pdf', 'docx'}
     MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB max file size
     MAX_FILE_SIZE_MB = MAX_FILE_SIZE // (1024 * 1024)
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "50"))  # Files per batch request, including archive members
+    BATCH_MAX_ARCHIVE_SIZE = 100 * 1024 * 1024  # 100MB max .zip size for batch uploads
+    UPLOAD_SPOOL_FOLDER = os.path.join(UPLOAD_FOLDER, "spool")  # Uploads are streamed here while analyzed
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # Uploads are copied in chunks of this size
+    UPLOAD_SPOOL_MAX_AGE_SECONDS = 3600  # Spool files older than this are swept at startup
+    # Request body limits, with room for multipart framing around the files
+    MAX_REQUEST_SIZE = MAX_FILE_SIZE + 1024 * 1024
+    BATCH_MAX_REQUEST_SIZE = BATCH_MAX_ARCHIVE_SIZE + 1024 * 1024
+
+    # Concurrency settings
+    ANALYSIS_THREAD_WORKERS = int(os.getenv("ANALYSIS_THREAD_WORKERS", "8"))  # I/O-bound Gemini calls
+    EXTRACTION_PROCESS_WORKERS = int(os.getenv("EXTRACTION_PROCESS_WORKERS", "2"))  # CPU-bound PDF parsing, 0 = use threads
+    MAX_CONCURRENT_ANALYSES = int(os.getenv("MAX_CONCURRENT_ANALYSES", "4"))  # In-flight analyses per server worker
+
+    # Analysis result cache settings
+    RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() == "true"
+    RESULT_CACHE_PATH = os.path.join(UPLOAD_FOLDER, "analysis_cache.sqlite3")
+    RESULT_CACHE_MEMORY_ITEMS = int(os.getenv("RESULT_CACHE_MEMORY_ITEMS", "256"))  # In-memory LRU entries
+    RESULT_CACHE_MAX_DISK_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_DISK_ENTRIES", "10000"))
+    RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 0 = never expire
+
+    # PDF extraction settings
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))  # Shorter PDFs are extracted in one task
+    PDF_PAGES_PER_TASK = int(os.getenv("PDF_PAGES_PER_TASK", "8"))  # Minimum pages per pool task
+    PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0"))  # Pages extracted per PDF, 0 = all
+    PDF_SLOW_PAGE_SECONDS = float(os.getenv("PDF_SLOW_PAGE_SECONDS", "2.0"))  # Log pages slower than this, 0 = off
+
+    # Extracted text cache settings, independent of the model and prompt
+    EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+    EXTRACTION_CACHE_PATH = os.path.join(UPLOAD_FOLDER, "extraction_cache.sqlite3")
+    EXTRACTION_CACHE_MEMORY_ITEMS = int(os.getenv("EXTRACTION_CACHE_MEMORY_ITEMS", "64"))  # In-memory LRU entries
+    EXTRACTION_CACHE_MAX_DISK_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_DISK_ENTRIES", "5000"))
+    EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 0 = never expire
+
+    # Transcript compaction settings (applied between text extraction and the prompt)
+    COMPACTION_ENABLED = os.getenv("COMPACTION_ENABLED", "true").lower() == "true"
+    COMPACTION_STAGES = [
+        stage.strip() for stage in
+        os.getenv("COMPACTION_STAGES", "whitespace,captions,timestamps,speakers,markers,fillers,repeats,turns").split(",")
+        if stage.strip()
+    ]
+
+    # Chunked analysis settings for long transcripts
+    CHUNKED_ANALYSIS_ENABLED = os.getenv("CHUNKED_ANALYSIS_ENABLED", "true").lower() == "true"
+    CHUNKING_THRESHOLD_CHARS = int(os.getenv("CHUNKING_THRESHOLD_CHARS", "60000"))  # Documents above this are chunked
+    CHUNK_SIZE_CHARS = int(os.getenv("CHUNK_SIZE_CHARS", "40000"))
+    CHUNK_OVERLAP_CHARS = int(os.getenv("CHUNK_OVERLAP_CHARS", "2000"))
+    CHUNK_PARALLELISM = int(os.getenv("CHUNK_PARALLELISM", "4"))  # Concurrent chunk analyses per document
+
+    # Incremental re-analysis of revised documents (needs the result cache)
+    INCREMENTAL_ANALYSIS_ENABLED = os.getenv("INCREMENTAL_ANALYSIS_ENABLED", "false").lower() == "true"
+    INCREMENTAL_MIN_CHARS = int(os.getenv("INCREMENTAL_MIN_CHARS", "8000"))  # Shorter documents are analyzed whole
+    INCREMENTAL_CHUNK_CHARS = int(os.getenv("INCREMENTAL_CHUNK_CHARS", "6000"))  # Average content-defined chunk size
+    REVISION_INDEX_PATH = os.path.join(UPLOAD_FOLDER, "revisions.sqlite3")
+    REVISION_MAX_DOCUMENTS = int(os.getenv("REVISION_MAX_DOCUMENTS", "10000"))
+
+    # Background job settings
+    JOB_QUEUE_PATH = os.path.join(UPLOAD_FOLDER, "jobs.sqlite3")
+    JOB_STORAGE_FOLDER = os.path.join(UPLOAD_FOLDER, "jobs")  # Uploads are kept here until their job finishes
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))  # Worker processes per server, 0 = run jobs.py separately
+    JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "120"))  # Jobs not renewed within this are requeued
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+
+    # Response compression (brotli when the brotli package is installed, else gzip)
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))  # Smaller responses are sent as is
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+    # Import extractors and the model SDK at startup instead of on first use (long-running servers)
+    PRELOAD_ON_STARTUP = os.getenv("PRELOAD_ON_STARTUP", "false").lower() == "true"
 
     # CORS settings
     CORS_ORIGINS = ["*"]  # Configure appropriately for production
@@ -37,6 +130,59 @@ class Config:
 
     # External API settings
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")  # "gemini" or "mock" (offline load testing)
+
+    # Mock backend settings (LLM_BACKEND=mock)
+    MOCK_SEED = int(os.getenv("MOCK_SEED", "0"))
+    MOCK_PROCESS_COUNT = os.getenv("MOCK_PROCESS_COUNT", "3")  # Count or inclusive range, e.g. "2-6"
+    MOCK_RESPONSE_CHARS = int(os.getenv("MOCK_RESPONSE_CHARS", "6000"))  # Approximate response length
+    MOCK_LATENCY_DISTRIBUTION = os.getenv("MOCK_LATENCY_DISTRIBUTION", "lognormal")  # fixed, uniform, normal, lognormal, exponential
+    MOCK_LATENCY_MEAN_MS = float(os.getenv("MOCK_LATENCY_MEAN_MS", "1500"))
+    MOCK_LATENCY_STDDEV_MS = float(os.getenv("MOCK_LATENCY_STDDEV_MS", "500"))
+    MOCK_STREAM_CHUNK_CHARS = int(os.getenv("MOCK_STREAM_CHUNK_CHARS", "256"))
+    MOCK_FIRST_CHUNK_FRACTION = float(os.getenv("MOCK_FIRST_CHUNK_FRACTION", "0.3"))  # Share of latency before the first chunk
+    MOCK_ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))  # Probability a call fails
+    MOCK_ERROR_CODES = [int(code) for code in os.getenv("MOCK_ERROR_CODES", "429,503").split(",") if code.strip()]
+
+    # Gemini call settings (limits apply per server process)
+    MODEL_RATE_LIMIT_PER_MINUTE = float(os.getenv("MODEL_RATE_LIMIT_PER_MINUTE", "60"))  # 0 disables the rate limiter
+    MODEL_RATE_BURST = int(os.getenv("MODEL_RATE_BURST", "10"))  # Calls allowed back to back after an idle period
+    MODEL_CONCURRENCY_INITIAL = int(os.getenv("MODEL_CONCURRENCY_INITIAL", "8"))
+    MODEL_CONCURRENCY_MIN = int(os.getenv("MODEL_CONCURRENCY_MIN", "1"))
+    MODEL_CONCURRENCY_MAX = int(os.getenv("MODEL_CONCURRENCY_MAX", "16"))
+    MODEL_CALL_DEADLINE_SECONDS = float(os.getenv("MODEL_CALL_DEADLINE_SECONDS", "120"))  # Waiting and retries included
+    MODEL_MAX_RETRIES = int(os.getenv("MODEL_MAX_RETRIES", "5"))
+    MODEL_RETRY_BASE_SECONDS = float(os.getenv("MODEL_RETRY_BASE_SECONDS", "1.0"))
+    MODEL_RETRY_MAX_SECONDS = float(os.getenv("MODEL_RETRY_MAX_SECONDS", "30.0"))
+    MODEL_COALESCING_ENABLED = os.getenv("MODEL_COALESCING_ENABLED", "true").lower() == "true"
+
+    # Parser settings
+    PARSER_ENGINE = os.getenv("PARSER_ENGINE", "incremental")  # "incremental" (single pass) or "regex"
+    PARSE_TIME_BUDGET_SECONDS = float(os.getenv("PARSE_TIME_BUDGET_SECONDS", "5"))  # 0 disables the budget
+    ANALYSIS_OUTPUT_FORMAT = os.getenv("ANALYSIS_OUTPUT_FORMAT", "text")  # "text" (parsed) or "json" (validated)
+
+    # Analysis store (successful analyses and their processes, queried through /api/processes)
+    STORE_ENABLED = os.getenv("STORE_ENABLED", "true").lower() == "true"
+    STORE_PATH = os.path.join(UPLOAD_FOLDER, "analyses.sqlite3")
+    STORE_BATCH_SIZE = int(os.getenv("STORE_BATCH_SIZE", "100"))  # Analyses per write transaction
+    STORE_FLUSH_INTERVAL_SECONDS = float(os.getenv("STORE_FLUSH_INTERVAL_SECONDS", "0.5"))  # Max write delay
+    STORE_MAX_PENDING = int(os.getenv("STORE_MAX_PENDING", "10000"))  # Further analyses are not stored
+    PROCESS_PAGE_MAX_SIZE = int(os.getenv("PROCESS_PAGE_MAX_SIZE", "200"))
+
+    # Clustering of recurring processes across stored analyses (MinHash + LSH)
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "96"))  # MinHash signature length
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "32"))  # LSH bands; must divide DEDUP_NUM_PERM
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.45"))  # Similarity needed to join a cluster
+    DEDUP_MAX_BUCKET_CANDIDATES = int(os.getenv("DEDUP_MAX_BUCKET_CANDIDATES", "8"))  # Compared per band
+
+    # Per-request profiling of /api/analyze (disabled while PROFILING_TOKEN is empty)
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")  # Sent as X-Profile-Token header or ?profile= to profile a request
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "10"))  # Stack sampling interval
+    PROFILING_MAX_SECONDS = float(os.getenv("PROFILING_MAX_SECONDS", "300"))  # Sampling stops after this long
+    PROFILING_MAX_CONCURRENT = int(os.getenv("PROFILING_MAX_CONCURRENT", "1"))  # Further requests run unprofiled
+    PROFILING_FOLDER = os.path.join(UPLOAD_FOLDER, "profiles")  # Collapsed stacks, one file per request id
 
     # Default analysis values
     DEFAULT_CONFIDENCE = 85
@@ -53,7 +199,7 @@ class Config:
     @classmethod
     def validate_config(cls) -> bool:
         """Validate that required configuration is present."""
-        if not cls.GEMINI_API_KEY:
+        if not cls.GEMINI_API_KEY and cls.LLM_BACKEND != "mock":
             return False
         return True
 
@@ -0,0 +1,278 @@
+"""
+Process Deduplication Module.
+Groups the processes of stored analyses into clusters of the same recurring process
+(e.g. "Weekly sprint planning" extracted again from every meeting of a series).
+Each process is reduced to a MinHash signature over its name, function and workflow
+actions, and the signature's bands are indexed in SQLite (locality-sensitive
+hashing). A new process is compared only with the processes sharing one of its
+bands, so linking it to a cluster does not depend on how many processes are stored.
+"""
+
+import random
+import re
+import sqlite3
+from array import array
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from models import BusinessProcess
+from config import config
+
+# Tables of the cluster index, kept in the analysis store's database
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS process_clusters ("
+    "id INTEGER PRIMARY KEY, name TEXT NOT NULL, function TEXT NOT NULL, canonical_row INTEGER NOT NULL, "
+    "size INTEGER NOT NULL, created_at REAL NOT NULL, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_clusters_size ON process_clusters (size, id)",
+    "CREATE INDEX IF NOT EXISTS idx_clusters_function ON process_clusters (function, size, id)",
+    "CREATE TABLE IF NOT EXISTS process_bands ("
+    "band INTEGER NOT NULL, bucket INTEGER NOT NULL, process_row INTEGER NOT NULL, "
+    "PRIMARY KEY (band, bucket, process_row)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS dedup_settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+STOP_WORDS = frozenset((
+    "a", "an", "and", "the", "to", "of", "in", "on", "for", "by", "with", "from", "into",
+    "it", "its", "is", "are", "be", "as", "at", "or", "then", "their", "them", "this", "that",
+))
+
+
+def _hash64(value: str) -> int:
+    """Stable 64-bit hash of a string (Python's hash() differs between processes)."""
+    return int.from_bytes(blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in re.findall(r"[a-z0-9]+", text.lower()) if word not in STOP_WORDS]
+
+
+def process_features(process: BusinessProcess) -> List[str]:
+    """
+    Reduce a process to the set of features its similarity is measured on.
+
+    The name contributes character trigrams, so reworded or re-punctuated names
+    ("Sprint planning" / "Sprint-planning session") still overlap; the function and
+    the words of the workflow actions contribute one feature each.
+
+    Args:
+        process: Process to describe
+
+    Returns:
+        List[str]: Distinct features
+    """
+    name = " ".join(_words(process.name))
+    features = {f"n:{name[i:i + 3]}" for i in range(max(1, len(name) - 2))}
+    features.add(f"f:{process.function.strip().lower()}")
+    for step in process.workflow:
+        features.update(f"a:{word}" for word in _words(step.action))
+    return sorted(features)
+
+
+class MinHasher:
+    """MinHash signatures and their LSH bands."""
+
+    def __init__(self, num_perm: int, bands: int, seed: int = 1):
+        """
+        Args:
+            num_perm: Signature length; must be a multiple of bands
+            bands: Number of LSH bands the signature is split into
+            seed: Seed of the hash permutations; signatures are only comparable for the same seed
+        """
+        if bands < 1 or num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._permutations = [
+            (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(num_perm)
+        ]
+
+    def signature(self, features: Sequence[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a feature set."""
+        hashes = [_hash64(feature) for feature in features] or [0]
+        return tuple(
+            min((a * value + b) % MERSENNE_PRIME for value in hashes) & MAX_HASH
+            for a, b in self._permutations
+        )
+
+    def band_buckets(self, signature: Sequence[int]) -> List[int]:
+        """Hash each band of a signature to a signed 64-bit bucket id (an SQLite INTEGER)."""
+        buckets = []
+        for band in range(self.bands):
+            rows = array("I", signature[band * self.rows:(band + 1) * self.rows]).tobytes()
+            buckets.append(int.from_bytes(blake2b(rows, digest_size=8).digest(), "big", signed=True))
+        return buckets
+
+    @staticmethod
+    def similarity(first: Sequence[int], second: Sequence[int]) -> float:
+        """Estimate the Jaccard similarity of two feature sets from their signatures."""
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+    @staticmethod
+    def pack(signature: Sequence[int]) -> bytes:
+        return array("I", signature).tobytes()
+
+    @staticmethod
+    def unpack(data: bytes) -> Tuple[int, ...]:
+        return tuple(array("I", data))
+
+
+class ProcessClusterIndex:
+    """Assigns stored processes to clusters, using LSH bands to find candidate matches."""
+
+    def __init__(self, num_perm: int, bands: int, threshold: float, max_bucket_candidates: int):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: MinHash signature length
+            bands: LSH bands per signature
+            threshold: Least estimated similarity at which a process joins a cluster
+            max_bucket_candidates: Most recent processes compared per shared band
+        """
+        self.hasher = MinHasher(num_perm, bands)
+        self.threshold = threshold
+        self.max_bucket_candidates = max(1, max_bucket_candidates)
+
+    def settings(self) -> Dict[str, str]:
+        """Settings stored signatures and buckets depend on."""
+        return {"num_perm": str(self.hasher.num_perm), "bands": str(self.hasher.bands)}
+
+    def prepare(self, conn: sqlite3.Connection) -> None:
+        """
+        Create the index tables and drop an index built with different settings.
+
+        Processes whose cluster was dropped are re-indexed by the store's writer.
+        """
+        for statement in SCHEMA:
+            conn.execute(statement)
+        stored = dict(conn.execute("SELECT name, value FROM dedup_settings").fetchall())
+        settings = self.settings()
+        if stored and stored != settings:
+            print("Process index settings changed; rebuilding process clusters")
+            conn.execute("DELETE FROM process_clusters")
+            conn.execute("DELETE FROM process_bands")
+            conn.execute("UPDATE processes SET cluster_id = NULL, signature = NULL")
+        if stored != settings:
+            conn.execute("DELETE FROM dedup_settings")
+            conn.executemany("INSERT INTO dedup_settings (name, value) VALUES (?, ?)", settings.items())
+        conn.commit()
+
+    def sign(self, process: BusinessProcess) -> Tuple[Tuple[int, ...], List[int]]:
+        """Compute a process's signature and band buckets."""
+        signature = self.hasher.signature(process_features(process))
+        return signature, self.hasher.band_buckets(signature)
+
+    def find_cluster(self, conn: sqlite3.Connection, signature: Sequence[int],
+                     buckets: Sequence[int]) -> Optional[Tuple[int, float]]:
+        """
+        Find the cluster of the most similar indexed process.
+
+        Args:
+            conn: Connection to the store
+            signature: Signature of the process to place
+            buckets: Its band buckets
+
+        Returns:
+            Optional[Tuple[int, float]]: Cluster id and estimated similarity, or None
+                if no indexed process reaches the threshold
+        """
+        candidates = set()
+        for band, bucket in enumerate(buckets):
+            rows = conn.execute(
+                "SELECT process_row FROM process_bands WHERE band = ? AND bucket = ? "
+                "ORDER BY process_row DESC LIMIT ?",
+                (band, bucket, self.max_bucket_candidates)
+            ).fetchall()
+            candidates.update(row for (row,) in rows)
+        if not candidates:
+            return None
+
+        placeholders = ",".join("?" * len(candidates))
+        best = None
+        for cluster_id, packed in conn.execute(
+            f"SELECT cluster_id, signature FROM processes WHERE id IN ({placeholders}) "
+            "AND cluster_id IS NOT NULL", tuple(candidates)
+        ):
+            similarity = self.hasher.similarity(signature, self.hasher.unpack(packed))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (cluster_id, similarity)
+        return best
+
+    def assign(self, conn: sqlite3.Connection, process_row: int, process: BusinessProcess,
+               created_at: float) -> int:
+        """
+        Index a stored process and link it to its cluster, starting a new cluster if none matches.
+
+        Must run inside the store's write transaction.
+
+        Args:
+            conn: Connection to the store
+            process_row: Row id of the process in the processes table
+            process: The process
+            created_at: Unix time the process was stored
+
+        Returns:
+            int: Cluster id
+        """
+        signature, buckets = self.sign(process)
+        match = self.find_cluster(conn, signature, buckets)
+        if match is None:
+            cluster_id = conn.execute(
+                "INSERT INTO process_clusters (name, function, canonical_row, size, created_at, updated_at) "
+                "VALUES (?, ?, ?, 1, ?, ?)",
+                (process.name, process.function, process_row, created_at, created_at)
+            ).lastrowid
+        else:
+            cluster_id = match[0]
+            conn.execute(
+                "UPDATE process_clusters SET size = size + 1, updated_at = ? WHERE id = ?",
+                (created_at, cluster_id)
+            )
+        conn.execute(
+            "UPDATE processes SET cluster_id = ?, signature = ? WHERE id = ?",
+            (cluster_id, self.hasher.pack(signature), process_row)
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO process_bands (band, bucket, process_row) VALUES (?, ?, ?)",
+            [(band, bucket, process_row) for band, bucket in enumerate(buckets)]
+        )
+        return cluster_id
+
+    def match(self, conn: sqlite3.Connection,
+              processes: List[BusinessProcess]) -> List[Dict[str, Any]]:
+        """
+        Link processes that are not stored (e.g. of a new analysis) to existing clusters.
+
+        Args:
+            conn: Connection to the store
+            processes: Processes to place
+
+        Returns:
+            List[Dict[str, Any]]: Per process, its id and name, and the cluster id, cluster
+                name and similarity (None when no cluster matches)
+        """
+        matches = []
+        for process in processes:
+            signature, buckets = self.sign(process)
+            found = self.find_cluster(conn, signature, buckets)
+            match = {"process_id": process.id, "name": process.name,
+                     "cluster_id": None, "cluster_name": None, "similarity": None}
+            if found is not None:
+                row = conn.execute("SELECT name FROM process_clusters WHERE id = ?", (found[0],)).fetchone()
+                match.update(cluster_id=found[0], cluster_name=row[0] if row else None,
+                             similarity=round(found[1], 3))
+            matches.append(match)
+        return matches
+
+
+# Create a global process cluster index instance
+process_index = ProcessClusterIndex(
+    num_perm=config.DEDUP_NUM_PERM,
+    bands=config.DEDUP_BANDS,
+    threshold=config.DEDUP_THRESHOLD,
+    max_bucket_candidates=config.DEDUP_MAX_BUCKET_CANDIDATES
+)
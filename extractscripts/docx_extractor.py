@@ -0,0 +1,131 @@
+"""
+DOCX Extraction Module.
+Streams text out of a DOCX file by reading word/document.xml straight from the zip
+archive with an incremental XML parser, instead of building the full python-docx
+object model. Paragraphs and table rows are yielded in document order, and every
+element is discarded as soon as it has been read, so memory use depends on the
+nesting depth of the document rather than its size.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator, List, Union
+
+DOCUMENT_PART = "word/document.xml"
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Run content other than w:t that stands for a character, as python-docx renders it
+RUN_CHARACTERS = {
+    f"{W}tab": "\t",
+    f"{W}ptab": "\t",
+    f"{W}cr": "\n",
+    f"{W}noBreakHyphen": "-",
+}
+
+# Table cells are joined with this separator, one table row per line
+CELL_SEPARATOR = "\t"
+
+
+class _TableState:
+    """Cells of the table row currently being read."""
+
+    def __init__(self):
+        self.row: List[str] = []
+        self.cell: List[str] = []
+
+
+def iter_docx_text(source: Union[str, BinaryIO]) -> Iterator[str]:
+    """
+    Yield the text of a DOCX document in document order, one newline-terminated
+    line per paragraph or table row.
+
+    Body paragraphs are yielded exactly as python-docx renders paragraph.text.
+    Each table row becomes one line of its cells' text separated by tabs, with
+    the paragraphs of a cell joined by spaces; rows of nested tables are folded
+    into the enclosing cell.
+
+    Args:
+        source: Path to the DOCX file or a seekable binary stream
+
+    Yields:
+        str: Lines of text
+
+    Raises:
+        Exception: If the file is not a readable DOCX document
+    """
+    try:
+        with zipfile.ZipFile(source) as archive, archive.open(DOCUMENT_PART) as document:
+            yield from _iter_document_lines(document)
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError) as e:
+        raise Exception(f"Error reading DOCX file: {str(e)}")
+
+
+def _iter_document_lines(document: BinaryIO) -> Iterator[str]:
+    """Parse word/document.xml incrementally, yielding lines as they complete."""
+    elements = []    # Path from the root to the element being parsed
+    paragraphs: List[List[str]] = []    # Text pieces of the open paragraphs
+    tables: List[_TableState] = []
+
+    for event, element in ET.iterparse(document, events=("start", "end")):
+        tag = element.tag
+
+        if event == "start":
+            elements.append(element)
+            if tag == f"{W}p":
+                paragraphs.append([])
+            elif tag == f"{W}tbl":
+                tables.append(_TableState())
+            elif tag == f"{W}tr" and tables:
+                tables[-1].row = []
+            elif tag == f"{W}tc" and tables:
+                tables[-1].cell = []
+            continue
+
+        if tag == f"{W}t":
+            if paragraphs:
+                paragraphs[-1].append(element.text or "")
+        elif tag in RUN_CHARACTERS:
+            if paragraphs:
+                paragraphs[-1].append(RUN_CHARACTERS[tag])
+        elif tag == f"{W}br":
+            # Page and column breaks do not break the line of text
+            if paragraphs and element.get(f"{W}type", "textWrapping") == "textWrapping":
+                paragraphs[-1].append("\n")
+        elif tag == f"{W}p":
+            text = "".join(paragraphs.pop())
+            if tables:
+                tables[-1].cell.append(text)
+            else:
+                yield text + "\n"
+        elif tag == f"{W}tc" and tables:
+            tables[-1].row.append(" ".join(text for text in tables[-1].cell if text))
+        elif tag == f"{W}tr" and tables:
+            line = CELL_SEPARATOR.join(tables[-1].row)
+            if len(tables) > 1:
+                tables[-2].cell.append(line)
+            else:
+                yield line + "\n"
+        elif tag == f"{W}tbl" and tables:
+            tables.pop()
+
+        # Drop the finished element so the tree never holds more than the current path
+        elements.pop()
+        if elements:
+            elements[-1].remove(element)
+        element.clear()
+
+
+def extract_docx_text(source: Union[str, BinaryIO]) -> str:
+    """
+    Extract the text of a DOCX document, including its tables.
+
+    Args:
+        source: Path to the DOCX file or a seekable binary stream
+
+    Returns:
+        str: Extracted text, one line per paragraph or table row
+
+    Raises:
+        Exception: If the file is not a readable DOCX document
+    """
+    return "".join(iter_docx_text(source))
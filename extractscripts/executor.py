@@ -0,0 +1,120 @@
+"""
+Analysis Executor Module.
+Runs blocking extraction and model calls off the asyncio event loop with bounded concurrency.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Optional
+from profiling import bind, current_session
+from config import config
+
+
+class AnalysisExecutor:
+    """Worker pools for I/O-bound model calls and CPU-bound document parsing."""
+
+    def __init__(self, thread_workers: int, process_workers: int, max_in_flight: int, chunk_workers: int = 4):
+        """
+        Initialize the executor. Pools are created lazily on first use.
+
+        Args:
+            thread_workers: Size of the thread pool used for I/O-bound work
+            process_workers: Size of the process pool used for CPU-bound work (0 disables it)
+            max_in_flight: Maximum number of analyses running concurrently in this worker
+            chunk_workers: Size of the thread pool used for per-chunk model calls
+        """
+        self.thread_workers = max(1, thread_workers)
+        self.process_workers = max(0, process_workers)
+        self.max_in_flight = max(1, max_in_flight)
+        self.chunk_workers = max(1, chunk_workers)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._chunk_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        """Thread pool for I/O-bound work such as Gemini calls."""
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(
+                max_workers=self.thread_workers,
+                thread_name_prefix="analysis-io"
+            )
+        return self._thread_pool
+
+    @property
+    def chunk_pool(self) -> ThreadPoolExecutor:
+        """
+        Thread pool for the per-chunk model calls of chunked analyses.
+
+        Kept separate from the I/O pool because chunked analyses already run on
+        an I/O thread and wait for their chunks; sharing a pool could deadlock.
+        """
+        if self._chunk_pool is None:
+            self._chunk_pool = ThreadPoolExecutor(
+                max_workers=self.chunk_workers,
+                thread_name_prefix="analysis-chunk"
+            )
+        return self._chunk_pool
+
+    @property
+    def cpu_pool(self) -> Executor:
+        """Process pool for CPU-bound work, or the thread pool if processes are disabled."""
+        if self.process_workers == 0:
+            return self.thread_pool
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+        return self._process_pool
+
+    @asynccontextmanager
+    async def slot(self):
+        """Reserve one of the in-flight analysis slots for the duration of the block."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+
+    async def run_io(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run an I/O-bound callable on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.thread_pool, bind(functools.partial(func, *args, **kwargs)))
+
+    async def run_cpu(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a CPU-bound callable on the process pool.
+
+        The callable and its arguments must be picklable when the process pool is enabled.
+        Profiled requests run it on the thread pool instead, where the profiler can sample it.
+        """
+        if current_session() is not None:
+            return await self.run_io(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.cpu_pool, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        """Shut down all pools, waiting for running work to finish."""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=True)
+            self._process_pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=True)
+            self._thread_pool = None
+        if self._chunk_pool is not None:
+            self._chunk_pool.shutdown(wait=True)
+            self._chunk_pool = None
+
+
+# Create a global executor instance
+analysis_executor = AnalysisExecutor(
+    thread_workers=config.ANALYSIS_THREAD_WORKERS,
+    process_workers=config.EXTRACTION_PROCESS_WORKERS,
+    max_in_flight=config.MAX_CONCURRENT_ANALYSES,
+    chunk_workers=config.MAX_CONCURRENT_ANALYSES * config.CHUNK_PARALLELISM
+)
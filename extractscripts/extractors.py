@@ -0,0 +1,130 @@
+"""
+Extractor Registry Module.
+Maps file extensions to the text extractors that handle them. Extractor modules,
+and the libraries they depend on such as PyPDF2, are imported the first time a file
+of their type is extracted, so starting the server or serving TXT uploads never
+pays for them.
+"""
+
+import importlib
+import io
+import threading
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+from config import config
+
+
+def _decode_text(content: bytes) -> str:
+    return content.decode('utf-8', errors='replace')
+
+
+def _read_text_file(file_path: str) -> str:
+    with open(file_path, 'rb') as f:
+        return _decode_text(f.read())
+
+
+def _pdf_from_file(pdf_extractor: ModuleType, file_path: str) -> str:
+    return pdf_extractor.extract_pdf_file(file_path, config.PDF_MAX_PAGES).text
+
+
+def _pdf_from_bytes(pdf_extractor: ModuleType, content: bytes) -> str:
+    return pdf_extractor.extract_pdf_stream(io.BytesIO(content), config.PDF_MAX_PAGES).text
+
+
+def _docx_from_file(docx_extractor: ModuleType, file_path: str) -> str:
+    return docx_extractor.extract_docx_text(file_path)
+
+
+def _docx_from_bytes(docx_extractor: ModuleType, content: bytes) -> str:
+    return docx_extractor.extract_docx_text(io.BytesIO(content))
+
+
+class ExtractorEntry:
+    """How to extract text from one file type."""
+
+    def __init__(self, module: Optional[str],
+                 from_file: Callable[..., str], from_bytes: Callable[..., str]):
+        """
+        Args:
+            module: Module imported on first use and passed as the first argument
+                of both functions, or None for extractors without dependencies
+            from_file: Extracts the text of a file on disk
+            from_bytes: Extracts the text of file contents held in memory
+        """
+        self.module = module
+        self.from_file = from_file
+        self.from_bytes = from_bytes
+
+
+class ExtractorRegistry:
+    """Text extractors by file extension, imported on first use."""
+
+    def __init__(self):
+        self._entries: Dict[str, ExtractorEntry] = {}
+        self._modules: Dict[str, ModuleType] = {}
+        self._lock = threading.Lock()
+
+    def register(self, extension: str, module: Optional[str],
+                 from_file: Callable[..., str], from_bytes: Callable[..., str]) -> None:
+        """Register the extractor for a lowercase file extension without the dot."""
+        self._entries[extension] = ExtractorEntry(module, from_file, from_bytes)
+
+    @property
+    def extensions(self) -> List[str]:
+        return sorted(self._entries)
+
+    def load(self, extension: str) -> Optional[ModuleType]:
+        """
+        Import the module behind an extension's extractor, if not imported yet.
+
+        Returns:
+            Optional[ModuleType]: The module, or None for extractors without one
+
+        Raises:
+            Exception: If the file type is not supported
+        """
+        entry = self._entry(extension)
+        if entry.module is None:
+            return None
+        module = self._modules.get(entry.module)
+        if module is None:
+            with self._lock:
+                module = self._modules.get(entry.module)
+                if module is None:
+                    module = importlib.import_module(entry.module)
+                    self._modules[entry.module] = module
+        return module
+
+    def preload(self) -> List[str]:
+        """Import every registered extractor module; returns their names."""
+        for extension in self._entries:
+            self.load(extension)
+        return sorted(self._modules)
+
+    def extract_file(self, file_path: str, extension: str) -> str:
+        """Extract the text of a file on disk with the extractor for its extension."""
+        return self._call(extension, "from_file", file_path)
+
+    def extract_bytes(self, content: bytes, extension: str) -> str:
+        """Extract the text of in-memory file contents with the extractor for their extension."""
+        return self._call(extension, "from_bytes", content)
+
+    def _entry(self, extension: str) -> ExtractorEntry:
+        entry = self._entries.get(extension)
+        if entry is None:
+            raise Exception(f"Unsupported file type: {extension}")
+        return entry
+
+    def _call(self, extension: str, kind: str, source) -> str:
+        entry = self._entry(extension)
+        function = getattr(entry, kind)
+        if entry.module is None:
+            return function(source)
+        return function(self.load(extension), source)
+
+
+# Create a global extractor registry with the supported file types
+extractor_registry = ExtractorRegistry()
+extractor_registry.register("txt", None, _read_text_file, _decode_text)
+extractor_registry.register("pdf", "pdf_extractor", _pdf_from_file, _pdf_from_bytes)
+extractor_registry.register("docx", "docx_extractor", _docx_from_file, _docx_from_bytes)
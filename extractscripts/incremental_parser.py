@@ -0,0 +1,466 @@
+"""
+Incremental Business Analysis Parser Module.
+Single-pass, line-by-line state machine that turns AI analysis text into the same
+structured data as BusinessAnalysisParser, while accepting the text in fragments.
+"""
+
+import re
+from enum import Enum
+from typing import List, Optional, Tuple, Type
+from models import (
+    AnalysisResult,
+    BusinessProcess,
+    PriorityLevel,
+    AutomationPotential,
+    PainLevel,
+    ProcessType
+)
+from parser import (
+    BusinessAnalysisParser,
+    DEADLINE_CHECK_INTERVAL,
+    FIELD_TERMINATORS,
+    PAIN_POINT_LABELS,
+    WorkflowStepSplitter,
+    check_parse_deadline,
+    parse_deadline
+)
+from config import config
+
+DELIMITER = "=" * 20
+
+# Process header fully contained in one line, and the tail of a header whose
+# delimiter ended the previous line
+INLINE_HEADER_PATTERN = re.compile(r'={20}\s*PROCESS #\d+:')
+HEADER_TAIL_PATTERN = re.compile(r'\s*PROCESS #\d+:')
+
+PAIN_POINT_KEYWORDS = ['Explicit Issues:', 'Manual Effort:', 'Impact:']
+
+OPPORTUNITY_KEYWORDS = ['AI Opportunities:', 'Digital Transformation:', 'Business Automation:', 'Quick Wins:']
+OPPORTUNITY_LABELS = re.compile(r'(' + '|'.join(OPPORTUNITY_KEYWORDS) + ')')
+
+
+def _trailing_delimiter_start(line: str) -> int:
+    """Return where a delimiter followed only by whitespace starts in the line, or -1."""
+    stripped = line.rstrip()
+    if stripped.endswith(DELIMITER):
+        return len(stripped) - len(DELIMITER)
+    return -1
+
+
+def _to_enum(enum_type: Type[Enum], text: Optional[str], default: str, fallback: Enum) -> Enum:
+    """Convert an extracted value to an enum member, falling back like the regex parser."""
+    try:
+        return enum_type(text if text is not None else default)
+    except ValueError:
+        return fallback
+
+
+class _LabelledValue:
+    """
+    Tracks the first "<label>: <value>" occurrence in a section.
+
+    The value starts at the first non-whitespace character after the label, possibly
+    on a later line, and runs to the end of its line or the first terminator.
+    """
+
+    def __init__(self, label: str, terminators: Tuple[str, ...] = (), allow_end: bool = True):
+        """
+        Args:
+            label: Text that introduces the value
+            terminators: Substrings that end the value early
+            allow_end: Whether the value may end at the end of the section without a newline
+        """
+        self.label = label
+        self.terminators = terminators
+        self.allow_end = allow_end
+        self.value: Optional[str] = None
+        self.done = False
+        # Set once the label has been seen and the value has not started yet
+        self.waiting = False
+        self._gap_spaces = False
+        self._tail_spaces = False
+
+    def locate(self, line: str) -> int:
+        """Return the index just past the label in the line, or -1."""
+        index = line.find(self.label)
+        return index + len(self.label) if index >= 0 else -1
+
+    def feed(self, line: str, terminated: bool) -> None:
+        """Consume one line of the section."""
+        if self.done:
+            return
+        if not self.waiting:
+            start = self.locate(line)
+            if start < 0:
+                if not terminated:
+                    self.done = True
+                return
+            self.waiting = True
+            line = line[start:]
+        self._feed_gap(line, terminated)
+
+    def _feed_gap(self, text: str, terminated: bool) -> None:
+        """Consume text following the label until the value starts."""
+        stripped = text.lstrip()
+        if not stripped:
+            if text and terminated:
+                self._gap_spaces = True
+            elif text:
+                self._tail_spaces = True
+            if not terminated:
+                self._finish_blank(self._has_terminator(text))
+            return
+
+        end = None
+        for terminator in self.terminators:
+            index = stripped.find(terminator, 1)
+            if index >= 0 and (end is None or index < end):
+                end = index
+
+        if end is not None:
+            self.value = stripped[:end].strip()
+        elif terminated or self.allow_end:
+            self.value = stripped.strip()
+        else:
+            self._finish_blank(self._has_terminator(text))
+            return
+        self.done = True
+
+    def _has_terminator(self, text: str) -> bool:
+        """Check whether a terminator follows the first character of the text."""
+        return any(text.find(terminator, 1) >= 0 for terminator in self.terminators)
+
+    def _finish_blank(self, terminated_whitespace: bool = False) -> None:
+        """
+        Resolve a label whose value could not be matched on its own line.
+
+        The value is then empty if some whitespace after the label is followed by a
+        newline or terminator, and unmatched otherwise.
+        """
+        self.done = True
+        if terminated_whitespace or self._gap_spaces or (self.allow_end and self._tail_spaces):
+            self.value = ""
+
+
+class _ProcessLabelledValue(_LabelledValue):
+    """Value introduced by "Process...:" - the fallback process name pattern."""
+
+    def locate(self, line: str) -> int:
+        index = line.find(self.label)
+        if index < 0:
+            return -1
+        colon = line.find(':', index + len(self.label))
+        return colon + 1 if colon >= 0 else -1
+
+
+class _DelimitedName:
+    """Tracks the first non-blank line following a delimiter line - the primary name pattern."""
+
+    label = DELIMITER
+
+    def __init__(self):
+        self.value: Optional[str] = None
+        self.done = False
+        # Set once a delimiter line has been seen and the name line has not
+        self.waiting = False
+        self._gap_spaces = False
+
+    def feed(self, line: str, terminated: bool) -> None:
+        """Consume one line of the section."""
+        if self.done:
+            return
+        if not self.waiting:
+            if not terminated:
+                self.done = True
+            elif _trailing_delimiter_start(line) >= 0:
+                self.waiting = True
+            return
+
+        if not line.strip():
+            if terminated:
+                self._gap_spaces = self._gap_spaces or bool(line)
+                return
+        elif terminated:
+            self.value = line.strip()
+            self.done = True
+            return
+
+        self.done = True
+        if self._gap_spaces:
+            self.value = ""
+
+
+class _Region:
+    """Text between the first start marker and the first end marker after it."""
+
+    def __init__(self, start: str, end: str):
+        self.start = start
+        self.end = end
+        self.opened = False
+        self.closed = False
+
+    def cut(self, line: str) -> Optional[str]:
+        """Return the part of the line inside the region, or None if it has none."""
+        if self.closed:
+            return None
+        if not self.opened:
+            index = line.find(self.start)
+            if index < 0:
+                return None
+            self.opened = True
+            line = line[index + len(self.start):]
+        index = line.find(self.end)
+        if index >= 0:
+            self.closed = True
+            return line[:index]
+        return line
+
+
+class _SectionState:
+    """Parse state for one PROCESS #N section, fed one line at a time."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.delimited_name = _DelimitedName()
+        self.labelled_name = _LabelledValue('Name:', ('Function:',), allow_end=False)
+        self.process_name = _ProcessLabelledValue('Process', ('\r',), allow_end=False)
+        self.function = _LabelledValue('Function:', FIELD_TERMINATORS)
+        self.process_type = _LabelledValue('Type:', FIELD_TERMINATORS)
+        self.priority = _LabelledValue('Priority:', FIELD_TERMINATORS)
+        self.automation = _LabelledValue('Automation Potential:', FIELD_TERMINATORS)
+        self.pain_level = _LabelledValue('Pain Level:', FIELD_TERMINATORS)
+        self.stakeholders = _LabelledValue('Internal Stakeholders:', ('External',), allow_end=False)
+        self._values = [
+            self.delimited_name, self.labelled_name, self.process_name, self.function,
+            self.process_type, self.priority, self.automation, self.pain_level, self.stakeholders
+        ]
+        self.pain_region = _Region('PAIN POINTS', 'TRANSFORMATION')
+        self.opportunity_region = _Region('TRANSFORMATION OPPORTUNITIES', '====')
+        self.workflow_region = _Region('AS-IS WORKFLOW MAPPING', 'STAKEHOLDERS')
+        self.workflow = WorkflowStepSplitter()
+        self.pain_points: List[str] = []
+        self.opportunities: List[str] = []
+        self._ends_with_newline = False
+        self._seen_pain_points = set()
+        self._seen_opportunities = set()
+
+    def feed(self, line: str, terminated: bool) -> None:
+        """Consume one line; the last line of a section is fed with terminated=False."""
+        if not terminated:
+            self._ends_with_newline = line == ""
+
+        if self._values:
+            # Lines without a value's label only matter once it is waiting for its text
+            finished = False
+            for value in self._values:
+                if value.waiting or value.label in line or not terminated:
+                    value.feed(line, terminated)
+                    finished = finished or value.done
+            if finished:
+                self._values = [value for value in self._values if not value.done]
+
+        if not self.pain_region.closed:
+            piece = self.pain_region.cut(line)
+            if piece is not None and any(keyword in piece for keyword in PAIN_POINT_KEYWORDS):
+                clean_line = PAIN_POINT_LABELS.sub('', piece).strip()
+                if clean_line and clean_line not in self._seen_pain_points:
+                    self._seen_pain_points.add(clean_line)
+                    self.pain_points.append(clean_line)
+
+        if not self.opportunity_region.closed:
+            piece = self.opportunity_region.cut(line)
+            if piece is not None and any(keyword in piece for keyword in OPPORTUNITY_KEYWORDS):
+                clean_line = OPPORTUNITY_LABELS.sub('', piece).strip()
+                if clean_line and clean_line not in self._seen_opportunities:
+                    self._seen_opportunities.add(clean_line)
+                    self.opportunities.append(clean_line)
+
+        if not self.workflow_region.closed:
+            piece = self.workflow_region.cut(line)
+            if piece is not None:
+                self.workflow.feed(piece, terminated and not self.workflow_region.closed)
+                if self.workflow_region.closed:
+                    self.workflow.close()
+
+    def build(self, parser: BusinessAnalysisParser) -> BusinessProcess:
+        """Assemble the BusinessProcess once the whole section has been fed."""
+        self.workflow.close(drop_final_newline=self._ends_with_newline and not self.workflow_region.closed)
+
+        for candidate in (self.delimited_name, self.labelled_name, self.process_name):
+            if candidate.value is not None:
+                name = candidate.value
+                break
+        else:
+            name = f"Extracted Process {self.number}"
+
+        stakeholders = []
+        if self.stakeholders.value is not None:
+            stakeholders = [s.strip() for s in self.stakeholders.value.split(',') if s.strip()]
+
+        workflow = self.workflow.steps
+        return BusinessProcess(
+            id=f"process-{self.number}",
+            name=name,
+            steps=len(workflow),
+            confidence=config.DEFAULT_CONFIDENCE,
+            priority=_to_enum(PriorityLevel, self.priority.value, config.DEFAULT_PRIORITY, PriorityLevel.MEDIUM),
+            automationPotential=_to_enum(
+                AutomationPotential, self.automation.value,
+                config.DEFAULT_AUTOMATION_POTENTIAL, AutomationPotential.MEDIUM
+            ),
+            painLevel=_to_enum(PainLevel, self.pain_level.value, config.DEFAULT_PAIN_LEVEL, PainLevel.MEDIUM),
+            function=self.function.value if self.function.value is not None else config.DEFAULT_FUNCTION,
+            type=_to_enum(ProcessType, self.process_type.value, config.DEFAULT_TYPE, ProcessType.CORE),
+            stakeholders=stakeholders if stakeholders else ["Unknown"],
+            painPoints=self.pain_points if self.pain_points else ["No specific pain points identified"],
+            opportunities=self.opportunities if self.opportunities else ["Review for automation opportunities"],
+            workflow=workflow if workflow else [parser._create_default_workflow_step()]
+        )
+
+
+class IncrementalParseSession:
+    """
+    One incremental parse of a model response.
+
+    Text is fed in arbitrary fragments; each process is returned from feed() as soon
+    as the header of the following process has been seen. Only the current line and
+    the current section's parse state are kept in memory.
+    """
+
+    def __init__(self, parser: BusinessAnalysisParser, deadline: Optional[float] = None):
+        """
+        Initialize the session.
+
+        Args:
+            parser: Parser that supplies defaults and the meeting overview
+            deadline: Monotonic time after which feed() and close() raise ParseTimeoutError
+        """
+        self.parser = parser
+        self.deadline = deadline
+        self.processes: List[BusinessProcess] = []
+        self.response_length = 0
+        self._partial: List[str] = []
+        self._held: List[str] = []
+        self._held_delimiter = -1
+        self._headers_seen = 0
+        # Text before the first header is only a process if no header ever appears
+        self._section = _SectionState(1)
+
+    def feed(self, fragment: str) -> List[BusinessProcess]:
+        """
+        Consume a fragment of model output.
+
+        Args:
+            fragment: Next piece of text
+
+        Returns:
+            List[BusinessProcess]: Processes completed by this fragment
+        """
+        self.response_length += len(fragment)
+        if '\n' not in fragment:
+            self._partial.append(fragment)
+            return []
+
+        lines = fragment.split('\n')
+        lines[0] = ''.join(self._partial) + lines[0]
+        self._partial = [lines.pop()]
+
+        completed: List[BusinessProcess] = []
+        for count, line in enumerate(lines):
+            if count % DEADLINE_CHECK_INTERVAL == 0:
+                check_parse_deadline(self.deadline)
+            self._scan(line, True, completed)
+        return completed
+
+    def close(self) -> AnalysisResult:
+        """
+        Finish parsing once the model output has ended.
+
+        Returns:
+            AnalysisResult: Structured analysis data, identical to BusinessAnalysisParser.parse_analysis
+        """
+        completed: List[BusinessProcess] = []
+        self._scan(''.join(self._partial), False, completed)
+        self._partial = []
+        self._finish_section(completed)
+        return self.parser.build_analysis_result(self.processes)
+
+    def _scan(self, line: str, terminated: bool, completed: List[BusinessProcess]) -> None:
+        """Route one line to the current section, splitting it at process headers."""
+        if self._held:
+            if not line.strip() and terminated:
+                self._held.append(line)
+                return
+            match = HEADER_TAIL_PATTERN.match(line)
+            if match:
+                prefix = self._held[0][:self._held_delimiter]
+                self._held = []
+                self._section.feed(prefix, False)
+                self._start_section(completed)
+                line = line[match.end():]
+            else:
+                held, self._held = self._held, []
+                for held_line in held:
+                    self._section.feed(held_line, True)
+
+        while DELIMITER in line:
+            match = INLINE_HEADER_PATTERN.search(line)
+            if not match:
+                break
+            self._section.feed(line[:match.start()], False)
+            self._start_section(completed)
+            line = line[match.end():]
+
+        delimiter = _trailing_delimiter_start(line) if terminated and DELIMITER in line else -1
+        if delimiter >= 0:
+            # Might be the first half of a header split across lines
+            self._held = [line]
+            self._held_delimiter = delimiter
+            return
+
+        self._section.feed(line, terminated)
+
+    def _start_section(self, completed: List[BusinessProcess]) -> None:
+        """Close the current section at a process header and open the next one."""
+        check_parse_deadline(self.deadline)
+        if self._headers_seen > 0:
+            self._finish_section(completed)
+        self._headers_seen += 1
+        self._section = _SectionState(self._headers_seen)
+
+    def _finish_section(self, completed: List[BusinessProcess]) -> None:
+        """Build the current section's process, skipping it on errors like the regex parser."""
+        try:
+            process = self._section.build(self.parser)
+        except Exception as e:
+            print(f"Error parsing process {self._section.number}: {e}")
+            return
+        self.processes.append(process)
+        completed.append(process)
+
+
+class IncrementalAnalysisParser(BusinessAnalysisParser):
+    """Single-pass parser engine producing the same results as BusinessAnalysisParser."""
+
+    def parse_analysis(self, analysis_text: str) -> AnalysisResult:
+        """
+        Parse the business analyzer text output into structured JSON for the UI.
+
+        Args:
+            analysis_text: Raw text output from the AI business analyzer
+
+        Returns:
+            AnalysisResult: Structured analysis data
+        """
+        try:
+            session = IncrementalParseSession(self, parse_deadline())
+            session.feed(analysis_text)
+            return session.close()
+
+        except Exception as e:
+            print(f"Error parsing analysis: {e}")
+            return self._create_default_analysis_result()
+
+    def stream(self) -> IncrementalParseSession:
+        """Start an incremental parse that accepts the model output in fragments."""
+        return IncrementalParseSession(self)
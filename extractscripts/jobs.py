@@ -0,0 +1,396 @@
+"""
+Background Job Module.
+Durable SQLite queue of analysis jobs, drained by worker processes so long analyses
+do not hold an HTTP connection open.
+
+Workers lease the jobs they run and renew the lease while working. Jobs whose worker
+crashes are requeued by the supervisor straight away, or by any worker once the lease
+runs out, so queued and running jobs survive server restarts.
+"""
+
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, Any, List, Optional
+from models import AnalysisResponse, JobStatus
+from serialization import response_json
+from uploads import SpooledUpload, move_spooled_file
+from config import config
+
+
+class JobQueue:
+    """Persistent FIFO queue of analysis jobs stored in SQLite."""
+
+    def __init__(self, db_path: str, storage_folder: str, lease_seconds: int, max_attempts: int):
+        """
+        Initialize the queue. The SQLite database is opened lazily on first use.
+
+        Args:
+            db_path: Path of the SQLite database file
+            storage_folder: Folder where uploaded files are kept until their job finishes
+            lease_seconds: How long a worker owns a job without renewing its lease
+            max_attempts: Number of times a job is started before it is given up
+        """
+        self.db_path = db_path
+        self.storage_folder = storage_folder
+        self.lease_seconds = max(1, lease_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            # Autocommit mode; claims open their own write transaction
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, filename TEXT NOT NULL, file_path TEXT NOT NULL, "
+                "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+                "worker_id TEXT, lease_expires_at REAL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+                "result TEXT, error TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)")
+            self._conn = conn
+        return self._conn
+
+    def enqueue(self, upload: SpooledUpload) -> Dict[str, Any]:
+        """
+        Take ownership of a spooled upload and queue a job to analyze it.
+
+        The spool file is moved into the job storage folder, not copied.
+
+        Args:
+            upload: Spooled upload
+
+        Returns:
+            Dict[str, Any]: The new job row
+        """
+        job_id = uuid.uuid4().hex
+        filename = upload.filename
+        extension = os.path.splitext(filename)[1].lower()
+        file_path = os.path.join(self.storage_folder, f"{job_id}{extension}")
+        move_spooled_file(upload, file_path)
+
+        now = time.time()
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO jobs (id, filename, file_path, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, filename, file_path, JobStatus.QUEUED.value, now, now)
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job by id, or return None if it does not exist."""
+        with self._lock:
+            row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest runnable job to a worker.
+
+        Runnable jobs are queued jobs and running jobs whose lease has expired.
+        Expired jobs that already used all their attempts are marked failed instead.
+
+        Args:
+            worker_id: Identifier of the claiming worker
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job row, or None if the queue is empty
+        """
+        now = time.time()
+        abandoned: List[str] = []
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                while True:
+                    row = conn.execute(
+                        "SELECT * FROM jobs WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                        "ORDER BY created_at LIMIT 1",
+                        (JobStatus.QUEUED.value, JobStatus.RUNNING.value, now)
+                    ).fetchone()
+                    if row is None:
+                        break
+                    if row["attempts"] >= self.max_attempts:
+                        conn.execute(
+                            "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, "
+                            "error = ?, updated_at = ? WHERE id = ?",
+                            (JobStatus.FAILED.value, f"Job abandoned after {row['attempts']} attempts", now, row["id"])
+                        )
+                        abandoned.append(row["file_path"])
+                        continue
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, "
+                        "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (JobStatus.RUNNING.value, worker_id, now + self.lease_seconds, now, row["id"])
+                    )
+                    break
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                conn.execute("ROLLBACK")
+                raise
+
+        for file_path in abandoned:
+            self._remove_file(file_path)
+        return self.get(row["id"]) if row is not None else None
+
+    def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Renew a worker's lease on a running job.
+
+        Returns:
+            bool: False if the worker no longer owns the job
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker_id, JobStatus.RUNNING.value)
+            )
+        return cursor.rowcount > 0
+
+    def finish(self, job_id: str, worker_id: str, response: AnalysisResponse) -> bool:
+        """
+        Record the outcome of a job and remove its stored upload.
+
+        Args:
+            job_id: Job identifier
+            worker_id: Identifier of the worker that ran the job
+            response: Analysis response, successful or not
+
+        Returns:
+            bool: False if the worker had lost the job to another worker
+        """
+        status = JobStatus.COMPLETED if response.success else JobStatus.FAILED
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT file_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, worker_id = NULL, "
+                "lease_expires_at = NULL, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (status.value, response_json(response).decode("utf-8"), response.error, time.time(),
+                 job_id, worker_id, JobStatus.RUNNING.value)
+            )
+        if cursor.rowcount == 0:
+            return False
+        if row is not None:
+            self._remove_file(row["file_path"])
+        return True
+
+    def requeue_worker(self, worker_id: str) -> int:
+        """
+        Put the running jobs of a dead worker back on the queue.
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        with self._lock:
+            cursor = self._connect().execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE worker_id = ? AND status = ?",
+                (JobStatus.QUEUED.value, time.time(), worker_id, JobStatus.RUNNING.value)
+            )
+        return cursor.rowcount
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        with self._lock:
+            rows = self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in JobStatus}
+        counts.update({row[0]: row[1] for row in rows})
+        return counts
+
+    @staticmethod
+    def _remove_file(file_path: str) -> None:
+        """Delete a stored upload, ignoring files that are already gone."""
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+def _run_job(queue: JobQueue, job: Dict[str, Any], worker_id: str) -> None:
+    """Analyze one claimed job, renewing its lease until the analysis finishes."""
+    # Imported here because api_routes imports this module for the job endpoints
+    from api_routes import analysis_service
+    from models import AnalysisError
+
+    done = threading.Event()
+
+    def renew_lease() -> None:
+        while not done.wait(queue.lease_seconds / 3):
+            if not queue.heartbeat(job["id"], worker_id):
+                return
+
+    heartbeat = threading.Thread(target=renew_lease, name="job-heartbeat", daemon=True)
+    heartbeat.start()
+    try:
+        api_key = analysis_service.validate_api_key()
+        try:
+            text_content = analysis_service.extract_file_text(job["file_path"], job["filename"])
+        except Exception as e:
+            raise AnalysisError(f"Analysis failed: {str(e)}")
+        response = analysis_service.analyze_text_content(text_content, api_key)
+        analysis_service.persist(job["filename"], response)
+    except AnalysisError as e:
+        response = AnalysisResponse(success=False, error=str(e))
+    except Exception as e:
+        response = AnalysisResponse(success=False, error=f"Server error: {str(e)}")
+    finally:
+        done.set()
+        heartbeat.join()
+
+    if not queue.finish(job["id"], worker_id, response):
+        print(f"Job {job['id']} was reassigned before worker {worker_id} finished it")
+
+
+def run_worker(worker_id: str, stop_event) -> None:
+    """
+    Worker process entry point: claim and run jobs until asked to stop.
+
+    The worker also stops if the supervising process dies, so workers are never
+    left running on their own.
+
+    Args:
+        worker_id: Unique identifier of this worker
+        stop_event: multiprocessing.Event set by the supervisor at shutdown
+    """
+    from store import analysis_store
+
+    parent_pid = os.getppid()
+    try:
+        while not stop_event.is_set() and os.getppid() == parent_pid:
+            try:
+                job = job_queue.claim(worker_id)
+            except sqlite3.Error as e:
+                print(f"Error claiming job: {e}")
+                job = None
+            if job is None:
+                stop_event.wait(config.JOB_POLL_INTERVAL_SECONDS)
+                continue
+            _run_job(job_queue, job, worker_id)
+    finally:
+        # Write the analyses this worker stored before the process exits
+        analysis_store.close()
+
+
+class JobWorkerPool:
+    """Supervises the job worker processes, restarting and requeueing crashed workers."""
+
+    def __init__(self, queue: JobQueue, workers: int):
+        """
+        Initialize the pool. Workers are started by start().
+
+        Args:
+            queue: Queue whose jobs the workers run
+            workers: Number of worker processes
+        """
+        self.queue = queue
+        self.workers = max(0, workers)
+        # Spawned rather than forked: the server process runs threads
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = None
+        self._processes: Dict[str, multiprocessing.Process] = {}
+        self._supervisor: Optional[threading.Thread] = None
+        self.restarts = 0
+
+    def _spawn(self) -> None:
+        """Start one worker process under a fresh worker id."""
+        worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        process = self._context.Process(
+            target=run_worker, args=(worker_id, self._stop_event), name=f"job-worker-{worker_id}"
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def start(self) -> None:
+        """Start the worker processes and the supervisor thread."""
+        if self.workers == 0 or self._supervisor is not None:
+            return
+        self._stop_event = self._context.Event()
+        for _ in range(self.workers):
+            self._spawn()
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+
+    def _supervise(self) -> None:
+        """Replace crashed workers and return their jobs to the queue."""
+        while not self._stop_event.wait(config.JOB_POLL_INTERVAL_SECONDS):
+            for worker_id, process in list(self._processes.items()):
+                if process.is_alive() or self._stop_event.is_set():
+                    continue
+                del self._processes[worker_id]
+                requeued = self.queue.requeue_worker(worker_id)
+                print(f"Job worker {worker_id} exited with code {process.exitcode}; requeued {requeued} job(s)")
+                self.restarts += 1
+                self._spawn()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Ask workers to finish their current job, terminating and requeueing stragglers."""
+        if self._supervisor is None:
+            return
+        self._stop_event.set()
+        self._supervisor.join()
+        self._supervisor = None
+        deadline = time.monotonic() + timeout
+        for worker_id, process in self._processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            self.queue.requeue_worker(worker_id)
+        self._processes = {}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return queue depths and worker process counts."""
+        stats = self.queue.get_stats()
+        stats["workers_alive"] = sum(1 for process in self._processes.values() if process.is_alive())
+        stats["worker_restarts"] = self.restarts
+        return stats
+
+
+# Create global job queue and worker pool instances
+job_queue = JobQueue(
+    db_path=config.JOB_QUEUE_PATH,
+    storage_folder=config.JOB_STORAGE_FOLDER,
+    lease_seconds=config.JOB_LEASE_SECONDS,
+    max_attempts=config.JOB_MAX_ATTEMPTS
+)
+job_workers = JobWorkerPool(job_queue, config.JOB_WORKERS)
+
+
+def main():
+    """
+    Run job workers without the HTTP server, e.g. when the server runs with JOB_WORKERS=0.
+
+    Usage: python jobs.py [number of workers]
+    """
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(1, config.JOB_WORKERS)
+    pool = JobWorkerPool(job_queue, workers)
+    pool.start()
+    print(f"Running {pool.workers} job worker(s) on {config.JOB_QUEUE_PATH}. Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,341 @@
+"""
+JSON Analysis Parser Module.
+Validates structured JSON model output directly against the BusinessProcess and
+MeetingOverview models, instead of recovering fields from free text. The text
+parser is kept as a fallback for responses that are not valid JSON.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from models import (
+    AnalysisResult,
+    BusinessProcess,
+    WorkflowStep,
+    PriorityLevel,
+    AutomationPotential,
+    PainLevel,
+    ProcessType
+)
+from parser import BusinessAnalysisParser
+from metrics import parse_fallbacks
+from config import config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+# Overview fields the model may fill in; the rest are derived from the processes
+MODEL_OVERVIEW_FIELDS = ("participants", "keyThemes", "overallAutomationReadiness", "participantSentiment")
+
+
+def decode_json(text: str) -> Any:
+    """
+    Decode JSON with orjson when it is installed, the standard library otherwise.
+
+    Raises:
+        ValueError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _strip_code_fence(text: str) -> str:
+    """Remove a Markdown code fence the model may wrap around its JSON."""
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        stripped = stripped.split("\n", 1)[1] if "\n" in stripped else ""
+        if stripped.rstrip().endswith("```"):
+            stripped = stripped.rstrip()[:-3]
+    return stripped
+
+
+def _level(value: Any, enum_class, default: str):
+    """Coerce a case-insensitive level such as "high" to its enum, or the default."""
+    for member in enum_class:
+        if isinstance(value, str) and value.strip().lower() == member.value.lower():
+            return member
+    return enum_class(default)
+
+
+def _text_list(value: Any) -> List[str]:
+    """Coerce a string or list of values to a list of non-empty strings."""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+
+def _text(value: Any, default: str) -> str:
+    """Coerce a scalar to a non-empty string, or the default."""
+    if value is None or isinstance(value, (dict, list)):
+        return default
+    text = str(value).strip()
+    return text or default
+
+
+class JsonAnalysisParser:
+    """Parser for analyses the model returns as JSON."""
+
+    def __init__(self, fallback: Optional[BusinessAnalysisParser] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            fallback: Text parser used for responses that are not valid JSON, and to
+                build meeting overviews
+        """
+        self.fallback = fallback or BusinessAnalysisParser()
+        self.fallbacks = 0
+
+    def parse_analysis(self, analysis_text: str) -> AnalysisResult:
+        """
+        Validate a JSON model response into structured analysis data.
+
+        Responses cut off mid-way keep the process objects that are complete;
+        anything else that is not JSON goes to the text parser.
+
+        Args:
+            analysis_text: Raw JSON text returned by the model
+
+        Returns:
+            AnalysisResult: Structured analysis data
+        """
+        result = self.parse_json(analysis_text)
+        if result is not None:
+            return result
+
+        # Keep the complete process objects of a truncated response
+        salvage = self.stream()
+        salvage.feed(analysis_text)
+        if salvage.processes:
+            return self.build_analysis_result(salvage.processes)
+        return self.fallback_to_text(analysis_text)
+
+    def parse_json(self, analysis_text: str) -> Optional[AnalysisResult]:
+        """
+        Validate a JSON model response, or return None if it is not valid JSON.
+
+        Processes are numbered in order, skipping objects that fail validation.
+        """
+        try:
+            payload = decode_json(_strip_code_fence(analysis_text))
+        except ValueError:
+            return None
+
+        processes = []
+        for item in self._process_items(payload):
+            process = self.parse_process(item, len(processes) + 1)
+            if process is not None:
+                processes.append(process)
+
+        result = self.build_analysis_result(processes)
+        overview = payload.get("meetingOverview") if isinstance(payload, dict) else None
+        if isinstance(overview, dict) and processes:
+            result.meetingOverview = self._merge_overview(result, overview)
+        return result
+
+    def fallback_to_text(self, analysis_text: str) -> AnalysisResult:
+        """Parse a response that is not valid JSON with the text parser."""
+        self.fallbacks += 1
+        parse_fallbacks.inc(label_value="json_to_text")
+        print("Model response is not valid JSON; falling back to the text parser")
+        return self.fallback.parse_analysis(analysis_text)
+
+    def build_analysis_result(self, processes: List[BusinessProcess]) -> AnalysisResult:
+        """Assemble an analysis result and its meeting overview from processes."""
+        return self.fallback.build_analysis_result(processes)
+
+    def stream(self) -> "JsonProcessStream":
+        """Start an incremental parse that accepts the JSON output in fragments."""
+        return JsonProcessStream(self)
+
+    @staticmethod
+    def _process_items(payload: Any) -> List[Any]:
+        """Find the list of process objects in a decoded response."""
+        if isinstance(payload, list):
+            return payload
+        if isinstance(payload, dict) and isinstance(payload.get("processes"), list):
+            return payload["processes"]
+        return []
+
+    def parse_process(self, item: Any, process_number: int) -> Optional[BusinessProcess]:
+        """
+        Validate one process object from the model.
+
+        Enum levels are matched case-insensitively and missing optional fields take
+        the model defaults; objects without a name are skipped.
+
+        Args:
+            item: Decoded process object
+            process_number: 1-based position of the process in the output
+
+        Returns:
+            Optional[BusinessProcess]: The process, or None if the object is unusable
+        """
+        if not isinstance(item, dict) or not _text(item.get("name"), ""):
+            return None
+
+        workflow = []
+        raw_steps = item.get("workflow") if isinstance(item.get("workflow"), list) else []
+        for step in raw_steps:
+            if not isinstance(step, dict):
+                continue
+            workflow.append(WorkflowStep(
+                step=len(workflow) + 1,
+                actor=_text(step.get("actor"), "Unknown"),
+                action=_text(step.get("action"), "Not specified"),
+                duration=_text(step.get("duration"), "Unknown"),
+                tools=_text(step.get("tools"), "Unspecified"),
+                dependencies=_text(step.get("dependencies"), "None"),
+                bottlenecks=_text(step.get("bottlenecks"), "None")
+            ))
+
+        confidence = item.get("confidence")
+        if not isinstance(confidence, (int, float)) or isinstance(confidence, bool):
+            confidence = config.DEFAULT_CONFIDENCE
+
+        try:
+            return BusinessProcess(
+                id=f"process-{process_number}",
+                name=_text(item.get("name"), f"Process {process_number}"),
+                steps=len(workflow),
+                confidence=max(0, min(100, int(confidence))),
+                priority=_level(item.get("priority"), PriorityLevel, config.DEFAULT_PRIORITY),
+                automationPotential=_level(item.get("automationPotential"), AutomationPotential,
+                                           config.DEFAULT_AUTOMATION_POTENTIAL),
+                painLevel=_level(item.get("painLevel"), PainLevel, config.DEFAULT_PAIN_LEVEL),
+                function=_text(item.get("function"), config.DEFAULT_FUNCTION),
+                type=_level(item.get("type"), ProcessType, config.DEFAULT_TYPE),
+                stakeholders=_text_list(item.get("stakeholders")),
+                painPoints=_text_list(item.get("painPoints")),
+                opportunities=_text_list(item.get("opportunities")),
+                workflow=workflow
+            )
+        except ValidationError as e:
+            print(f"Error validating process {process_number}: {e}")
+            return None
+
+    @staticmethod
+    def _merge_overview(result: AnalysisResult, overview: Dict[str, Any]):
+        """Take the overview fields the model reported over the derived placeholders."""
+        merged = result.meetingOverview.dict()
+        for field in MODEL_OVERVIEW_FIELDS:
+            value = overview.get(field)
+            if isinstance(merged[field], list):
+                value = _text_list(value)
+            else:
+                value = _text(value, "")
+            if value:
+                merged[field] = value
+        return type(result.meetingOverview)(**merged)
+
+
+class JsonProcessStream:
+    """
+    Incrementally picks complete process objects out of streamed JSON output.
+
+    A single linear scan tracks nesting depth and string state, so each object in
+    the processes array is validated and returned as soon as its closing brace
+    arrives. The raw text is kept so the final result can fall back to the text
+    parser if the response turns out not to be JSON.
+    """
+
+    def __init__(self, parser: JsonAnalysisParser):
+        """Initialize the stream with the parser used for each completed object."""
+        self.parser = parser
+        self.processes: List[BusinessProcess] = []
+        self.response_length = 0
+        self._chunks: List[str] = []
+        self._text = ""
+        self._scanned = 0
+        self._containers: List[str] = []    # Open "{" / "[" from the root down
+        self._in_string = False
+        self._escaped = False
+        self._item_start = -1
+
+    def _in_process_list(self) -> bool:
+        """Whether the scan is directly inside the array that holds the processes."""
+        containers = self._containers
+        return containers == ["["] or containers == ["{", "["]
+
+    def feed(self, fragment: str) -> List[BusinessProcess]:
+        """
+        Consume a fragment of model output.
+
+        Args:
+            fragment: Next piece of streamed text
+
+        Returns:
+            List[BusinessProcess]: Processes whose objects were completed by this fragment
+        """
+        self.response_length += len(fragment)
+        self._chunks.append(fragment)
+        self._text += fragment
+        completed = []
+
+        text = self._text
+        for index in range(self._scanned, len(text)):
+            character = text[index]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif character == "\\":
+                    self._escaped = True
+                elif character == '"':
+                    self._in_string = False
+            elif character == '"':
+                self._in_string = True
+            elif character in "{[":
+                if character == "{" and self._in_process_list():
+                    self._item_start = index
+                self._containers.append(character)
+            elif character in "}]" and self._containers:
+                self._containers.pop()
+                if character == "}" and self._item_start >= 0 and self._in_process_list():
+                    process = self._parse_item(text[self._item_start:index + 1])
+                    if process is not None:
+                        completed.append(process)
+                    self._item_start = -1
+        self._scanned = len(text)
+
+        # Only the open process object, if any, is needed for later fragments
+        keep_from = self._item_start if self._item_start >= 0 else len(text)
+        self._text = text[keep_from:]
+        self._scanned -= keep_from
+        if self._item_start >= 0:
+            self._item_start = 0
+        return completed
+
+    def _parse_item(self, item_text: str) -> Optional[BusinessProcess]:
+        """Decode and validate one complete process object."""
+        try:
+            item = decode_json(item_text)
+        except ValueError:
+            return None
+        process = self.parser.parse_process(item, len(self.processes) + 1)
+        if process is not None:
+            self.processes.append(process)
+        return process
+
+    def close(self) -> AnalysisResult:
+        """
+        Finish the parse once the model output has ended.
+
+        Returns:
+            AnalysisResult: Structured analysis data from the complete response; for
+                output that is not valid JSON, the processes that did arrive complete,
+                or failing that the text parser's result
+        """
+        response = "".join(self._chunks)
+        self._chunks = []
+        self._text = ""
+        result = self.parser.parse_json(response)
+        if result is not None:
+            return result
+        if self.processes:
+            return self.parser.build_analysis_result(self.processes)
+        return self.parser.fallback_to_text(response)
@@ -0,0 +1,405 @@
+"""
+LLM Backend Module.
+Model access behind a small interface, so the analyzer can talk to Gemini or to a
+deterministic local mock selected with LLM_BACKEND. The mock returns realistic
+PROCESS #N analyses (or JSON) with configurable size, process count, latency
+distribution, streaming behavior and error rate, for load tests and benchmarks
+that must run without network access or quota.
+"""
+
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from config import config
+
+
+class LLMBackend:
+    """
+    Interface of a model backend.
+
+    Mirrors genai.GenerativeModel.generate_content so the call layer can wrap
+    any backend: responses, and each streamed chunk, expose the output as `.text`.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def generate_content(self, prompt: str, stream: bool = False,
+                         generation_config: Optional[Dict[str, Any]] = None,
+                         request_options: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Generate a response to a prompt.
+
+        Args:
+            prompt: Prompt text
+            stream: Return an iterator of chunks instead of one response
+            generation_config: Generation options, e.g. response_mime_type
+            request_options: Transport options, e.g. timeout in seconds
+
+        Returns:
+            A response with `.text`, or an iterator of chunks with `.text` when streaming
+        """
+        raise NotImplementedError
+
+
+def import_gemini_sdk():
+    """Import the Gemini SDK, which takes most of a cold start; deferred until a Gemini backend is built."""
+    import google.generativeai as genai
+    return genai
+
+
+class GeminiBackend(LLMBackend):
+    """Google Gemini through the google.generativeai SDK."""
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str):
+        """Configure the SDK and build the model client."""
+        super().__init__(model_name)
+        genai = import_gemini_sdk()
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate_content(self, prompt: str, stream: bool = False,
+                         generation_config: Optional[Dict[str, Any]] = None,
+                         request_options: Optional[Dict[str, Any]] = None) -> Any:
+        kwargs: Dict[str, Any] = {"stream": stream}
+        if generation_config is not None:
+            kwargs["generation_config"] = generation_config
+        if request_options is not None:
+            kwargs["request_options"] = request_options
+        return self.model.generate_content(prompt, **kwargs)
+
+
+class MockResponse:
+    """Response, or streamed chunk, returned by the mock backend."""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class MockBackendError(Exception):
+    """Injected failure of the mock backend, carrying an HTTP status like google.api_core errors."""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} Mock backend injected error")
+        self.code = code
+
+
+MOCK_FUNCTIONS = ["Finance", "Operations", "Development", "QA", "Sales", "Customer Success", "HR", "Management"]
+MOCK_PROCESSES = [
+    "Invoice Export and Reconciliation", "Purchase Order Approval", "Release Sign-off",
+    "Customer Onboarding", "Support Ticket Triage", "Weekly Status Reporting",
+    "Expense Claim Review", "Vendor Contract Renewal", "Sprint Planning",
+    "Incident Post-mortem", "New Hire Provisioning", "Quarterly Forecasting",
+]
+MOCK_ACTORS = ["Finance Clerk", "Team Lead", "QA Engineer", "Account Manager", "Operations Analyst", "Project Manager"]
+MOCK_ACTIONS = [
+    "exports the records from the ERP", "copies the figures into the tracking spreadsheet",
+    "reviews the request and approves it by email", "tags the build and notifies QA",
+    "updates the status in the shared tracker", "chases missing information from the requester",
+    "prepares the summary for the weekly meeting", "files the documents in the shared drive",
+]
+MOCK_TOOLS = ["ERP", "Excel", "Email", "Jira", "Slack", "SharePoint", "Salesforce"]
+MOCK_ISSUES = [
+    "Data is re-keyed by hand between systems", "Approvals wait in personal inboxes",
+    "Nobody can see where a request is", "Errors are only found at month end",
+    "Handovers depend on one person being available", "The checklist lives in several documents",
+]
+MOCK_OPPORTUNITIES = [
+    "Automate the export with a scheduled integration", "Route approvals through a workflow tool",
+    "Build a dashboard showing every open request", "Use AI to extract fields from incoming documents",
+    "Send automatic reminders for overdue items", "Keep one shared checklist template",
+]
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+LEVELS = ["High", "Medium", "Low"]
+TYPES = ["Core", "Support", "Management"]
+
+# Rough rendered sizes, used to size the workflow to the requested response length
+PROCESS_BASE_CHARS = 1300
+STEP_CHARS = 230
+
+
+def sample_latency(rng: random.Random, distribution: str, mean: float, stddev: float) -> float:
+    """
+    Draw a latency in seconds.
+
+    Args:
+        rng: Random source
+        distribution: "fixed", "uniform", "normal", "lognormal" or "exponential"
+        mean: Mean latency in seconds
+        stddev: Standard deviation in seconds (half-width for "uniform")
+
+    Raises:
+        ValueError: If the distribution is unknown
+    """
+    if mean <= 0:
+        return 0.0
+    if distribution == "fixed":
+        return mean
+    if distribution == "uniform":
+        return max(0.0, rng.uniform(mean - stddev, mean + stddev))
+    if distribution == "normal":
+        return max(0.0, rng.gauss(mean, stddev))
+    if distribution == "lognormal":
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        return rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+    if distribution == "exponential":
+        return rng.expovariate(1 / mean)
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def _count_range(value: str) -> Tuple[int, int]:
+    """Parse a count such as "3" or a range such as "2-6"."""
+    low, _, high = value.partition("-")
+    low_count = max(1, int(low))
+    return low_count, max(low_count, int(high)) if high else low_count
+
+
+class MockBackend(LLMBackend):
+    """
+    Deterministic local stand-in for Gemini.
+
+    The response text depends only on the seed and the prompt, so repeated runs
+    produce identical analyses. Latencies and injected errors come from a seeded
+    sequence, so a run of calls is reproducible as well.
+    """
+
+    name = "mock"
+
+    def __init__(self, model_name: str, seed: int = 0, process_count: str = "3",
+                 response_chars: int = 6000, latency_distribution: str = "lognormal",
+                 latency_mean_ms: float = 1500, latency_stddev_ms: float = 500,
+                 stream_chunk_chars: int = 256, first_chunk_fraction: float = 0.3,
+                 error_rate: float = 0.0, error_codes: Optional[List[int]] = None):
+        """
+        Initialize the mock.
+
+        Args:
+            model_name: Reported model name
+            seed: Seed for generated text, latencies and errors
+            process_count: Processes per response, a count ("3") or an inclusive range ("2-6")
+            response_chars: Approximate length of each response
+            latency_distribution: "fixed", "uniform", "normal", "lognormal" or "exponential"
+            latency_mean_ms: Mean time to the complete response
+            latency_stddev_ms: Spread of the latency
+            stream_chunk_chars: Size of each streamed chunk
+            first_chunk_fraction: Share of the latency spent before the first streamed chunk
+            error_rate: Probability that a call fails
+            error_codes: HTTP statuses injected failures carry, chosen uniformly
+
+        Raises:
+            ValueError: If the latency distribution or process count is invalid
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {latency_distribution}")
+        super().__init__(model_name)
+        self.seed = seed
+        self.process_count = _count_range(process_count)
+        self.response_chars = max(0, response_chars)
+        self.latency_distribution = latency_distribution
+        self.latency_mean = latency_mean_ms / 1000
+        self.latency_stddev = latency_stddev_ms / 1000
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.first_chunk_fraction = min(1.0, max(0.0, first_chunk_fraction))
+        self.error_rate = error_rate
+        self.error_codes = error_codes or [429, 503]
+        self._sequence = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _draw(self) -> Tuple[float, Optional[int]]:
+        """Latency and injected error, if any, of the next call."""
+        with self._lock:
+            latency = sample_latency(self._sequence, self.latency_distribution,
+                                     self.latency_mean, self.latency_stddev)
+            failed = self._sequence.random() < self.error_rate
+            code = self._sequence.choice(self.error_codes)
+        return latency, (code if failed else None)
+
+    def _text_rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\0{prompt}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def build_processes(self, prompt: str) -> List[Dict[str, Any]]:
+        """Generate the processes of the response to a prompt."""
+        rng = self._text_rng(prompt)
+        count = rng.randint(*self.process_count)
+        steps = max(1, (self.response_chars // count - PROCESS_BASE_CHARS) // STEP_CHARS)
+        names = rng.sample(MOCK_PROCESSES, len(MOCK_PROCESSES))
+        processes = []
+        for number in range(1, count + 1):
+            name = names[(number - 1) % len(names)]
+            processes.append({
+                "name": name if number <= len(names) else f"{name} {number}",
+                "function": rng.choice(MOCK_FUNCTIONS),
+                "type": rng.choice(TYPES),
+                "priority": rng.choice(LEVELS),
+                "automationPotential": rng.choice(LEVELS),
+                "painLevel": rng.choice(LEVELS),
+                "confidence": rng.randint(60, 95),
+                "workflow": [
+                    {
+                        "actor": rng.choice(MOCK_ACTORS),
+                        "action": rng.choice(MOCK_ACTIONS),
+                        "duration": f"{rng.randint(5, 120)} minutes",
+                        "tools": ", ".join(rng.sample(MOCK_TOOLS, 2)),
+                        "dependencies": "Previous step completed" if step > 1 else "Request received",
+                        "bottlenecks": rng.choice(MOCK_ISSUES)
+                    }
+                    for step in range(1, steps + 1)
+                ],
+                "stakeholders": rng.sample(MOCK_ACTORS, 2),
+                "painPoints": rng.sample(MOCK_ISSUES, 3),
+                "opportunities": rng.sample(MOCK_OPPORTUNITIES, 3)
+            })
+        return processes
+
+    @staticmethod
+    def render_text(processes: List[Dict[str, Any]]) -> str:
+        """Render processes in the PROCESS #N format the analysis prompt asks for."""
+        sections = []
+        for number, process in enumerate(processes, 1):
+            lines = [
+                "====================",
+                f"PROCESS #{number}: {process['name']}",
+                "====================",
+                "",
+                f"Name: {process['name']}",
+                f"Function: {process['function']}",
+                f"Type: {process['type']}",
+                f"Priority: {process['priority']}",
+                f"Automation Potential: {process['automationPotential']}",
+                f"Pain Level: {process['painLevel']}",
+                "",
+                "AS-IS WORKFLOW MAPPING:",
+            ]
+            for step_number, step in enumerate(process["workflow"], 1):
+                lines.extend([
+                    f"Step {step_number}: {step['actor']} does {step['action']}",
+                    f"Duration: {step['duration']}",
+                    f"Tools/Systems: {step['tools']}",
+                    f"Dependencies: {step['dependencies']}",
+                    f"Bottlenecks: {step['bottlenecks']}",
+                    "",
+                ])
+            pain_points = process["painPoints"]
+            opportunities = process["opportunities"]
+            lines.extend([
+                "STAKEHOLDERS:",
+                f"Primary Process Owner: {process['stakeholders'][0]}",
+                f"Internal Stakeholders: {', '.join(process['stakeholders'])}",
+                "External Stakeholders: None mentioned",
+                "",
+                "PAIN POINTS:",
+                f"Explicit Issues: {pain_points[0]}",
+                f"Implied Issues: {pain_points[1]}",
+                f"Manual Effort: {pain_points[2]}",
+                "Time Delays: Requests wait between handovers",
+                "Quality Issues: Figures are re-keyed by hand",
+                "Communication Gaps: Status is shared by email",
+                "Impact: Slower turnaround and avoidable rework",
+                "",
+                "TRANSFORMATION OPPORTUNITIES:",
+                f"AI Opportunities: {opportunities[0]}",
+                f"Automation Opportunities: {opportunities[1]}",
+                "Digital Transformation: Move the tracker into a shared workflow tool",
+                f"Process Improvements: {opportunities[2]}",
+                "Quick Wins: Agree one owner per request",
+                "Long-term Improvements: Integrate the systems end to end",
+                "",
+                "====================",
+                "",
+            ])
+            sections.append("\n".join(lines))
+        return "\n".join(sections)
+
+    def build_response(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """Deterministic response text for a prompt, as JSON when the config asks for it."""
+        processes = self.build_processes(prompt)
+        if (generation_config or {}).get("response_mime_type") == "application/json":
+            return json.dumps({
+                "processes": processes,
+                "meetingOverview": {
+                    "participants": sorted({actor for p in processes for actor in p["stakeholders"]}),
+                    "keyThemes": [p["function"] for p in processes],
+                    "overallAutomationReadiness": processes[0]["automationPotential"],
+                    "participantSentiment": "Mixed"
+                }
+            }, indent=2)
+        return self.render_text(processes)
+
+    def generate_content(self, prompt: str, stream: bool = False,
+                         generation_config: Optional[Dict[str, Any]] = None,
+                         request_options: Optional[Dict[str, Any]] = None) -> Any:
+        latency, error_code = self._draw()
+        timeout = (request_options or {}).get("timeout")
+        if stream:
+            return self._stream(self.build_response(prompt, generation_config), latency, error_code, timeout)
+
+        self._wait(latency, timeout)
+        if error_code is not None:
+            raise MockBackendError(error_code)
+        return MockResponse(self.build_response(prompt, generation_config))
+
+    @staticmethod
+    def _wait(latency: float, timeout: Optional[float]) -> None:
+        """Sleep for the latency, or time out like a real request would."""
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Mock backend call exceeded its {timeout:.1f}s timeout")
+        time.sleep(latency)
+
+    def _stream(self, text: str, latency: float, error_code: Optional[int],
+                timeout: Optional[float]) -> Iterator[MockResponse]:
+        """Yield the response in chunks, spreading the latency over them."""
+        first_wait = latency * self.first_chunk_fraction
+        self._wait(first_wait, timeout)
+        if error_code is not None:
+            raise MockBackendError(error_code)
+
+        chunks = [text[i:i + self.stream_chunk_chars] for i in range(0, len(text), self.stream_chunk_chars)]
+        gap = (latency - first_wait) / max(1, len(chunks) - 1)
+        for index, chunk in enumerate(chunks):
+            if index:
+                time.sleep(gap)
+            yield MockResponse(chunk)
+
+
+def create_backend(name: str, api_key: Optional[str], model_name: str) -> LLMBackend:
+    """
+    Build the backend selected by name.
+
+    Args:
+        name: "gemini" or "mock"
+        api_key: Gemini API key (unused by the mock)
+        model_name: Model name to request or report
+
+    Returns:
+        LLMBackend: The backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "gemini":
+        return GeminiBackend(api_key, model_name)
+    if name == "mock":
+        return MockBackend(
+            model_name,
+            seed=config.MOCK_SEED,
+            process_count=config.MOCK_PROCESS_COUNT,
+            response_chars=config.MOCK_RESPONSE_CHARS,
+            latency_distribution=config.MOCK_LATENCY_DISTRIBUTION,
+            latency_mean_ms=config.MOCK_LATENCY_MEAN_MS,
+            latency_stddev_ms=config.MOCK_LATENCY_STDDEV_MS,
+            stream_chunk_chars=config.MOCK_STREAM_CHUNK_CHARS,
+            first_chunk_fraction=config.MOCK_FIRST_CHUNK_FRACTION,
+            error_rate=config.MOCK_ERROR_RATE,
+            error_codes=config.MOCK_ERROR_CODES
+        )
+    raise ValueError(f"Unknown LLM backend: {name}")
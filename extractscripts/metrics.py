@@ -0,0 +1,246 @@
+"""
+Metrics Module.
+Process-wide counters, gauges and timing histograms for the stages of an analysis
+(receiving the upload, text extraction, the model call, parsing the response and
+serializing the API response), rendered in the Prometheus text exposition format.
+Recording a value takes a lock and a few arithmetic operations, so metrics are
+always on.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Stages an analysis request spends its time in
+STAGES = ("upload", "extraction", "llm", "parsing", "serialization")
+
+# Prefix of every exported metric name
+METRIC_PREFIX = "analysis_"
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Thread-safe histogram of observed durations."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds; larger values only count towards +Inf
+        """
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self._counts = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self._counts):
+                self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the observation count, sum and cumulative bucket counts.
+
+        Returns:
+            Dict[str, Any]: {"count", "sum", "buckets": [(upper bound, observations <= bound), ...]}
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+        cumulative = []
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"count": total, "sum": value_sum, "buckets": cumulative}
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value the way Prometheus expects."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """Format a label set as {name="value",...}, or nothing when empty."""
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _header(name: str, kind: str, description: str) -> List[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+
+class Counter:
+    """Thread-safe monotonically increasing counter, optionally split by one label."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, label: Optional[str] = None,
+                 label_values: Sequence[str] = ()):
+        """
+        Args:
+            name: Metric name without the prefix and the _total suffix
+            description: HELP text
+            label: Name of the label that splits the counter, if any
+            label_values: Label values exported as 0 before they are first incremented
+        """
+        self.name = METRIC_PREFIX + name + ("_total" if self.kind == "counter" else "")
+        self.description = description
+        self.label = label
+        self._values: Dict[str, float] = {value: 0 for value in label_values}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, label_value: str = "") -> None:
+        """Add to the counter, or to one label value's series."""
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def value(self, label_value: str = "") -> float:
+        """Current value of the counter, or of one label value's series."""
+        with self._lock:
+            return self._values.get(label_value, 0)
+
+    def render(self) -> List[str]:
+        """Render the metric in the Prometheus text format."""
+        with self._lock:
+            values = dict(self._values) or ({} if self.label else {"": 0})
+        lines = _header(self.name, self.kind, self.description)
+        for label_value, value in sorted(values.items()):
+            labels = {self.label: label_value} if self.label else {}
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Thread-safe value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, label_value: str = "") -> None:
+        """Subtract from the gauge."""
+        self.inc(-amount, label_value)
+
+    @contextmanager
+    def track(self, amount: float = 1) -> Iterator[None]:
+        """Raise the gauge for the duration of the block."""
+        self.inc(amount)
+        try:
+            yield
+        finally:
+            self.dec(amount)
+
+
+class StageMetrics:
+    """Duration histograms for each analysis stage."""
+
+    def __init__(self, stages: Sequence[str] = STAGES, name: str = "stage_duration_seconds",
+                 description: str = "Time spent in each stage of an analysis"):
+        """Initialize one empty histogram per stage."""
+        self.name = METRIC_PREFIX + name
+        self.description = description
+        self.histograms: Dict[str, Histogram] = {stage: Histogram() for stage in stages}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record time spent in a stage."""
+        self.histograms[stage].observe(seconds)
+
+    @contextmanager
+    def time(self, stage: str) -> Iterator[None]:
+        """Record the duration of the block as time spent in a stage, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histograms[stage].observe(time.perf_counter() - started)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the histogram snapshot of every stage."""
+        return {stage: histogram.snapshot() for stage, histogram in self.histograms.items()}
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the observation count and total seconds of every stage."""
+        return {
+            stage: {"count": snapshot["count"], "total_seconds": round(snapshot["sum"], 6)}
+            for stage, snapshot in self.snapshot().items()
+        }
+
+    def render(self) -> List[str]:
+        """Render one histogram series per stage in the Prometheus text format."""
+        lines = _header(self.name, "histogram", self.description)
+        for stage, snapshot in self.snapshot().items():
+            for bound, count in snapshot["buckets"]:
+                lines.append(f'{self.name}_bucket{{stage="{stage}",le="{_format_value(bound)}"}} {count}')
+            lines.append(f'{self.name}_bucket{{stage="{stage}",le="+Inf"}} {snapshot["count"]}')
+            lines.append(f'{self.name}_sum{{stage="{stage}"}} {_format_value(snapshot["sum"])}')
+            lines.append(f'{self.name}_count{{stage="{stage}"}} {snapshot["count"]}')
+        return lines
+
+
+# Reads current values from another component: (name, "counter" or "gauge", description, value)
+Collector = Callable[[], List[Tuple[str, str, str, float]]]
+
+
+class MetricsRegistry:
+    """The metrics exported by this process."""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._collectors: List[Collector] = []
+
+    def register(self, metric):
+        """Export a Counter, Gauge or StageMetrics; returns it for assignment."""
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Collector) -> None:
+        """Export values another component already keeps, read at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            try:
+                samples = collector()
+            except Exception as e:
+                print(f"Error collecting metrics: {e}")
+                continue
+            for name, kind, description, value in samples:
+                name = METRIC_PREFIX + name
+                lines.extend(_header(name, kind, description))
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Create the global registry and the metrics recorded across modules
+metrics_registry = MetricsRegistry()
+stage_metrics = metrics_registry.register(StageMetrics())
+parse_fallbacks = metrics_registry.register(Counter(
+    "parse_fallbacks", "Model responses parsed into placeholder results, by fallback", label="fallback",
+    label_values=("default_process", "default_result", "json_to_text")
+))
+upload_bytes = metrics_registry.register(Counter("upload_bytes", "Upload bytes received and spooled"))
+upload_bytes_in_flight = metrics_registry.register(Gauge(
+    "upload_bytes_in_flight", "Bytes of uploads being received or waiting on disk for analysis"
+))
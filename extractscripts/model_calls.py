@@ -0,0 +1,455 @@
+"""
+Gemini Call Layer Module.
+Wraps every generate_content call with a token-bucket rate limiter, an adaptive
+concurrency limit that backs off when Gemini reports overload, jittered
+exponential retries within a deadline, and coalescing of identical in-flight
+prompts so concurrent callers share one call.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, Optional
+from config import config
+from models import ModelRateLimitError
+
+# Outcomes of a failed call that are worth retrying
+RATE_LIMITED = "rate_limited"
+SERVER_ERROR = "server_error"
+
+SERVER_ERROR_CODES = {500, 502, 503, 504}
+
+# Marks an exhausted stream
+_END = object()
+
+
+def classify_error(error: BaseException) -> Optional[str]:
+    """
+    Decide whether a failed Gemini call is transient.
+
+    google.api_core exceptions carry the HTTP status as `code`; the message is
+    checked as well for errors the SDK re-raises without one.
+
+    Returns:
+        Optional[str]: RATE_LIMITED, SERVER_ERROR, or None if retrying cannot help
+    """
+    code = getattr(error, "code", None)
+    if code == 429:
+        return RATE_LIMITED
+    if code in SERVER_ERROR_CODES:
+        return SERVER_ERROR
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return SERVER_ERROR
+    message = str(error).lower()
+    if "429" in message or "resource has been exhausted" in message or "quota" in message:
+        return RATE_LIMITED
+    return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting the sustained rate of calls."""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate_per_second: Tokens added per second (0 disables the limit)
+            burst: Bucket capacity, i.e. calls allowed back to back
+        """
+        self.rate = max(0.0, rate_per_second)
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, deadline: float) -> bool:
+        """
+        Take one token, waiting for it to be added if necessary.
+
+        Args:
+            deadline: time.monotonic() value to give up at
+
+        Returns:
+            bool: False if no token would be available before the deadline
+        """
+        if self.rate == 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def refund(self) -> None:
+        """Return a token taken for a call that was not made."""
+        if self.rate == 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after a 429, so queued callers wait for fresh tokens."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+    def seconds_until_token(self) -> float:
+        """Time until the next token is available."""
+        if self.rate == 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently in the bucket."""
+        if self.rate == 0:
+            return float(self.capacity)
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class AdaptiveConcurrencyLimit:
+    """
+    Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Every successful call grows the limit by 1/limit, about one slot per round of
+    calls; every 429 or 5xx halves it, down to the minimum.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        """
+        Initialize the limit.
+
+        Args:
+            initial: Starting number of concurrent calls
+            minimum: The limit never drops below this
+            maximum: The limit never grows past this
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, deadline: float) -> bool:
+        """
+        Wait for a free slot.
+
+        Args:
+            deadline: time.monotonic() value to give up at
+
+        Returns:
+            bool: False if no slot freed up before the deadline
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            self.in_flight += 1
+            return True
+
+    def release(self, overloaded: Optional[bool]) -> None:
+        """
+        Free a slot and adjust the limit.
+
+        Args:
+            overloaded: True after a 429/5xx, False after a success, None to leave the limit alone
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self.limit = max(self.minimum, self.limit / 2)
+            elif overloaded is False:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ModelCallLayer:
+    """Process-wide gate for Gemini calls."""
+
+    def __init__(self, rate_per_minute: float, burst: int, concurrency_initial: int,
+                 concurrency_min: int, concurrency_max: int, deadline_seconds: float,
+                 max_retries: int, retry_base_seconds: float, retry_max_seconds: float,
+                 coalescing: bool = True):
+        """
+        Initialize the call layer.
+
+        Args:
+            rate_per_minute: Sustained calls per minute (0 disables rate limiting)
+            burst: Calls allowed back to back after an idle period
+            concurrency_initial: Starting limit on concurrent calls
+            concurrency_min: Lowest the adaptive limit can drop to
+            concurrency_max: Highest the adaptive limit can grow to
+            deadline_seconds: Time budget of one call, queueing and retries included
+            max_retries: Retries of a transient error before giving up
+            retry_base_seconds: Backoff ceiling of the first retry, doubled on each retry
+            retry_max_seconds: Largest backoff between two attempts
+            coalescing: Share one call between concurrent identical prompts
+        """
+        self.rate_per_minute = max(0.0, rate_per_minute)
+        self.bucket = TokenBucket(self.rate_per_minute / 60, burst)
+        self.concurrency = AdaptiveConcurrencyLimit(concurrency_initial, concurrency_min, concurrency_max)
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max(0, max_retries)
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.coalescing = coalescing
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._waiting = 0
+        self._calls = 0
+        self._retries = 0
+        self._rate_limited = 0
+        self._server_errors = 0
+        self._coalesced = 0
+        self._gave_up = 0
+
+    @staticmethod
+    def _coalescing_key(model: Any, prompt: str, kwargs: Dict[str, Any]) -> str:
+        """Identify a call by model, prompt and generation options."""
+        digest = hashlib.sha256()
+        digest.update(str(getattr(model, "model_name", "")).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(json.dumps(kwargs, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _acquire(self, deadline: float) -> None:
+        """
+        Wait for a rate limiter token and a concurrency slot.
+
+        The token is returned if no slot frees up, so calls that were never made
+        don't use up the rate limit.
+
+        Raises:
+            ModelRateLimitError: If either is not available before the deadline
+        """
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = self.bucket.acquire(deadline)
+            if acquired and not self.concurrency.acquire(deadline):
+                self.bucket.refund()
+                acquired = False
+            if not acquired:
+                with self._lock:
+                    self._gave_up += 1
+                raise ModelRateLimitError(
+                    "Analysis failed: Gemini rate limit reached, please try again shortly",
+                    retry_after=max(1.0, self.bucket.seconds_until_token())
+                )
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        with self._lock:
+            self._calls += 1
+
+    def _release(self, error: Optional[BaseException]) -> Optional[str]:
+        """Free the concurrency slot of a finished attempt and record its outcome."""
+        kind = classify_error(error) if error is not None else None
+        if kind == RATE_LIMITED:
+            self.bucket.drain()
+        with self._lock:
+            if kind == RATE_LIMITED:
+                self._rate_limited += 1
+            elif kind == SERVER_ERROR:
+                self._server_errors += 1
+        if error is None:
+            self.concurrency.release(overloaded=False)
+        else:
+            self.concurrency.release(overloaded=True if kind is not None else None)
+        return kind
+
+    def _backoff(self, error: BaseException, kind: Optional[str], attempt: int, deadline: float) -> float:
+        """
+        Pick the delay before retrying a failed attempt.
+
+        Uses full jitter: a uniform delay up to a ceiling that doubles per attempt.
+
+        Returns:
+            float: Seconds to sleep before the next attempt
+
+        Raises:
+            ModelRateLimitError: If a rate-limited call runs out of retries or time
+            Exception: The original error if it is not transient or runs out of retries or time
+        """
+        if kind is None:
+            raise error
+        ceiling = min(self.retry_max_seconds, self.retry_base_seconds * (2 ** attempt))
+        delay = random.uniform(0, ceiling)
+        if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+            with self._lock:
+                self._gave_up += 1
+            if kind == RATE_LIMITED:
+                raise ModelRateLimitError(
+                    "Analysis failed: Gemini rate limit reached, please try again shortly",
+                    retry_after=max(1.0, ceiling)
+                ) from error
+            raise error
+        with self._lock:
+            self._retries += 1
+        return delay
+
+    def _request_options(self, deadline: float) -> Dict[str, Any]:
+        """Per-attempt SDK options so a hung call cannot outlive the deadline."""
+        return {"timeout": max(1.0, deadline - time.monotonic())}
+
+    def generate(self, model: Any, prompt: str, **kwargs) -> Any:
+        """
+        Call model.generate_content through the limiter, retrying transient errors.
+
+        Concurrent calls with the same model, prompt and options share one call
+        and its response.
+
+        Args:
+            model: llm_backends.LLMBackend to call
+            prompt: Prompt text
+            **kwargs: Further generate_content arguments, e.g. generation_config
+
+        Returns:
+            The generate_content response
+
+        Raises:
+            ModelRateLimitError: If Gemini stays rate limited past the deadline
+            Exception: Non-transient errors from the SDK, unchanged
+        """
+        if not self.coalescing:
+            return self._generate(model, prompt, kwargs)
+
+        key = self._coalescing_key(model, prompt, kwargs)
+        with self._lock:
+            future = self._pending.get(key)
+            leader = future is None
+            if leader:
+                future = self._pending[key] = Future()
+            else:
+                self._coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            response = self._generate(model, prompt, kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _generate(self, model: Any, prompt: str, kwargs: Dict[str, Any]) -> Any:
+        """Run one non-streaming call with retries."""
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            self._acquire(deadline)
+            try:
+                response = model.generate_content(prompt, request_options=self._request_options(deadline), **kwargs)
+            except Exception as e:
+                kind = self._release(e)
+                time.sleep(self._backoff(e, kind, attempt, deadline))
+                attempt += 1
+                continue
+            self._release(None)
+            return response
+
+    def stream(self, model: Any, prompt: str, **kwargs) -> Iterator[Any]:
+        """
+        Stream model.generate_content chunks through the limiter.
+
+        Attempts are retried only until the first chunk arrives; after that the
+        caller has consumed output, so errors are raised. The concurrency slot is
+        held until the stream ends. Streams are never coalesced.
+
+        Args:
+            model: llm_backends.LLMBackend to call
+            prompt: Prompt text
+            **kwargs: Further generate_content arguments, e.g. generation_config
+
+        Yields:
+            Response chunks as the model generates them
+        """
+        deadline = time.monotonic() + self.deadline_seconds
+        attempt = 0
+        while True:
+            self._acquire(deadline)
+            try:
+                chunks = iter(model.generate_content(
+                    prompt, stream=True, request_options=self._request_options(deadline), **kwargs
+                ))
+                first = next(chunks, _END)
+            except Exception as e:
+                kind = self._release(e)
+                time.sleep(self._backoff(e, kind, attempt, deadline))
+                attempt += 1
+                continue
+            break
+
+        error: Optional[BaseException] = None
+        try:
+            if first is not _END:
+                yield first
+                for chunk in chunks:
+                    yield chunk
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return limiter state and call counters."""
+        with self._lock:
+            stats = {
+                "waiting": self._waiting,
+                "calls": self._calls,
+                "retries": self._retries,
+                "rate_limited": self._rate_limited,
+                "server_errors": self._server_errors,
+                "coalesced": self._coalesced,
+                "gave_up": self._gave_up
+            }
+        stats.update({
+            "rate_limit_per_minute": self.rate_per_minute,
+            "tokens_available": round(self.bucket.tokens, 2),
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight
+        })
+        return stats
+
+
+# Create a global call layer instance
+model_calls = ModelCallLayer(
+    rate_per_minute=config.MODEL_RATE_LIMIT_PER_MINUTE,
+    burst=config.MODEL_RATE_BURST,
+    concurrency_initial=config.MODEL_CONCURRENCY_INITIAL,
+    concurrency_min=config.MODEL_CONCURRENCY_MIN,
+    concurrency_max=config.MODEL_CONCURRENCY_MAX,
+    deadline_seconds=config.MODEL_CALL_DEADLINE_SECONDS,
+    max_retries=config.MODEL_MAX_RETRIES,
+    retry_base_seconds=config.MODEL_RETRY_BASE_SECONDS,
+    retry_max_seconds=config.MODEL_RETRY_MAX_SECONDS,
+    coalescing=config.MODEL_COALESCING_ENABLED
+)
@@ -4,7 +4,7 @@ Defines the structure of all data objects used throughout the application.
 """
 
 from typing import List, Dict, Any, Optional, Union
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from enum import Enum
 
 class PriorityLevel(str, Enum):
@@ -31,6 +31,18 @@ class ProcessType(str, Enum):
     SUPPORT = "Support"
     MANAGEMENT = "Management"
 
+class JobStatus(str, Enum):
+    """Lifecycle states of a background analysis job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class OutputFormat(str, Enum):
+    """Formats the model can be asked to answer in."""
+    TEXT = "text"
+    JSON = "json"
+
 class WorkflowStep(BaseModel):
     """Represents a single step in a business process workflow."""
     step: int = Field(..., description="Step number in the workflow")
@@ -72,12 +84,152 @@ class AnalysisResult(BaseModel):
     meetingOverview: MeetingOverview = Field(..., description="Meeting overview and summary")
     processes: List[BusinessProcess] = Field(default_factory=list, description="List of identified processes")
 
+    # JSON the result was stored as, set when it is loaded from the result cache
+    _json: Optional[bytes] = PrivateAttr(default=None)
+
+class CompactionStats(BaseModel):
+    """Size of a transcript before and after compaction."""
+    chars_before: int = Field(..., description="Characters of extracted text")
+    chars_after: int = Field(..., description="Characters sent to the model")
+    tokens_before: int = Field(..., description="Estimated tokens of extracted text")
+    tokens_after: int = Field(..., description="Estimated tokens sent to the model")
+
+class RevisionStats(BaseModel):
+    """How much of a document was re-analyzed in incremental mode."""
+    document_id: Optional[int] = Field(None, description="Id this version of the document is recorded under")
+    revision_of: Optional[int] = Field(None, description="Recorded document sharing the most chunks with this one")
+    chunks: int = Field(..., description="Content-defined chunks in the document")
+    reused_chunks: int = Field(default=0, description="Chunks whose analysis was served from the result cache")
+    analyzed_chunks: int = Field(default=0, description="New or changed chunks sent to the model")
+    analyzed_chars: int = Field(default=0, description="Characters sent to the model")
+
 class AnalysisResponse(BaseModel):
     """API response for analysis endpoint."""
     success: bool = Field(..., description="Whether the analysis was successful")
     analysis: Optional[AnalysisResult] = Field(None, description="Analysis results if successful")
     response_length: Optional[int] = Field(None, description="Length of the AI response")
     error: Optional[str] = Field(None, description="Error message if analysis failed")
+    cache_hit: Optional[bool] = Field(None, description="Whether the analysis was served from the result cache")
+    compaction: Optional[CompactionStats] = Field(None, description="Token reduction from transcript compaction")
+    analysis_id: Optional[str] = Field(None, description="Id the analysis is stored under in the analysis store")
+    revision: Optional[RevisionStats] = Field(None, description="Reuse of earlier chunk analyses in incremental mode")
+    failed_chunks: Optional[int] = Field(None, description="Chunks whose analysis failed; processes from that part of the transcript are missing")
+    chunk_errors: Optional[List[str]] = Field(None, description="Errors of the failed chunks")
+
+class BatchFileResult(BaseModel):
+    """Analysis outcome for one file of a batch."""
+    index: int = Field(..., description="Position of the file in the batch")
+    filename: str = Field(..., description="Filename, or path within the uploaded archive")
+    response: AnalysisResponse = Field(..., description="Analysis response for this file")
+
+class BatchSummary(BaseModel):
+    """Combined result of a batch analysis."""
+    total_files: int = Field(..., description="Number of files in the batch")
+    succeeded: int = Field(..., description="Files analyzed successfully")
+    failed: int = Field(..., description="Files rejected or failed during analysis")
+    overview: Optional[MeetingOverview] = Field(None, description="Overview across the processes of all successful files")
+
+class JobResponse(BaseModel):
+    """API response for the background job endpoints."""
+    job_id: str = Field(..., description="Job identifier")
+    status: JobStatus = Field(..., description="Current job status")
+    filename: str = Field(..., description="Original filename of the upload")
+    attempts: int = Field(default=0, description="Number of times a worker has started the job")
+    created_at: float = Field(..., description="Unix time the job was submitted")
+    updated_at: float = Field(..., description="Unix time the job last changed")
+    result: Optional[AnalysisResponse] = Field(None, description="Analysis response once the job has finished")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+
+class StoredProcess(BaseModel):
+    """A process from the analysis store, with the upload it was found in."""
+    analysis_id: str = Field(..., description="Id of the stored analysis")
+    filename: str = Field(..., description="Original filename of the upload")
+    uploaded_at: float = Field(..., description="Unix time the analysis was stored")
+    cluster_id: Optional[int] = Field(None, description="Cluster of the same recurring process, once indexed")
+    process: BusinessProcess = Field(..., description="The process")
+
+class ProcessPage(BaseModel):
+    """A page of stored processes."""
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, or null on the last page")
+    items: List[StoredProcess] = Field(default_factory=list, description="Processes, newest first")
+
+class StoredAnalysis(BaseModel):
+    """An analysis from the analysis store."""
+    analysis_id: str = Field(..., description="Id of the stored analysis")
+    filename: str = Field(..., description="Original filename of the upload")
+    uploaded_at: float = Field(..., description="Unix time the analysis was stored")
+    response_length: int = Field(default=0, description="Length of the AI response")
+    analysis: AnalysisResult = Field(..., description="Analysis results")
+
+class ProcessCluster(BaseModel):
+    """A recurring process: stored processes judged to be the same across analyses."""
+    cluster_id: int = Field(..., description="Cluster identifier")
+    name: str = Field(..., description="Name of the canonical process")
+    function: str = Field(..., description="Business function of the canonical process")
+    size: int = Field(..., description="Number of stored processes in the cluster")
+    first_seen: float = Field(..., description="Unix time the first process was stored")
+    last_seen: float = Field(..., description="Unix time the latest process was stored")
+    canonical: BusinessProcess = Field(..., description="The first process of the cluster")
+
+class ClusterPage(BaseModel):
+    """A page of process clusters."""
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, or null on the last page")
+    items: List[ProcessCluster] = Field(default_factory=list, description="Clusters, largest first")
+
+class ProcessClusterMatch(BaseModel):
+    """The existing cluster a process belongs to."""
+    process_id: str = Field(..., description="Id of the process within its analysis")
+    name: str = Field(..., description="Name of the process")
+    cluster_id: Optional[int] = Field(None, description="Matching cluster, or null if the process is new")
+    cluster_name: Optional[str] = Field(None, description="Name of the matching cluster")
+    similarity: Optional[float] = Field(None, description="Estimated similarity to the closest process of the cluster")
+
+class JobQueueStats(BaseModel):
+    """Background job queue statistics."""
+    queued: int = Field(default=0, description="Jobs waiting for a worker")
+    running: int = Field(default=0, description="Jobs currently leased by a worker")
+    completed: int = Field(default=0, description="Jobs finished successfully")
+    failed: int = Field(default=0, description="Jobs that failed or were abandoned")
+    workers_alive: int = Field(default=0, description="Worker processes running in this server")
+    worker_restarts: int = Field(default=0, description="Crashed workers replaced since startup")
+
+class AnalyzerPoolStats(BaseModel):
+    """Usage statistics for the shared Gemini analyzer client."""
+    model: str = Field(..., description="Gemini model served by the shared client")
+    active_key: Optional[str] = Field(None, description="Fingerprint of the API key in use")
+    client_age_seconds: float = Field(default=0.0, description="Seconds since the current client was built")
+    clients_created: int = Field(default=0, description="Number of clients built since startup")
+    key_rotations: int = Field(default=0, description="Number of API key rotations since startup")
+    requests_served: int = Field(default=0, description="Number of requests served by the shared client")
+    in_flight: int = Field(default=0, description="Requests currently using the shared client")
+
+class ModelCallStats(BaseModel):
+    """Rate limiter, concurrency and retry statistics for Gemini calls."""
+    rate_limit_per_minute: float = Field(default=0.0, description="Sustained call rate allowed (0 = unlimited)")
+    tokens_available: float = Field(default=0.0, description="Calls that can start right now without waiting")
+    concurrency_limit: int = Field(default=0, description="Current adaptive limit on concurrent calls")
+    in_flight: int = Field(default=0, description="Calls currently waiting on Gemini")
+    waiting: int = Field(default=0, description="Callers queued for a token or a concurrency slot")
+    calls: int = Field(default=0, description="Gemini calls started since startup, retries included")
+    retries: int = Field(default=0, description="Calls retried after a transient error")
+    rate_limited: int = Field(default=0, description="Calls rejected by Gemini with 429")
+    server_errors: int = Field(default=0, description="Calls failed with a 5xx or timeout")
+    coalesced: int = Field(default=0, description="Callers served by an identical in-flight call")
+    gave_up: int = Field(default=0, description="Calls abandoned after the retry deadline")
+
+class StageTimingStats(BaseModel):
+    """Time spent in one stage of the analysis pipeline since startup."""
+    count: int = Field(default=0, description="Number of times the stage ran")
+    total_seconds: float = Field(default=0.0, description="Total time spent in the stage")
+
+class CacheStats(BaseModel):
+    """Hit and size statistics for a two-tier cache."""
+    memory_hits: int = Field(default=0, description="Lookups served from the in-memory LRU")
+    disk_hits: int = Field(default=0, description="Lookups served from the SQLite store")
+    misses: int = Field(default=0, description="Lookups that found nothing")
+    writes: int = Field(default=0, description="Entries stored since startup")
+    evictions: int = Field(default=0, description="Entries evicted from the SQLite store")
+    memory_entries: int = Field(default=0, description="Entries currently in the in-memory LRU")
 
 class StatusResponse(BaseModel):
     """API response for status endpoint."""
@@ -86,6 +238,11 @@ class StatusResponse(BaseModel):
     allowed_file_types: List[str] = Field(..., description="List of allowed file extensions")
     max_file_size_mb: int = Field(..., description="Maximum file size in MB")
     upload_folder: str = Field(..., description="Upload folder path")
+    analyzer_pool: Optional[AnalyzerPoolStats] = Field(None, description="Shared Gemini client statistics")
+    jobs: Optional[JobQueueStats] = Field(None, description="Background job queue statistics")
+    extraction_cache: Optional[CacheStats] = Field(None, description="Extracted text cache statistics")
+    model_calls: Optional[ModelCallStats] = Field(None, description="Gemini rate limiter and retry statistics")
+    stages: Optional[Dict[str, StageTimingStats]] = Field(None, description="Time spent per pipeline stage")
 
 class RootResponse(BaseModel):
     """API response for root endpoint."""
@@ -101,4 +258,19 @@ class FileUploadError(Exception):
 
 class AnalysisError(Exception):
     """Custom exception for analysis errors."""
-    pass
\ No newline at end of file
+    pass
+
+class ParseTimeoutError(AnalysisError):
+    """Raised when parsing a model response exceeds its time budget."""
+    pass
+
+class AnalysisCancelledError(AnalysisError):
+    """Raised in a streamed analysis once its client has disconnected."""
+    pass
+
+class ModelRateLimitError(AnalysisError):
+    """Raised when Gemini stays rate limited past the call deadline."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
\ No newline at end of file
@@ -4,8 +4,10 @@ Contains logic for parsing AI-generated business process analysis text into stru
 """
 
 import re
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional, Tuple
 from models import (
+    ParseTimeoutError,
     AnalysisResult,
     BusinessProcess,
     MeetingOverview,
@@ -15,8 +17,248 @@ from models import (
     PainLevel,
     ProcessType
 )
+from metrics import parse_fallbacks
 from config import config
 
+# Bump whenever a parser's output for the same model response changes, so cached
+# analyses are invalidated (covers every engine and the JSON parser)
+PARSER_VERSION = "1"
+
+# Delimiter that opens each process section in the model output
+PROCESS_HEADER_PATTERN = re.compile(r'====================\s*PROCESS #\d+:')
+
+# Delimiter line, the blank lines after it and the line holding the process name.
+# Every repetition consumes a newline, so the pattern cannot backtrack.
+DELIMITED_NAME_PATTERN = re.compile(r'={20}[^\S\n]*\n((?:[^\S\n]*\n)*)([^\n]*)(\n?)')
+
+FIELD_TERMINATORS = ("Type:", "Summary:", "Automation", "Priority:", "Pain")
+
+PAIN_POINT_LABELS = re.compile(r'(Explicit Issues:|Manual Effort:|Impact:)')
+
+# Line-by-line parses check the deadline every this many lines
+DEADLINE_CHECK_INTERVAL = 1024
+
+STEP_PATTERN = re.compile(r'Step (\d+):')
+
+WORKFLOW_DETAIL_LABELS = (
+    ('duration', 'Duration:'),
+    ('tools', 'Tools:'),
+    ('dependencies', 'Dependencies:'),
+    ('bottlenecks', 'Bottlenecks:')
+)
+
+
+def parse_deadline() -> Optional[float]:
+    """Return the monotonic time by which a parse started now must finish, or None."""
+    if config.PARSE_TIME_BUDGET_SECONDS <= 0:
+        return None
+    return time.monotonic() + config.PARSE_TIME_BUDGET_SECONDS
+
+
+def check_parse_deadline(deadline: Optional[float]) -> None:
+    """Raise ParseTimeoutError once the parse deadline has passed."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeoutError(f"Parse time budget of {config.PARSE_TIME_BUDGET_SECONDS}s exceeded")
+
+
+def split_actor_action(actor_action: str) -> Optional[Tuple[str, str]]:
+    """
+    Split "<actor> does <action>" at the first standalone "does".
+
+    Equivalent to re.search(r'(.+?)\s+does\s+(.+)', actor_action), which is
+    quadratic on long lines that never say "does".
+    """
+    index = actor_action.find('does', 1)
+    while index >= 0:
+        end = index + 4
+        if actor_action[index - 1].isspace() and end < len(actor_action) and actor_action[end].isspace():
+            start = index - 1
+            while start > 0 and actor_action[start - 1].isspace():
+                start -= 1
+            action = actor_action[end:].strip()
+            if start >= 1 and action:
+                return actor_action[:start].strip(), action
+        index = actor_action.find('does', index + 1)
+    return None
+
+
+class WorkflowStepSplitter:
+    """
+    Splits the workflow region into "Step N:" entries and parses each as it completes.
+
+    Fed one line at a time, so the split is linear in the region; both parser
+    engines use it. It reproduces the steps of re.findall(r'Step (\d+):\s*(.+?)(?=Step \d+:|$)',
+    region, re.DOTALL), including its edge cases such as a step with no content
+    taking the next "Step N:" line as its content.
+    """
+
+    def __init__(self):
+        self.steps: List[WorkflowStep] = []
+        self._number: Optional[int] = None
+        self._in_content = False
+        self._gap_chars = 0
+        self._first_line: Optional[str] = None
+        self._details = {}
+
+    def feed(self, piece: str, terminated: bool) -> None:
+        """Consume one line of the workflow region."""
+        position = 0
+        search_from = 0
+        if self._number is not None and not self._in_content:
+            position = self._start_content(piece, 0, terminated)
+            if position < 0:
+                return
+            # The content's first character never starts the next step
+            search_from = position + 1
+
+        while True:
+            match = STEP_PATTERN.search(piece, search_from)
+            if not match:
+                if self._in_content:
+                    self._content_line(piece[position:])
+                return
+
+            if self._in_content:
+                self._content_line(piece[position:match.start()])
+                self._finish_step()
+
+            self._number = int(match.group(1))
+            self._in_content = False
+            self._gap_chars = 0
+            self._first_line = None
+            self._details = {
+                'duration': "Unknown",
+                'tools': "Unspecified",
+                'dependencies': "None",
+                'bottlenecks': "None"
+            }
+            position = self._start_content(piece, match.end(), terminated)
+            if position < 0:
+                return
+            search_from = position + 1
+
+    def _start_content(self, piece: str, start: int, terminated: bool) -> int:
+        """Skip whitespace after a step header; return where the content starts or -1."""
+        rest = piece[start:]
+        stripped = rest.lstrip()
+        if not stripped:
+            self._gap_chars += len(rest) + (1 if terminated else 0)
+            return -1
+        self._in_content = True
+        return start + len(rest) - len(stripped)
+
+    def _content_line(self, line: str) -> None:
+        """Handle one line of the current step's content."""
+        if self._first_line is None:
+            self._first_line = line.strip()
+            return
+        for key, label in WORKFLOW_DETAIL_LABELS:
+            if label in line:
+                self._details[key] = line.split(label)[1].strip()
+
+    def _finish_step(self) -> None:
+        """Build the WorkflowStep for the current step."""
+        actor_action = self._first_line or ""
+        split = split_actor_action(actor_action)
+        if split:
+            actor, action = split
+        else:
+            actor = "Unknown"
+            action = actor_action or "Action needs clarification"
+
+        self.steps.append(WorkflowStep(
+            step=self._number,
+            actor=actor,
+            action=action,
+            duration=self._details['duration'],
+            tools=self._details['tools'],
+            dependencies=self._details['dependencies'],
+            bottlenecks=self._details['bottlenecks']
+        ))
+        self._number = None
+        self._in_content = False
+
+    def close(self, drop_final_newline: bool = False) -> None:
+        """
+        Finish the last step once the workflow region has ended.
+
+        Args:
+            drop_final_newline: Whether the region ended with the section's final newline,
+                which the regex parser's "$" leaves out of the region
+        """
+        if self._number is None:
+            return
+        if not self._in_content:
+            if self._gap_chars - (1 if drop_final_newline else 0) <= 0:
+                self._number = None
+                return
+            self._first_line = ""
+        self._finish_step()
+
+
+def _value_after(text: str, start: int, terminators: Tuple[str, ...], allow_end: bool) -> Optional[str]:
+    """
+    Match a labelled value starting at the given position in linear time.
+
+    Equivalent to re.match(r'\s*(.+?)(?:\n|<terminators>|$)', text, start) with the
+    result stripped; the trailing $ is only allowed when allow_end is set. The value
+    starts at the first non-whitespace character, possibly on a later line, and runs
+    to the end of its line or the first terminator. If that line cannot be matched the
+    regex falls back to capturing whitespace, which yields an empty value.
+    """
+    gap_spaces = False
+    position = start
+    while True:
+        line_end = text.find('\n', position)
+        piece = text[position:line_end] if line_end >= 0 else text[position:]
+        stripped = piece.lstrip()
+
+        if stripped:
+            end = -1
+            for terminator in terminators:
+                index = stripped.find(terminator, 1)
+                if index >= 0 and (end < 0 or index < end):
+                    end = index
+            if end >= 0:
+                return stripped[:end].strip()
+            if line_end >= 0 or allow_end:
+                return stripped.strip()
+        elif line_end >= 0:
+            gap_spaces = gap_spaces or bool(piece)
+            position = line_end + 1
+            continue
+        elif allow_end and piece:
+            return ""
+
+        # The line runs to the end of the text without a usable terminator
+        if gap_spaces or any(piece.find(terminator, 1) >= 0 for terminator in terminators):
+            return ""
+        return None
+
+
+def find_labelled_value(text: str, label: str, terminators: Tuple[str, ...] = (),
+                        allow_end: bool = True) -> Optional[str]:
+    """
+    Find the value following the first occurrence of a label.
+
+    Equivalent to re.search(label + r'\s*(.+?)(?:\n|<terminators>|$)', text) with the
+    result stripped. Only the first occurrence needs to be tried: when it cannot be
+    matched it is on the last line of the text, and so is every later occurrence.
+
+    Args:
+        text: Text to search
+        label: Literal label that introduces the value
+        terminators: Substrings that end the value early
+        allow_end: Whether the value may end at the end of the text without a newline
+
+    Returns:
+        Optional[str]: The stripped value, or None if the label has no value
+    """
+    index = text.find(label)
+    if index < 0:
+        return None
+    return _value_after(text, index + len(label), terminators, allow_end)
+
 class BusinessAnalysisParser:
     """Parser for converting AI analysis text to structured business process data."""
 
@@ -35,35 +277,47 @@ class BusinessAnalysisParser:
             AnalysisResult: Structured analysis data
         """
         try:
-            processes = self._extract_processes(analysis_text)
-
-            # If no processes were extracted, create a default summary process
-            if not processes:
-                processes = [self._create_default_process()]
-
-            meeting_overview = self._create_meeting_overview(processes)
-
-            return AnalysisResult(
-                meetingOverview=meeting_overview,
-                processes=processes
-            )
+            processes = self._extract_processes(analysis_text, parse_deadline())
+            return self.build_analysis_result(processes)
 
         except Exception as e:
             print(f"Error parsing analysis: {e}")
             return self._create_default_analysis_result()
 
-    def _extract_processes(self, analysis_text: str) -> List[BusinessProcess]:
-        """Extract individual processes from the analysis text."""
+    def build_analysis_result(self, processes: List[BusinessProcess]) -> AnalysisResult:
+        """
+        Assemble an analysis result and its meeting overview from extracted processes.
+
+        Args:
+            processes: Extracted processes, possibly empty
+
+        Returns:
+            AnalysisResult: Structured analysis data
+        """
+        # If no processes were extracted, create a default summary process
+        if not processes:
+            processes = [self._create_default_process()]
+
+        meeting_overview = self._create_meeting_overview(processes)
+
+        return AnalysisResult(
+            meetingOverview=meeting_overview,
+            processes=processes
+        )
+
+    def _extract_processes(self, analysis_text: str, deadline: Optional[float] = None) -> List[BusinessProcess]:
+        """Extract individual processes from the analysis text, giving up once the deadline passes."""
         processes = []
 
         # Try to split by the expected format first
-        process_sections = re.split(r'====================\s*PROCESS #\d+:', analysis_text)
+        process_sections = PROCESS_HEADER_PATTERN.split(analysis_text)
 
         # If that doesn't work, treat the entire text as one process
         if len(process_sections) <= 1:
             process_sections = [analysis_text]
 
         for i, section in enumerate(process_sections[1:] if len(process_sections) > 1 else process_sections, 1):
+            check_parse_deadline(deadline)
             try:
                 process = self._parse_single_process(section, i)
                 if process:
@@ -74,6 +328,23 @@ class BusinessAnalysisParser:
 
         return processes
 
+    def stream(self) -> "ProcessSectionStream":
+        """Start an incremental parse that accepts the model output in fragments."""
+        return ProcessSectionStream(self)
+
+    def parse_process_section(self, section: str, process_number: int) -> BusinessProcess:
+        """
+        Parse the text following one PROCESS #N header into a BusinessProcess.
+
+        Args:
+            section: Section text, without its header delimiter
+            process_number: 1-based position of the section in the output
+
+        Returns:
+            BusinessProcess: The parsed process
+        """
+        return self._parse_single_process(section, process_number)
+
     def _parse_single_process(self, section: str, process_number: int) -> BusinessProcess:
         """Parse a single process section into a BusinessProcess object."""
         # Extract process name
@@ -110,24 +381,39 @@ class BusinessAnalysisParser:
 
     def _extract_process_name(self, section: str, process_number: int) -> str:
         """Extract process name using multiple patterns."""
-        patterns = [
-            r'====================\s*\n(.+?)\n',
-            r'Name:\s*(.+?)(?:\n|Function:)',
-            r'Process.*?:\s*(.+?)(?:\n|\r)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, section)
-            if match:
-                return match.group(1).strip()
+        # The first non-blank line after a delimiter line
+        match = DELIMITED_NAME_PATTERN.search(section)
+        if match:
+            blank_lines, name_line, newline = match.groups()
+            if newline:
+                return name_line.strip()
+            if blank_lines.replace('\n', ''):
+                return ""
+
+        name = find_labelled_value(section, 'Name:', ('Function:',), allow_end=False)
+        if name is not None:
+            return name
+
+        # "Process...: <name>", ending at the first colon after "Process" on its line
+        index = section.find('Process')
+        while index >= 0:
+            line_end = section.find('\n', index)
+            colon = section.find(':', index + len('Process'), line_end if line_end >= 0 else len(section))
+            if colon >= 0:
+                name = _value_after(section, colon + 1, ('\r',), allow_end=False)
+                if name is not None:
+                    return name
+                break
+            if line_end < 0:
+                break
+            index = section.find('Process', line_end)
 
         return f"Extracted Process {process_number}"
 
     def _extract_field(self, section: str, field_name: str, default: str) -> str:
         """Extract a simple field value from the section."""
-        pattern = f'{field_name}:\\s*(.+?)(?:\\n|Type:|Summary:|Automation|Priority:|Pain|$)'
-        match = re.search(pattern, section)
-        return match.group(1).strip() if match else default
+        value = find_labelled_value(section, f'{field_name}:', FIELD_TERMINATORS)
+        return value if value is not None else default
 
     def _extract_process_type(self, section: str) -> ProcessType:
         """Extract and validate process type."""
@@ -166,9 +452,8 @@ class BusinessAnalysisParser:
         stakeholders = []
 
         # Look for internal stakeholders
-        stakeholders_match = re.search(r'Internal Stakeholders:\s*(.+?)(?:\n|External)', section)
-        if stakeholders_match:
-            stakeholders_text = stakeholders_match.group(1)
+        stakeholders_text = find_labelled_value(section, 'Internal Stakeholders:', ('External',), allow_end=False)
+        if stakeholders_text is not None:
             stakeholders = [s.strip() for s in stakeholders_text.split(',') if s.strip()]
 
         return stakeholders
@@ -176,14 +461,16 @@ class BusinessAnalysisParser:
     def _extract_pain_points(self, section: str) -> List[str]:
         """Extract pain points from the section."""
         pain_points = []
+        seen = set()
         pain_section = re.search(r'PAIN POINTS(.*?)(?:TRANSFORMATION|$)', section, re.DOTALL)
 
         if pain_section:
             pain_lines = pain_section.group(1).split('\n')
             for line in pain_lines:
                 if any(keyword in line for keyword in ['Explicit Issues:', 'Manual Effort:', 'Impact:']):
-                    clean_line = re.sub(r'(Explicit Issues:|Manual Effort:|Impact:)', '', line).strip()
-                    if clean_line and clean_line not in pain_points:
+                    clean_line = PAIN_POINT_LABELS.sub('', line).strip()
+                    if clean_line and clean_line not in seen:
+                        seen.add(clean_line)
                         pain_points.append(clean_line)
 
         return pain_points
@@ -191,6 +478,7 @@ class BusinessAnalysisParser:
     def _extract_opportunities(self, section: str) -> List[str]:
         """Extract transformation opportunities from the section."""
         opportunities = []
+        seen = set()
         opp_section = re.search(r'TRANSFORMATION OPPORTUNITIES(.*?)(?:====|$)', section, re.DOTALL)
 
         if opp_section:
@@ -200,7 +488,8 @@ class BusinessAnalysisParser:
             for line in opp_lines:
                 if any(keyword in line for keyword in keywords):
                     clean_line = re.sub(r'(' + '|'.join(keywords) + ')', '', line).strip()
-                    if clean_line and clean_line not in opportunities:
+                    if clean_line and clean_line not in seen:
+                        seen.add(clean_line)
                         opportunities.append(clean_line)
 
         return opportunities
@@ -211,52 +500,16 @@ class BusinessAnalysisParser:
         workflow_section = re.search(r'AS-IS WORKFLOW MAPPING(.*?)(?:STAKEHOLDERS|$)', section, re.DOTALL)
 
         if workflow_section:
-            steps = re.findall(r'Step (\d+):\s*(.+?)(?=Step \d+:|STAKEHOLDERS|$)',
-                             workflow_section.group(1), re.DOTALL)
-
-            for step_num, step_content in steps:
-                workflow_step = self._parse_workflow_step(int(step_num), step_content)
-                workflow.append(workflow_step)
+            # Split line by line rather than with a lazy DOTALL scan per step
+            splitter = WorkflowStepSplitter()
+            lines = workflow_section.group(1).split('\n')
+            for index, line in enumerate(lines):
+                splitter.feed(line, index < len(lines) - 1)
+            splitter.close()
+            workflow = splitter.steps
 
         return workflow
 
-    def _parse_workflow_step(self, step_number: int, step_content: str) -> WorkflowStep:
-        """Parse a single workflow step."""
-        lines = step_content.split('\n')
-        actor_action = lines[0].strip() if lines else ""
-
-        # Parse actor and action
-        actor_match = re.search(r'(.+?)\s+does\s+(.+)', actor_action)
-        if actor_match:
-            actor = actor_match.group(1).strip()
-            action = actor_match.group(2).strip()
-        else:
-            actor = "Unknown"
-            action = actor_action or "Action needs clarification"
-
-        # Extract additional details
-        details = {
-            'duration': "Unknown",
-            'tools': "Unspecified",
-            'dependencies': "None",
-            'bottlenecks': "None"
-        }
-
-        for line in lines[1:]:
-            for key in details.keys():
-                if f'{key.title()}:' in line:
-                    details[key] = line.split(f'{key.title()}:')[1].strip()
-
-        return WorkflowStep(
-            step=step_number,
-            actor=actor,
-            action=action,
-            duration=details['duration'],
-            tools=details['tools'],
-            dependencies=details['dependencies'],
-            bottlenecks=details['bottlenecks']
-        )
-
     def _create_default_workflow_step(self) -> WorkflowStep:
         """Create a default workflow step when none can be extracted."""
         return WorkflowStep(
@@ -271,6 +524,7 @@ class BusinessAnalysisParser:
 
     def _create_default_process(self) -> BusinessProcess:
         """Create a default process when analysis extraction fails."""
+        parse_fallbacks.inc(label_value="default_process")
         return BusinessProcess(
             id="summary-1",
             name="General Business Process Analysis",
@@ -309,6 +563,7 @@ class BusinessAnalysisParser:
 
     def _create_default_analysis_result(self) -> AnalysisResult:
         """Create default analysis result when parsing fails completely."""
+        parse_fallbacks.inc(label_value="default_result")
         default_process = BusinessProcess(
             id="extracted-1",
             name="Extracted Business Process",
@@ -346,4 +601,84 @@ class BusinessAnalysisParser:
         return AnalysisResult(
             meetingOverview=overview,
             processes=[default_process]
-        )
\ No newline at end of file
+        )
+
+
+class ProcessSectionStream:
+    """
+    Incrementally splits streamed model output into PROCESS #N sections.
+
+    Fragments are fed as they arrive; each section is parsed and returned as soon
+    as the header of the next one is seen, and its text is then discarded so the
+    full response is never held in memory.
+    """
+
+    # Re-scan this many characters of already seen text so headers split across
+    # fragments are still detected
+    HEADER_LOOKBEHIND = 64
+
+    def __init__(self, parser: BusinessAnalysisParser):
+        """Initialize the stream with the parser used for each completed section."""
+        self.parser = parser
+        self.processes: List[BusinessProcess] = []
+        self.response_length = 0
+        self._buffer = ""
+        self._scanned = 0
+        self._sections_seen = 0
+
+    def feed(self, fragment: str) -> List[BusinessProcess]:
+        """
+        Consume a fragment of model output.
+
+        Args:
+            fragment: Next piece of streamed text
+
+        Returns:
+            List[BusinessProcess]: Processes whose sections were completed by this fragment
+        """
+        self.response_length += len(fragment)
+        self._buffer += fragment
+        completed = []
+
+        while True:
+            match = PROCESS_HEADER_PATTERN.search(self._buffer, max(0, self._scanned - self.HEADER_LOOKBEHIND))
+            if not match:
+                self._scanned = len(self._buffer)
+                break
+            if self._sections_seen > 0:
+                process = self._parse_section(self._buffer[:match.start()])
+                if process:
+                    completed.append(process)
+            self._sections_seen += 1
+            self._buffer = self._buffer[match.end():]
+            self._scanned = 0
+
+        return completed
+
+    def close(self) -> AnalysisResult:
+        """
+        Flush the final section once the model output has ended.
+
+        Output without any PROCESS headers is parsed as a single section, matching
+        BusinessAnalysisParser.parse_analysis.
+
+        Returns:
+            AnalysisResult: Structured analysis data for every process seen
+        """
+        if self._sections_seen == 0:
+            self._sections_seen = 1
+        self._parse_section(self._buffer)
+        self._buffer = ""
+        return self.parser.build_analysis_result(self.processes)
+
+    def _parse_section(self, section: str) -> Optional[BusinessProcess]:
+        """Parse one complete section, skipping it on errors like the batch parser."""
+        number = self._sections_seen
+        try:
+            process = self.parser.parse_process_section(section, number)
+        except Exception as e:
+            print(f"Error parsing process {number}: {e}")
+            return None
+        if process:
+            self.processes.append(process)
+        return process
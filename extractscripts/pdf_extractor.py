@@ -0,0 +1,262 @@
+"""
+PDF Extraction Module.
+Extracts PDF text page by page, spreading page ranges across the CPU process pool
+for long documents. Workers open the same file on disk through a read-only memory
+map, so only a path and a page range cross the process boundary, never the file
+contents. Page texts are joined in page order in a single pass.
+"""
+
+import asyncio
+import mmap
+import time
+from typing import BinaryIO, List, Optional, Tuple
+import PyPDF2
+from config import config
+
+# (page text, seconds spent extracting it) for each page of a range
+PageResult = Tuple[str, float]
+
+
+class PdfExtraction:
+    """Text extracted from a PDF along with per-page timings."""
+
+    def __init__(self, text: str, page_count: int, page_timings: List[float]):
+        """
+        Args:
+            text: Extracted text, one newline-terminated block per page
+            page_count: Number of pages in the document
+            page_timings: Seconds spent on each extracted page, in page order
+        """
+        self.text = text
+        self.page_count = page_count
+        self.page_timings = page_timings
+
+    @property
+    def pages_read(self) -> int:
+        """Number of pages extracted, less than page_count when a page cap applied."""
+        return len(self.page_timings)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether extraction stopped early because of a page cap."""
+        return self.pages_read < self.page_count
+
+    def slowest_pages(self, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Find the pages that took longest to extract, typically scanned pages.
+
+        Args:
+            limit: Maximum number of pages to return
+
+        Returns:
+            List[Tuple[int, float]]: (1-based page number, seconds), slowest first
+        """
+        ranked = sorted(enumerate(self.page_timings, start=1), key=lambda page: page[1], reverse=True)
+        return ranked[:limit]
+
+
+def read_pages(reader: PyPDF2.PdfReader, start: int, stop: int) -> List[PageResult]:
+    """Extract and time pages [start, stop) of an open PDF."""
+    results = []
+    for index in range(start, stop):
+        started = time.perf_counter()
+        text = reader.pages[index].extract_text()
+        results.append((text, time.perf_counter() - started))
+    return results
+
+
+def assemble_pages(ranges: List[List[PageResult]], page_count: int) -> PdfExtraction:
+    """
+    Join per-range page results, given in page order, into one extraction.
+
+    Every page contributes its text and a newline, exactly as the original
+    page-by-page loop did, but the join is a single linear pass.
+    """
+    texts = []
+    timings = []
+    for page_results in ranges:
+        for text, seconds in page_results:
+            texts.append(text)
+            texts.append("\n")
+            timings.append(seconds)
+    extraction = PdfExtraction("".join(texts), page_count, timings)
+    _report_slow_pages(extraction)
+    return extraction
+
+
+def _report_slow_pages(extraction: PdfExtraction) -> None:
+    """Log pages slower than the configured threshold."""
+    threshold = config.PDF_SLOW_PAGE_SECONDS
+    if threshold <= 0:
+        return
+    slow = [(page, seconds) for page, seconds in enumerate(extraction.page_timings, start=1) if seconds >= threshold]
+    if slow:
+        pages = ", ".join(f"{page} ({seconds:.2f}s)" for page, seconds in slow)
+        print(f"Slow PDF pages of {extraction.page_count}: {pages}")
+
+
+def _page_limit(page_count: int, max_pages: Optional[int]) -> int:
+    """Number of pages to extract under an optional page cap."""
+    if max_pages is None or max_pages <= 0:
+        return page_count
+    return min(page_count, max_pages)
+
+
+def _pdf_error(error: Exception) -> Exception:
+    """Wrap a PyPDF2 or I/O failure in the error reported to callers."""
+    return Exception(f"Error reading PDF file: {str(error)}")
+
+
+def _open_mapped(file_path: str) -> mmap.mmap:
+    """Open a PDF on disk as a read-only memory map."""
+    with open(file_path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _extract(stream: BinaryIO, max_pages: Optional[int]) -> PdfExtraction:
+    """Extract up to max_pages pages of a PDF stream in the current process."""
+    reader = PyPDF2.PdfReader(stream)
+    page_count = len(reader.pages)
+    return assemble_pages([read_pages(reader, 0, _page_limit(page_count, max_pages))], page_count)
+
+
+def extract_pdf_stream(stream: BinaryIO, max_pages: Optional[int] = None) -> PdfExtraction:
+    """
+    Extract text from a seekable PDF stream in the current process.
+
+    Args:
+        stream: PDF stream, e.g. a BytesIO
+        max_pages: Stop after this many pages (None or 0 for all pages)
+
+    Returns:
+        PdfExtraction: Extracted text and page timings
+
+    Raises:
+        Exception: If the PDF cannot be read
+    """
+    try:
+        return _extract(stream, max_pages)
+    except Exception as e:
+        raise _pdf_error(e)
+
+
+def extract_pdf_file(file_path: str, max_pages: Optional[int] = None) -> PdfExtraction:
+    """
+    Extract text from a PDF on disk in the current process.
+
+    Args:
+        file_path: Location of the PDF
+        max_pages: Stop after this many pages (None or 0 for all pages)
+
+    Returns:
+        PdfExtraction: Extracted text and page timings
+
+    Raises:
+        Exception: If the PDF cannot be read
+    """
+    try:
+        with _open_mapped(file_path) as mapped:
+            return _extract(mapped, max_pages)
+    except Exception as e:
+        raise _pdf_error(e)
+
+
+def count_pdf_pages(file_path: str) -> int:
+    """Count the pages of a PDF on disk. Runs in a pool worker."""
+    try:
+        with _open_mapped(file_path) as mapped:
+            return len(PyPDF2.PdfReader(mapped).pages)
+    except Exception as e:
+        raise _pdf_error(e)
+
+
+def extract_pdf_page_range(file_path: str, start: int, stop: int) -> List[PageResult]:
+    """Extract and time pages [start, stop) of a PDF on disk. Runs in a pool worker."""
+    try:
+        with _open_mapped(file_path) as mapped:
+            return read_pages(PyPDF2.PdfReader(mapped), start, stop)
+    except Exception as e:
+        raise _pdf_error(e)
+
+
+def plan_page_ranges(page_count: int, workers: int, min_pages: int) -> List[Tuple[int, int]]:
+    """
+    Split pages [0, page_count) into contiguous ranges for the pool.
+
+    Aims for two ranges per worker so a slow, e.g. scanned, stretch of pages does
+    not leave the other workers idle, but never makes a range shorter than
+    min_pages since every range re-opens the document.
+
+    Args:
+        page_count: Number of pages to extract
+        workers: Number of pool workers
+        min_pages: Minimum pages per range
+
+    Returns:
+        List[Tuple[int, int]]: (start, stop) ranges in page order
+    """
+    if page_count <= 0:
+        return []
+    range_count = max(1, min(workers * 2, page_count // max(1, min_pages)))
+    size, extra = divmod(page_count, range_count)
+    ranges = []
+    start = 0
+    for index in range(range_count):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+async def extract_pdf_parallel(executor, file_path: str, max_pages: Optional[int] = None) -> PdfExtraction:
+    """
+    Extract text from a PDF on disk, spreading page ranges across the CPU pool.
+
+    Short documents, and servers without a process pool, are extracted in one
+    pool task. With a page cap, pages past the cap are never parsed.
+
+    Args:
+        executor: AnalysisExecutor whose CPU pool runs the page ranges
+        file_path: Location of the PDF, readable by the pool workers
+        max_pages: Stop after this many pages (None or 0 for all pages)
+
+    Returns:
+        PdfExtraction: Extracted text and page timings
+
+    Raises:
+        Exception: If the PDF cannot be read
+    """
+    if executor.process_workers == 0:
+        return await executor.run_cpu(extract_pdf_file, file_path, max_pages)
+
+    page_count = await executor.run_cpu(count_pdf_pages, file_path)
+    limit = _page_limit(page_count, max_pages)
+    if limit < config.PDF_PARALLEL_MIN_PAGES:
+        ranges = [(0, limit)]
+    else:
+        ranges = plan_page_ranges(limit, executor.process_workers, config.PDF_PAGES_PER_TASK)
+
+    results = await asyncio.gather(*(
+        executor.run_cpu(extract_pdf_page_range, file_path, start, stop) for start, stop in ranges
+    ))
+    return assemble_pages(list(results), page_count)
+
+
+def main() -> None:
+    """Print per-page extraction timings for a PDF: python pdf_extractor.py FILE [MAX_PAGES]."""
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python pdf_extractor.py FILE [MAX_PAGES]")
+        sys.exit(2)
+    max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    started = time.perf_counter()
+    extraction = extract_pdf_file(sys.argv[1], max_pages)
+    elapsed = time.perf_counter() - started
+    print(f"{extraction.pages_read}/{extraction.page_count} pages, {len(extraction.text)} chars in {elapsed:.2f}s")
+    for page, seconds in extraction.slowest_pages(10):
+        print(f"  page {page:>5}: {seconds * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+Request Profiling Module.
+Opt-in sampling profiler for single analysis requests. While a request is being
+profiled, a background thread periodically captures the Python stacks of the threads
+working on it and counts them as collapsed stacks ("frame;frame;frame count"), the
+input format of flamegraph.pl, speedscope and similar tools. Nothing runs and
+nothing is recorded unless a privileged request asks for a profile.
+"""
+
+import functools
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import config
+
+# Request ids usable as profile file names
+PROFILE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Frames deeper than this are dropped from the root end of a stack
+MAX_STACK_DEPTH = 128
+
+# Source files whose frames mean the event loop thread is idle, not working on a request
+IDLE_LOOP_FILES = ("selectors.py",)
+
+
+class ProfileSession:
+    """Samples collected for one profiled request."""
+
+    def __init__(self, profile_id: str):
+        """
+        Args:
+            profile_id: Request id the profile is stored under
+        """
+        self.profile_id = profile_id
+        self.started = time.monotonic()
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def attach(self) -> Iterator[None]:
+        """Sample the current thread for the duration of the block."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads[ident] -= 1
+                if not self._threads[ident]:
+                    del self._threads[ident]
+
+    def threads(self) -> List[int]:
+        """Idents of the threads currently working on the request."""
+        with self._lock:
+            return list(self._threads)
+
+    def record(self, stack: str) -> None:
+        """Count one sampled stack."""
+        with self._lock:
+            self.stacks[stack] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Render the samples as collapsed stacks, most frequent first."""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# Profile of the request running in the current context, if any
+_current_session: ContextVar[Optional[ProfileSession]] = ContextVar("current_profile", default=None)
+
+
+def current_session() -> Optional[ProfileSession]:
+    """Profile of the request running in the current context, if it is being profiled."""
+    return _current_session.get()
+
+
+def bind(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Carry the current request's profile over to the thread that will run func.
+
+    Executors do not propagate context variables, so work handed to a pool is
+    wrapped to attach its thread to the profile while it runs. Returns func
+    unchanged when the current request is not being profiled.
+    """
+    session = _current_session.get()
+    if session is None:
+        return func
+
+    @functools.wraps(func)
+    def run_attached(*args: Any, **kwargs: Any) -> Any:
+        with session.attach():
+            return func(*args, **kwargs)
+    return run_attached
+
+
+def _frame_label(frame) -> str:
+    """Describe a frame as "function (file:first line)"; ';' separates frames in the output."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> Optional[str]:
+    """Render a thread's stack root first, or None if the thread is an idle event loop."""
+    if os.path.basename(frame.f_code.co_filename) in IDLE_LOOP_FILES:
+        return None
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Samples the stacks of profiled requests from a background thread."""
+
+    def __init__(self, token: str, interval_seconds: float, max_seconds: float,
+                 max_concurrent: int, folder: str):
+        """
+        Initialize the profiler. The sampling thread only runs while a request is profiled.
+
+        Args:
+            token: Secret a request must present to be profiled (empty disables profiling)
+            interval_seconds: Time between stack samples
+            max_seconds: Sampling stops for a request profiled longer than this
+            max_concurrent: Requests profiled at once; further requests run unprofiled
+            folder: Directory the collapsed stacks are written to
+        """
+        self.token = token
+        self.interval_seconds = max(0.001, interval_seconds)
+        self.max_seconds = max_seconds
+        self.max_concurrent = max(1, max_concurrent)
+        self.folder = folder
+        self._sessions: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Check whether a request presented the profiling token."""
+        # Compared as bytes: compare_digest rejects str arguments with non-ASCII characters
+        return self.enabled and bool(token) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def start(self, request_id: Optional[str] = None) -> Optional[ProfileSession]:
+        """
+        Begin profiling a request.
+
+        Args:
+            request_id: Client supplied id (e.g. X-Request-Id); a new id is used if
+                missing or not safe as a file name
+
+        Returns:
+            Optional[ProfileSession]: The session, or None if too many requests are being profiled
+        """
+        profile_id = request_id if request_id and PROFILE_ID_PATTERN.match(request_id) else uuid.uuid4().hex
+        session = ProfileSession(profile_id)
+        with self._lock:
+            if len(self._sessions) >= self.max_concurrent:
+                print(f"Profiling skipped for request {profile_id}: {self.max_concurrent} already profiled")
+                return None
+            self._sessions.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    @contextmanager
+    def activate(self, session: ProfileSession) -> Iterator[None]:
+        """
+        Profile the current request in the block: its context and the calling thread.
+
+        Call from the request's coroutine; the event loop thread is only sampled
+        while it is busy, which can include other requests' coroutines.
+        """
+        token = _current_session.set(session)
+        try:
+            with session.attach():
+                yield
+        finally:
+            _current_session.reset(token)
+
+    def finish(self, session: ProfileSession) -> Optional[str]:
+        """
+        Stop profiling a request and write its collapsed stacks.
+
+        Returns:
+            Optional[str]: Path of the written profile, or None if it could not be written
+        """
+        with self._lock:
+            if session in self._sessions:
+                self._sessions.remove(session)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            path = self.path_for(session.profile_id)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(session.collapsed())
+        except OSError as e:
+            print(f"Error writing profile {session.profile_id}: {e}")
+            return None
+        print(f"Profile {session.profile_id}: {session.samples} samples "
+              f"over {time.monotonic() - session.started:.2f}s written to {path}")
+        return path
+
+    def path_for(self, profile_id: str) -> str:
+        """Location of a request's collapsed stacks."""
+        return os.path.join(self.folder, f"{profile_id}.folded")
+
+    def load(self, profile_id: str) -> Optional[str]:
+        """Read a stored profile, or None if there is no profile for that id."""
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        try:
+            with open(self.path_for(profile_id), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _sample_loop(self) -> None:
+        """Sample the threads of every active session until none is left."""
+        own_ident = threading.get_ident()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                sessions = [session for session in self._sessions if now - session.started < self.max_seconds]
+                if not self._sessions:
+                    self._thread = None
+                    return
+            if sessions:
+                frames = sys._current_frames()
+                for session in sessions:
+                    for ident in session.threads():
+                        frame = frames.get(ident)
+                        if frame is None or ident == own_ident:
+                            continue
+                        stack = _collapse(frame)
+                        if stack is not None:
+                            session.record(stack)
+                del frames
+            time.sleep(self.interval_seconds)
+
+
+# Create a global profiler instance
+profiler = SamplingProfiler(
+    token=config.PROFILING_TOKEN,
+    interval_seconds=config.PROFILING_INTERVAL_MS / 1000,
+    max_seconds=config.PROFILING_MAX_SECONDS,
+    max_concurrent=config.PROFILING_MAX_CONCURRENT,
+    folder=config.PROFILING_FOLDER
+)
@@ -0,0 +1,155 @@
+"""
+Document Revision Module.
+Recognizes uploads that are revisions of an earlier document. Every document analyzed
+in incremental mode is recorded as the hashes of its content-defined chunks, indexed
+by chunk; a new upload's closest earlier version is the document sharing the most
+chunks with it. Unchanged chunks are served from the result cache, so only new or
+edited chunks reach the model.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from config import config
+
+
+def chunk_hash(chunk: str) -> str:
+    """Content hash identifying a chunk across document versions."""
+    return hashlib.sha256(chunk.encode("utf-8")).hexdigest()
+
+
+class RevisionIndex:
+    """SQLite index from chunk hashes to the documents containing them."""
+
+    def __init__(self, db_path: str, max_documents: int):
+        """
+        Initialize the index. The SQLite database is opened lazily on first use.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_documents: Documents kept before the least recently seen are forgotten
+        """
+        self.db_path = db_path
+        self.max_documents = max(1, max_documents)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the SQLite database and create the schema if needed."""
+        if self._conn is None:
+            folder = os.path.dirname(self.db_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                "id INTEGER PRIMARY KEY, fingerprint TEXT NOT NULL UNIQUE, chunk_count INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, seen_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_seen ON documents (seen_at)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS document_chunks ("
+                "chunk_hash TEXT NOT NULL, document_id INTEGER NOT NULL, "
+                "PRIMARY KEY (chunk_hash, document_id)) WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_document_chunks_document ON document_chunks (document_id)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def fingerprint(hashes: List[str]) -> str:
+        """Identify a document version by the sequence of its chunk hashes."""
+        return hashlib.sha256("\n".join(hashes).encode("utf-8")).hexdigest()
+
+    def find_previous(self, hashes: List[str]) -> Optional[Tuple[int, int]]:
+        """
+        Find the recorded document sharing the most chunks with a new upload.
+
+        Args:
+            hashes: Chunk hashes of the upload
+
+        Returns:
+            Optional[Tuple[int, int]]: Document id and number of shared chunks, or None
+                if no recorded document shares a chunk
+        """
+        distinct = sorted(set(hashes))
+        if not distinct:
+            return None
+        best: Dict[int, int] = {}
+        try:
+            with self._lock:
+                conn = self._connect()
+                # Batched to stay under SQLite's bound parameter limit
+                for start in range(0, len(distinct), 500):
+                    batch = distinct[start:start + 500]
+                    for document_id, shared in conn.execute(
+                        "SELECT document_id, COUNT(*) FROM document_chunks "
+                        f"WHERE chunk_hash IN ({','.join('?' * len(batch))}) GROUP BY document_id",
+                        batch
+                    ):
+                        best[document_id] = best.get(document_id, 0) + shared
+        except sqlite3.Error as e:
+            print(f"Error reading revision index {self.db_path}: {e}")
+            return None
+        if not best:
+            return None
+        document_id = max(best, key=lambda key: (best[key], key))
+        return document_id, best[document_id]
+
+    def record(self, hashes: List[str]) -> Optional[int]:
+        """
+        Record a document version, or mark an identical recorded one as seen.
+
+        Args:
+            hashes: Chunk hashes of the document, in order
+
+        Returns:
+            Optional[int]: Id of the recorded document, or None if it could not be recorded
+        """
+        fingerprint = self.fingerprint(hashes)
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    row = conn.execute("SELECT id FROM documents WHERE fingerprint = ?", (fingerprint,)).fetchone()
+                    if row is not None:
+                        conn.execute("UPDATE documents SET seen_at = ? WHERE id = ?", (now, row[0]))
+                        return row[0]
+                    document_id = conn.execute(
+                        "INSERT INTO documents (fingerprint, chunk_count, created_at, seen_at) VALUES (?, ?, ?, ?)",
+                        (fingerprint, len(hashes), now, now)
+                    ).lastrowid
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO document_chunks (chunk_hash, document_id) VALUES (?, ?)",
+                        [(value, document_id) for value in set(hashes)]
+                    )
+                    self._evict(conn)
+                return document_id
+        except sqlite3.Error as e:
+            print(f"Error writing revision index {self.db_path}: {e}")
+            return None
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Forget the least recently seen documents beyond max_documents."""
+        count = conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        if count <= self.max_documents:
+            return
+        stale = [row[0] for row in conn.execute(
+            "SELECT id FROM documents ORDER BY seen_at LIMIT ?", (count - self.max_documents,)
+        )]
+        conn.executemany("DELETE FROM document_chunks WHERE document_id = ?", [(value,) for value in stale])
+        conn.executemany("DELETE FROM documents WHERE id = ?", [(value,) for value in stale])
+
+
+# Create a global revision index instance
+revision_index = RevisionIndex(
+    db_path=config.REVISION_INDEX_PATH,
+    max_documents=config.REVISION_MAX_DOCUMENTS
+)
@@ -0,0 +1,83 @@
+"""
+Response Serialization Module.
+Encodes API responses straight to JSON bytes. Models the server built itself are
+serialized without the re-validation FastAPI applies to a returned response_model,
+and JSON that is already serialized (cached analyses, stored job results) is spliced
+into the response instead of being decoded and encoded again.
+"""
+
+import json
+from typing import Any, Dict, Optional, Union
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speed-up
+    orjson = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def dumps(data: Any) -> bytes:
+    """Encode plain JSON data compactly, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def model_json(model: BaseModel) -> bytes:
+    """
+    Encode a model without validating it again.
+
+    Analysis results loaded from the result cache carry the JSON they were stored
+    as, which is reused as is.
+    """
+    cached = getattr(model, "_json", None)
+    if cached is not None:
+        return cached
+    if hasattr(model, "model_dump_json"):
+        return model.model_dump_json().encode("utf-8")
+    return dumps(model.dict())
+
+
+def load_model(model_class, raw: bytes):
+    """Decode and validate a model from JSON bytes."""
+    if hasattr(model_class, "model_validate_json"):
+        return model_class.model_validate_json(raw)
+    return model_class.parse_raw(raw)
+
+
+def splice_json(data: Dict[str, Any], field: str, raw: Optional[bytes]) -> bytes:
+    """
+    Encode a JSON object with one field given as already serialized JSON.
+
+    Args:
+        data: The other fields
+        field: Name of the pre-serialized field, which must not be in data
+        raw: Serialized JSON value of the field (None encodes null)
+
+    Returns:
+        bytes: The encoded object, with the field last
+    """
+    head = dumps(data)
+    if head == b"{}":
+        return b'{"%s":%s}' % (field.encode("utf-8"), raw or b"null")
+    return head[:-1] + b',"%s":%s}' % (field.encode("utf-8"), raw or b"null")
+
+
+def response_json(model: BaseModel) -> bytes:
+    """Encode a response model, reusing the cached JSON of an analysis result it holds."""
+    analysis = getattr(model, "analysis", None)
+    cached = getattr(analysis, "_json", None)
+    if cached is None:
+        return model_json(model)
+    envelope = model.dict(exclude={"analysis"})
+    return splice_json(envelope, "analysis", cached)
+
+
+def json_response(content: Union[BaseModel, bytes], status_code: int = 200,
+                  headers: Optional[Dict[str, str]] = None) -> Response:
+    """Build a JSON response from a model or already encoded JSON bytes."""
+    body = content if isinstance(content, bytes) else response_json(content)
+    return Response(content=body, status_code=status_code, headers=headers, media_type=JSON_MEDIA_TYPE)
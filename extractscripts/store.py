@@ -0,0 +1,422 @@
+"""
+Analysis Store Module.
+Persists every successful analysis, its processes and their workflow steps in a
+SQLite database under the upload folder, so earlier results can be queried
+without re-uploading. Writes are queued and committed in batches by a background
+thread, keeping persistence off the request path. Processes are paged with keyset
+pagination on their row id, newest first, so deep pages cost the same as the first.
+As processes are written they are linked to clusters of the same recurring process
+(see dedup.py).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from dedup import SCHEMA as DEDUP_SCHEMA, process_index
+from models import AnalysisResult, BusinessProcess
+from serialization import dumps, load_model, model_json, splice_json
+from config import config
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS analyses ("
+    "id TEXT PRIMARY KEY, filename TEXT NOT NULL, created_at REAL NOT NULL, "
+    "process_count INTEGER NOT NULL, response_length INTEGER NOT NULL, overview TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_analyses_created ON analyses (created_at)",
+    "CREATE TABLE IF NOT EXISTS processes ("
+    "id INTEGER PRIMARY KEY, analysis_id TEXT NOT NULL, process_id TEXT NOT NULL, "
+    "name TEXT NOT NULL, function TEXT NOT NULL, type TEXT NOT NULL, priority TEXT NOT NULL, "
+    "automation_potential TEXT NOT NULL, pain_level TEXT NOT NULL, confidence INTEGER NOT NULL, "
+    "steps INTEGER NOT NULL, created_at REAL NOT NULL, data TEXT NOT NULL, "
+    "cluster_id INTEGER, signature BLOB)",
+    # Each filter index ends in id so a filtered page is a single index range scan
+    "CREATE INDEX IF NOT EXISTS idx_processes_function ON processes (function, id)",
+    "CREATE INDEX IF NOT EXISTS idx_processes_priority ON processes (priority, id)",
+    "CREATE INDEX IF NOT EXISTS idx_processes_automation ON processes (automation_potential, id)",
+    "CREATE INDEX IF NOT EXISTS idx_processes_pain ON processes (pain_level, id)",
+    "CREATE INDEX IF NOT EXISTS idx_processes_created ON processes (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_processes_analysis ON processes (analysis_id, id)",
+    "CREATE TABLE IF NOT EXISTS workflow_steps ("
+    "process_row INTEGER NOT NULL, position INTEGER NOT NULL, step INTEGER NOT NULL, "
+    "actor TEXT NOT NULL, action TEXT NOT NULL, duration TEXT NOT NULL, tools TEXT NOT NULL, "
+    "dependencies TEXT NOT NULL, bottlenecks TEXT NOT NULL, "
+    "PRIMARY KEY (process_row, position)) WITHOUT ROWID",
+)
+
+# Columns added after the first release of the store, by table
+ADDED_COLUMNS = {"processes": (("cluster_id", "INTEGER"), ("signature", "BLOB"))}
+
+# Created once the added columns exist
+INDEXES = ("CREATE INDEX IF NOT EXISTS idx_processes_cluster ON processes (cluster_id, id)",)
+
+# Process filters accepted by query_processes, by column
+PROCESS_FILTERS = ("function", "priority", "automation_potential", "pain_level", "analysis_id", "cluster_id")
+
+# Processes clustered per transaction when indexing processes stored before clustering
+INDEX_BATCH_SIZE = 500
+
+# Wait after the writer thread fails before a save starts a new one
+WRITER_RETRY_SECONDS = 5.0
+
+
+def _enum_value(value: Any) -> str:
+    return getattr(value, "value", value)
+
+
+class AnalysisStore:
+    """SQLite store of analyses and their processes, written in batches by a background thread."""
+
+    def __init__(self, db_path: str, batch_size: int, flush_interval_seconds: float, max_pending: int):
+        """
+        Initialize the store. The database is opened and the writer started on first use.
+
+        Args:
+            db_path: Path of the SQLite database file
+            batch_size: Most analyses committed in one transaction
+            flush_interval_seconds: Longest time a queued analysis waits to be written
+            max_pending: Analyses queued beyond this are dropped instead of slowing requests
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = max(0.0, flush_interval_seconds)
+        self.max_pending = max(1, max_pending)
+        self._pending: Deque[Tuple[str, str, float, AnalysisResult, int]] = deque()
+        self._condition = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._retry_at = 0.0
+        self._stopping = False
+        self._read_conn: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "batches": 0, "errors": 0}
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection to the database, creating the schema if needed."""
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA + DEDUP_SCHEMA:
+            conn.execute(statement)
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for column, column_type in columns:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.commit()
+        return conn
+
+    def save(self, filename: str, analysis: AnalysisResult, response_length: int = 0) -> Optional[str]:
+        """
+        Queue an analysis to be stored.
+
+        Args:
+            filename: Original filename of the analyzed upload
+            analysis: Analysis result
+            response_length: Length of the model response
+
+        Returns:
+            Optional[str]: Id the analysis will be stored under, or None if the queue is full
+        """
+        analysis_id = uuid.uuid4().hex
+        with self._condition:
+            if len(self._pending) >= self.max_pending:
+                self._stats["dropped"] += 1
+                print(f"Analysis store queue full; not storing {filename}")
+                return None
+            self._pending.append((analysis_id, filename, time.time(), analysis, response_length))
+            if self._writer is None and time.time() >= self._retry_at:
+                self._stopping = False
+                self._writer = threading.Thread(target=self._write_loop, name="analysis-store", daemon=True)
+                self._writer.start()
+            if len(self._pending) in (1, self.batch_size):
+                self._condition.notify()
+        return analysis_id
+
+    def _write_loop(self) -> None:
+        """
+        Commit queued analyses in batches until the store is closed.
+
+        If the writer fails (e.g. the database cannot be opened), the failure is
+        counted and the next save after WRITER_RETRY_SECONDS starts a new writer;
+        queued analyses stay queued meanwhile.
+        """
+        conn = None
+        try:
+            conn = self._open()
+            if config.DEDUP_ENABLED:
+                process_index.prepare(conn)
+                self._index_unclustered(conn)
+            while True:
+                with self._condition:
+                    while not self._pending and not self._stopping:
+                        self._condition.wait()
+                    if len(self._pending) < self.batch_size and not self._stopping and self.flush_interval_seconds:
+                        # Give requests arriving together a moment to share the transaction
+                        self._condition.wait(self.flush_interval_seconds)
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                    if not batch and self._stopping:
+                        return
+                if batch:
+                    self._write_batch(conn, batch)
+        except Exception as e:
+            with self._condition:
+                self._stats["errors"] += 1
+                self._retry_at = time.time() + WRITER_RETRY_SECONDS
+            print(f"Analysis store writer for {self.db_path} stopped: {e}; retrying in {WRITER_RETRY_SECONDS:g}s")
+        finally:
+            if conn is not None:
+                conn.close()
+            with self._condition:
+                if self._writer is threading.current_thread():
+                    self._writer = None
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[str, str, float, AnalysisResult, int]]) -> None:
+        """Insert a batch of analyses with their processes and steps in one transaction."""
+        try:
+            with conn:
+                # Take the write lock up front so cluster lookups see every committed process
+                conn.execute("BEGIN IMMEDIATE")
+                for analysis_id, filename, created_at, analysis, response_length in batch:
+                    conn.execute(
+                        "INSERT INTO analyses (id, filename, created_at, process_count, response_length, overview) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (analysis_id, filename, created_at, len(analysis.processes), response_length,
+                         model_json(analysis.meetingOverview).decode("utf-8"))
+                    )
+                    for process in analysis.processes:
+                        cursor = conn.execute(
+                            "INSERT INTO processes (analysis_id, process_id, name, function, type, priority, "
+                            "automation_potential, pain_level, confidence, steps, created_at, data) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (analysis_id, process.id, process.name, process.function, _enum_value(process.type),
+                             _enum_value(process.priority), _enum_value(process.automationPotential),
+                             _enum_value(process.painLevel), process.confidence, process.steps, created_at,
+                             model_json(process).decode("utf-8"))
+                        )
+                        conn.executemany(
+                            "INSERT INTO workflow_steps (process_row, position, step, actor, action, duration, "
+                            "tools, dependencies, bottlenecks) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            [(cursor.lastrowid, position, step.step, step.actor, step.action, step.duration,
+                              step.tools, step.dependencies, step.bottlenecks)
+                             for position, step in enumerate(process.workflow)]
+                        )
+                        if config.DEDUP_ENABLED:
+                            process_index.assign(conn, cursor.lastrowid, process, created_at)
+            with self._condition:
+                self._stats["written"] += len(batch)
+                self._stats["batches"] += 1
+        except Exception as e:
+            # The batch is lost but the writer keeps going
+            with self._condition:
+                self._stats["errors"] += 1
+            print(f"Error writing {len(batch)} analyses to {self.db_path}: {e}")
+
+    def _index_unclustered(self, conn: sqlite3.Connection) -> None:
+        """Link processes stored without a cluster (before clustering, or with other settings)."""
+        indexed = 0
+        while True:
+            try:
+                with conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    rows = conn.execute(
+                        "SELECT id, created_at, data FROM processes WHERE cluster_id IS NULL ORDER BY id LIMIT ?",
+                        (INDEX_BATCH_SIZE,)
+                    ).fetchall()
+                    for process_row, created_at, data in rows:
+                        process_index.assign(conn, process_row, load_model(BusinessProcess, data), created_at)
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error clustering stored processes: {e}")
+                return
+            indexed += len(rows)
+            if len(rows) < INDEX_BATCH_SIZE:
+                break
+        if indexed:
+            print(f"Clustered {indexed} stored process(es)")
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer thread."""
+        with self._condition:
+            writer = self._writer
+            self._stopping = True
+            self._condition.notify()
+        if writer is not None:
+            writer.join()
+        with self._condition:
+            self._writer = None
+
+    def _reader(self) -> sqlite3.Connection:
+        if self._read_conn is None:
+            self._read_conn = self._open()
+        return self._read_conn
+
+    def query_processes(self, filters: Dict[str, Any], limit: int,
+                        before: Optional[int] = None, since: Optional[float] = None,
+                        until: Optional[float] = None) -> Tuple[bytes, Optional[int]]:
+        """
+        Page through stored processes, newest first.
+
+        Args:
+            filters: Exact-match filters by column (see PROCESS_FILTERS); None values are ignored
+            limit: Page size
+            before: Only processes with a row id below this (the previous page's next cursor)
+            since: Only processes uploaded at or after this Unix time
+            until: Only processes uploaded before this Unix time
+
+        Returns:
+            Tuple[bytes, Optional[int]]: JSON array of {analysis_id, filename, uploaded_at,
+                cluster_id, process} items, and the cursor of the next page (None on the last page)
+        """
+        clauses, params = [], []
+        for column in PROCESS_FILTERS:
+            value = filters.get(column)
+            if value is not None:
+                clauses.append(f"p.{column} = ?")
+                params.append(_enum_value(value))
+        if before is not None:
+            clauses.append("p.id < ?")
+            params.append(before)
+        if since is not None:
+            clauses.append("p.created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("p.created_at < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self._read_lock:
+            rows = self._reader().execute(
+                "SELECT p.id, p.analysis_id, a.filename, p.created_at, p.cluster_id, p.data FROM processes p "
+                f"JOIN analyses a ON a.id = p.analysis_id {where}ORDER BY p.id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        items = [
+            splice_json({"analysis_id": analysis_id, "filename": filename, "uploaded_at": created_at,
+                         "cluster_id": cluster_id}, "process", data.encode("utf-8"))
+            for _, analysis_id, filename, created_at, cluster_id, data in rows[:limit]
+        ]
+        return b"[" + b",".join(items) + b"]", next_cursor
+
+    def get_analysis(self, analysis_id: str) -> Optional[bytes]:
+        """
+        Load a stored analysis.
+
+        Returns:
+            Optional[bytes]: JSON object {analysis_id, filename, uploaded_at, response_length,
+                analysis}, or None if there is no such analysis
+        """
+        with self._read_lock:
+            conn = self._reader()
+            row = conn.execute(
+                "SELECT filename, created_at, response_length, overview FROM analyses WHERE id = ?",
+                (analysis_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            processes = conn.execute(
+                "SELECT data FROM processes WHERE analysis_id = ? ORDER BY id", (analysis_id,)
+            ).fetchall()
+        filename, created_at, response_length, overview = row
+        analysis = (
+            b'{"meetingOverview":' + overview.encode("utf-8") + b',"processes":['
+            + b",".join(data.encode("utf-8") for (data,) in processes) + b"]}"
+        )
+        return splice_json({
+            "analysis_id": analysis_id, "filename": filename,
+            "uploaded_at": created_at, "response_length": response_length
+        }, "analysis", analysis)
+
+    @staticmethod
+    def _cluster_json(row: Tuple) -> bytes:
+        cluster_id, name, function, size, created_at, updated_at, data = row
+        return splice_json({
+            "cluster_id": cluster_id, "name": name, "function": function, "size": size,
+            "first_seen": created_at, "last_seen": updated_at
+        }, "canonical", data.encode("utf-8"))
+
+    def list_clusters(self, limit: int, function: Optional[str] = None, min_size: int = 1,
+                      before: Optional[Tuple[int, int]] = None) -> Tuple[bytes, Optional[Tuple[int, int]]]:
+        """
+        Page through process clusters, largest first.
+
+        Args:
+            limit: Page size
+            function: Only clusters of this business function
+            min_size: Only clusters with at least this many processes
+            before: (size, id) of the last cluster of the previous page
+
+        Returns:
+            Tuple[bytes, Optional[Tuple[int, int]]]: JSON array of clusters, each with its
+                canonical (first) process, and the cursor of the next page (None on the last page)
+        """
+        clauses, params = ["c.size >= ?"], [min_size]
+        if function is not None:
+            clauses.append("c.function = ?")
+            params.append(function)
+        if before is not None:
+            clauses.append("(c.size, c.id) < (?, ?)")
+            params.extend(before)
+        with self._read_lock:
+            rows = self._reader().execute(
+                "SELECT c.id, c.name, c.function, c.size, c.created_at, c.updated_at, p.data "
+                "FROM process_clusters c JOIN processes p ON p.id = c.canonical_row "
+                f"WHERE {' AND '.join(clauses)} ORDER BY c.size DESC, c.id DESC LIMIT ?",
+                (*params, limit + 1)
+            ).fetchall()
+
+        next_cursor = (rows[limit - 1][3], rows[limit - 1][0]) if len(rows) > limit else None
+        return b"[" + b",".join(self._cluster_json(row) for row in rows[:limit]) + b"]", next_cursor
+
+    def get_cluster(self, cluster_id: int) -> Optional[bytes]:
+        """
+        Load a process cluster.
+
+        Returns:
+            Optional[bytes]: JSON object of the cluster with its canonical process, or None
+                if there is no such cluster
+        """
+        with self._read_lock:
+            row = self._reader().execute(
+                "SELECT c.id, c.name, c.function, c.size, c.created_at, c.updated_at, p.data "
+                "FROM process_clusters c JOIN processes p ON p.id = c.canonical_row WHERE c.id = ?",
+                (cluster_id,)
+            ).fetchone()
+        return self._cluster_json(row) if row is not None else None
+
+    def match_processes(self, analysis: AnalysisResult) -> bytes:
+        """
+        Link the processes of an analysis that is not stored to existing clusters.
+
+        Args:
+            analysis: Analysis result whose processes to place
+
+        Returns:
+            bytes: JSON array with, per process, its id and name and the matching cluster's
+                id, name and estimated similarity (null when nothing matches)
+        """
+        with self._read_lock:
+            matches = process_index.match(self._reader(), analysis.processes)
+        return dumps(matches)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return write counters and the number of analyses waiting to be written."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._pending)
+        return stats
+
+
+# Create a global analysis store instance
+analysis_store = AnalysisStore(
+    db_path=config.STORE_PATH,
+    batch_size=config.STORE_BATCH_SIZE,
+    flush_interval_seconds=config.STORE_FLUSH_INTERVAL_SECONDS,
+    max_pending=config.STORE_MAX_PENDING
+)
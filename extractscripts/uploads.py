@@ -0,0 +1,242 @@
+"""
+Upload Handling Module.
+Streams uploads to spool files under the upload folder in fixed-size chunks, so no
+upload is ever held in memory whole, and rejects oversized requests before their
+body is read.
+"""
+
+import os
+import shutil
+import time
+import uuid
+from typing import BinaryIO, Dict, Optional
+from fastapi import UploadFile
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+from models import FileUploadError
+from metrics import upload_bytes, upload_bytes_in_flight
+from config import config
+
+
+class SpooledUpload:
+    """An uploaded file written to a spool file on disk."""
+
+    def __init__(self, path: str, filename: str, size: int):
+        """
+        Args:
+            path: Location of the spool file
+            filename: Original filename
+            size: File size in bytes
+        """
+        self.path = path
+        self.filename = filename
+        self.size = size
+        self._tracked_bytes = size
+
+    def release(self) -> None:
+        """Stop counting the file towards the upload bytes in flight; safe to call twice."""
+        upload_bytes_in_flight.dec(self._tracked_bytes)
+        self._tracked_bytes = 0
+
+    def cleanup(self) -> None:
+        """Delete the spool file, ignoring files already moved or removed."""
+        self.release()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _too_large(max_size: int) -> FileUploadError:
+    """Build the error raised when an upload crosses the size limit."""
+    return FileUploadError(f"File too large. Maximum size is {max_size // (1024 * 1024)}MB")
+
+
+def _spool_path(filename: str) -> str:
+    """Pick a unique spool file path that keeps the original extension."""
+    os.makedirs(config.UPLOAD_SPOOL_FOLDER, exist_ok=True)
+    extension = os.path.splitext(filename)[1].lower()
+    return os.path.join(config.UPLOAD_SPOOL_FOLDER, f"{uuid.uuid4().hex}{extension}")
+
+
+async def spool_upload(file: UploadFile, max_size: int) -> SpooledUpload:
+    """
+    Stream an upload to a spool file, stopping as soon as it crosses the size limit.
+
+    The copy runs on the framework's short-lived I/O thread pool rather than the
+    analysis pools, so it never queues behind model calls.
+
+    Args:
+        file: Uploaded file
+        max_size: Maximum size in bytes
+
+    Returns:
+        SpooledUpload: The spooled file
+
+    Raises:
+        FileUploadError: If the upload is larger than max_size
+    """
+    try:
+        return await run_in_threadpool(spool_stream, file.file, file.filename or "", max_size)
+    finally:
+        # Release the framework's own temporary copy straight away
+        await file.close()
+
+
+def spool_stream(source: BinaryIO, filename: str, max_size: int) -> SpooledUpload:
+    """
+    Copy a readable binary stream, such as an upload or zip archive member, to a
+    spool file in fixed-size chunks, stopping as soon as it crosses the size limit.
+
+    Args:
+        source: Stream to copy
+        filename: Name reported for the spooled file
+        max_size: Maximum size in bytes
+
+    Returns:
+        SpooledUpload: The spooled file
+
+    Raises:
+        FileUploadError: If the stream is larger than max_size
+    """
+    path = _spool_path(filename)
+    size = 0
+    try:
+        with open(path, "wb") as spool:
+            while True:
+                chunk = source.read(config.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                upload_bytes.inc(len(chunk))
+                upload_bytes_in_flight.inc(len(chunk))
+                if size > max_size:
+                    raise _too_large(max_size)
+                spool.write(chunk)
+    except BaseException:
+        upload_bytes_in_flight.dec(size)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return SpooledUpload(path, filename, size)
+
+
+def sweep_spool_folder(max_age_seconds: float) -> int:
+    """
+    Remove spool files left behind by requests that never finished, e.g. after a crash.
+
+    Args:
+        max_age_seconds: Only files older than this are removed
+
+    Returns:
+        int: Number of files removed
+    """
+    if not os.path.isdir(config.UPLOAD_SPOOL_FOLDER):
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for entry in os.scandir(config.UPLOAD_SPOOL_FOLDER):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def move_spooled_file(upload: SpooledUpload, destination: str) -> None:
+    """
+    Move a spooled upload to permanent storage without copying it when possible.
+
+    The upload keeps pointing at its old spool path, so a caller's cleanup() after
+    the move is a no-op rather than deleting the stored file. Stored files no
+    longer count towards the upload bytes in flight.
+    """
+    folder = os.path.dirname(destination)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    shutil.move(upload.path, destination)
+    upload.release()
+
+
+def _too_large_detail(limit: int) -> str:
+    """Error detail for a request body over the limit."""
+    return f"Request too large. Maximum size is {limit // (1024 * 1024)}MB"
+
+
+class _RequestTooLarge(HTTPException):
+    """
+    Raised from the wrapped receive channel once a body crosses its limit.
+
+    An HTTPException so FastAPI's body parsing re-raises it instead of reporting a
+    generic 400, and the exception handlers render it as a normal 413 response.
+    """
+
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=_too_large_detail(limit))
+
+
+class RequestSizeLimitMiddleware:
+    """
+    ASGI middleware that rejects oversized request bodies with 413.
+
+    Requests declaring a Content-Length above the limit are rejected before any of
+    the body is read; bodies without one are counted as they stream in and cut off
+    as soon as they cross the limit.
+    """
+
+    def __init__(self, app, max_body_size: int, path_limits: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            app: ASGI application to wrap
+            max_body_size: Default body size limit in bytes
+            path_limits: Limits for specific request paths, overriding the default
+        """
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_limits = path_limits or {}
+
+    def _reject(self, limit: int) -> JSONResponse:
+        """Build the 413 response, matching the HTTPException error format."""
+        return JSONResponse(status_code=413, content={"detail": _too_large_detail(limit)})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.path_limits.get(scope["path"], self.max_body_size)
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            await self._reject(limit)(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _RequestTooLarge(limit)
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _RequestTooLarge:
+            if response_started:
+                raise
+            await self._reject(limit)(scope, receive, send)